@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+
+benchmarksPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(benchmarksPath, "..", "compiler_source_code"))
+
+from compiler import executeCompilation
+from CompilerOptions import CompilerOptions
+from CompilationStats import CompilationStats
+from programGenerator import generateProgram
+
+defaultBaselinePath = os.path.join(benchmarksPath, "baselines", "compilerBenchmark.json")
+
+# Tamaños de los programas generados (multiplicador de funciones y clases)
+defaultSizes = (1, 2, 4)
+
+# Una fase escala de forma superlineal si su tiempo crece más rápido que lines ** maxScalingExponent
+maxScalingExponent = 1.3
+
+# Una fase tiene una regresión si su rendimiento (líneas/s) es menor que el de la línea base en esta proporción
+regressionTolerance = 0.25
+
+# Las fases más rápidas que este tiempo (en segundos) en la línea base no se comparan, por el ruido de la medición
+minimumPhaseSeconds = 0.001
+
+def generateBenchmarkProgram(size):
+  """
+  Genera el programa de un tamaño: 2 funciones y 1 clase (con su subclase) por unidad de tamaño.
+  """
+  return generateProgram(functions=2 * size, depth=3, classes=size, loops=2, strings=2)
+
+def compileProgram(source, options, traceMemory):
+  stats = CompilationStats(traceMemory=traceMemory)
+
+  # El compilador muestra la tabla de símbolos en la salida estándar
+  with contextlib.redirect_stdout(io.StringIO()):
+    hasErrors, errors, assemblyCode = executeCompilation("<benchmark>", options, source=source, stats=stats)
+
+  if hasErrors:
+    raise Exception("Error al compilar el programa generado.", errors)
+  return stats
+
+def measureSize(size, options, repetitions):
+  """
+  Compila el programa de un tamaño y devuelve, por fase, el mejor tiempo de varias repeticiones (sin medir
+  memoria, porque tracemalloc hace más lenta la compilación) y la memoria máxima de una compilación adicional.
+  """
+  source = generateBenchmarkProgram(size)
+  lines = source.count("\n")
+
+  phaseSeconds = {}
+  for _ in range(repetitions):
+    stats = compileProgram(source, options, traceMemory=False)
+    for phase in stats.phases:
+      phaseSeconds[phase.name] = min(phaseSeconds.get(phase.name, math.inf), phase.wallSeconds)
+
+  stats = compileProgram(source, options, traceMemory=True)
+  phases = {
+    phase.name: {"seconds": phaseSeconds[phase.name], "peakMemory": phase.peakMemory, "counts": phase.counts}
+    for phase in stats.phases
+  }
+
+  seconds = sum(phase["seconds"] for phase in phases.values())
+  return {
+    "size": size,
+    "lines": lines,
+    "seconds": seconds,
+    "linesPerSecond": lines / seconds,
+    "peakMemory": max(phase["peakMemory"] for phase in phases.values()),
+    "phases": phases,
+  }
+
+def getScalingExponents(results):
+  """
+  Devuelve, por fase, el exponente k tal que el tiempo crece como lines ** k entre el programa más pequeño
+  y el más grande (1 para una fase lineal, 2 para una cuadrática).
+  """
+  first, last = results[0], results[-1]
+  linesRatio = last["lines"] / first["lines"]
+  exponents = {}
+  for name, phase in last["phases"].items():
+    firstSeconds = first["phases"][name]["seconds"]
+    if firstSeconds > 0 and linesRatio > 1:
+      exponents[name] = math.log(phase["seconds"] / firstSeconds) / math.log(linesRatio)
+  return exponents
+
+def compareWithBaseline(results, baseline):
+  """
+  Devuelve la lista de regresiones respecto a la línea base: fases con menor rendimiento (líneas/s) en un
+  tamaño medido en ambas.
+  """
+  baselineResults = {result["size"]: result for result in baseline["results"]}
+  regressions = []
+  for result in results:
+    baselineResult = baselineResults.get(result["size"])
+    if baselineResult == None:
+      continue
+
+    for name, phase in result["phases"].items():
+      baselinePhase = baselineResult["phases"].get(name)
+      if baselinePhase == None or baselinePhase["seconds"] < minimumPhaseSeconds or phase["seconds"] == 0:
+        continue
+
+      ratio = baselinePhase["seconds"] / phase["seconds"] # Rendimiento relativo a la línea base
+      if ratio < 1 - regressionTolerance:
+        regressions.append(f"tamaño {result['size']}, {name}: {ratio:.2f}x el rendimiento de la línea base")
+  return regressions
+
+def runBenchmark(sizes=defaultSizes, optimizationLevel=0, repetitions=3, baselinePath=defaultBaselinePath, saveBaseline=False):
+  """
+  Compila programas generados de tamaño creciente y muestra el rendimiento (líneas/s) y la memoria máxima,
+  el tiempo de cada fase y su exponente de escalamiento. Las fases que escalan de forma superlineal se
+  reportan, igual que las regresiones respecto a la línea base guardada.
+  @return bool - Indica si no hubo regresiones respecto a la línea base.
+  """
+  options = CompilerOptions.fromOptimizationLevel(optimizationLevel)
+  results = [measureSize(size, options, repetitions) for size in sizes]
+  phaseNames = list(results[0]["phases"])
+
+  print(f"-O{optimizationLevel}, mejor de {repetitions} repeticiones")
+  print(f"  {'tamaño':>6} {'líneas':>7} {'segundos':>9} {'líneas/s':>9} {'memoria (KB)':>13}")
+  for result in results:
+    print(f"  {result['size']:6} {result['lines']:7} {result['seconds']:9.3f} {result['linesPerSecond']:9.0f} {result['peakMemory'] / 1024:13.0f}")
+
+  print()
+  print(f"  {'fase':22}" + "".join(f" {'ms (' + str(result['size']) + ')':>11}" for result in results) + f" {'escala':>7}")
+  exponents = getScalingExponents(results)
+  for name in phaseNames:
+    times = "".join(f" {result['phases'][name]['seconds'] * 1000:11.1f}" for result in results)
+    exponent = exponents.get(name)
+    marker = " superlineal" if exponent != None and exponent > maxScalingExponent else ""
+    print(f"  {name:22}{times} {exponent if exponent != None else math.nan:7.2f}{marker}")
+
+  baselineKey = f"O{optimizationLevel}"
+  if saveBaseline:
+    baselines = {}
+    if os.path.exists(baselinePath):
+      with open(baselinePath, "r", encoding="utf-8") as file:
+        baselines = json.load(file)
+    baselines[baselineKey] = {"results": results, "scalingExponents": exponents}
+
+    os.makedirs(os.path.dirname(baselinePath), exist_ok=True)
+    with open(baselinePath, "w", encoding="utf-8") as file:
+      json.dump(baselines, file, indent=2)
+    print(f"\nlínea base guardada en {baselinePath}")
+    return True
+
+  if not os.path.exists(baselinePath):
+    return True
+  with open(baselinePath, "r", encoding="utf-8") as file:
+    baseline = json.load(file).get(baselineKey)
+  if baseline == None:
+    return True
+
+  regressions = compareWithBaseline(results, baseline)
+  print()
+  if len(regressions) == 0:
+    print("sin regresiones respecto a la línea base")
+  for regression in regressions:
+    print(f"regresión: {regression}")
+  return len(regressions) == 0
+
+if __name__ == "__main__":
+  argumentParser = argparse.ArgumentParser(description="Benchmark del compilador con programas generados de tamaño creciente.")
+  argumentParser.add_argument("sizes", type=int, nargs="*", default=defaultSizes, help="Tamaños de los programas generados.")
+  argumentParser.add_argument("-O", dest="optimizationLevel", type=int, choices=(0, 1, 2), default=0, help="Nivel de optimización.")
+  argumentParser.add_argument("--repetitions", type=int, default=3, help="Repeticiones de cada compilación (se toma el mejor tiempo).")
+  argumentParser.add_argument("--baseline", dest="baselinePath", default=defaultBaselinePath, help="Archivo JSON de la línea base.")
+  argumentParser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base.")
+  arguments = argumentParser.parse_args()
+
+  passed = runBenchmark(arguments.sizes, arguments.optimizationLevel, arguments.repetitions, arguments.baselinePath, arguments.save_baseline)
+  sys.exit(0 if passed else 1)
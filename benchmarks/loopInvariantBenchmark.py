@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import sys
+
+benchmarksPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(benchmarksPath, "..", "compiler_source_code"))
+
+from compiler import executeCompilation
+from CompilerOptions import CompilerOptions
+from MipsSimulator import MipsSimulator
+
+def getInstructions(assemblyCode):
+  """
+  Devuelve las instrucciones MIPS del código generado (incluyendo etiquetas), sin directivas, comentarios ni nop.
+  """
+  instructions = []
+  for line in assemblyCode:
+    line = line.split("#")[0].strip()
+    if line == "" or line.startswith(".") or line == "nop":
+      continue
+    instructions.append(line)
+  return instructions
+
+def countLoopInstructions(instructions):
+  """
+  Cuenta las instrucciones dentro de ciclos: entre una etiqueta y un salto (j) posterior hacia ella.
+  Las instrucciones de un ciclo interno se cuentan una vez por cada ciclo que las contiene.
+  """
+  labels = {}
+  count = 0
+  for index, instruction in enumerate(instructions):
+    if instruction.endswith(":"):
+      labels[instruction[:-1]] = index
+    elif instruction.startswith("j ") and instruction[2:].strip() in labels:
+      start = labels[instruction[2:].strip()]
+      count += sum(1 for line in instructions[start:index + 1] if not line.endswith(":"))
+  return count
+
+def runBenchmark(programPath):
+  """
+  Compila un programa sin y con extracción de código invariante de ciclos, y muestra la cantidad de
+  instrucciones del programa, la cantidad de instrucciones dentro de ciclos (las que se repiten en cada iteración)
+  y la cantidad de instrucciones ejecutadas en el simulador de MIPS.
+  """
+  print(os.path.basename(programPath))
+  print(f"  {'opciones':20} {'total':>8} {'en ciclos':>10} {'ejecutadas':>11}")
+
+  for name, options in (("base", CompilerOptions()), ("hoistLoopInvariants", CompilerOptions(hoistLoopInvariants=True))):
+    # El compilador muestra la tabla de símbolos en la salida estándar
+    with contextlib.redirect_stdout(io.StringIO()):
+      hasErrors, errors, assemblyCode = executeCompilation(programPath, options)
+
+    if hasErrors:
+      raise Exception("Error al compilar el programa.", errors)
+
+    instructions = getInstructions(assemblyCode)
+    total = sum(1 for instruction in instructions if not instruction.endswith(":"))
+    simulator = MipsSimulator(assemblyCode)
+    simulator.run()
+    print(f"  {name:20} {total:8} {countLoopInstructions(instructions):10} {simulator.getStats()['instructions']:11}")
+
+if __name__ == "__main__":
+  programPath = sys.argv[1] if len(sys.argv) > 1 else os.path.join(benchmarksPath, "programs", "nestedLoops.txt")
+  runBenchmark(programPath)
@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+
+benchmarksPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(benchmarksPath, "..", "compiler_source_code"))
+
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.tree.Tree import TerminalNode
+from antlr.CompiscriptLexer import CompiscriptLexer
+from antlr.CompiscriptParser import CompiscriptParser
+from CompiscriptScanner import CompiscriptScanner
+from RecursiveDescentParser import RecursiveDescentParser
+from ErrorListener import LexerErrorListener, ParserErrorListener
+from compiler import parseProgram
+
+programTemplate = """
+class Shape{n} {{
+  init(width, height) {{
+    this.width = width;
+    this.height = height;
+  }}
+  area() {{
+    return this.width * this.height;
+  }}
+}}
+
+fun compute{n}(limit) {{
+  var total = 0;
+  var values = [1, 2, 3, 4];
+  for (var i = 0; i < limit; i = i + 1) {{
+    if (i % 2 == 0 and total >= 0) {{
+      total = total + values[i % 4] * 2;
+    }} else {{
+      total = total - 1;
+    }}
+  }}
+  while (total > 100 or !(total < 0)) {{
+    total = total / 2;
+  }}
+  return total;
+}}
+
+var shape{n} = new Shape{n}({n}, 2);
+var twice{n} = fun(x) {{ return x + x; }};
+shape{n}.width = twice{n}(shape{n}.area());
+print "resultado {n}: " + compute{n}(10);
+"""
+
+def generateProgram(copies):
+  """
+  Genera un programa con copias de clases, funciones, ciclos y expresiones (nombres distintos en cada copia).
+  """
+  return "".join(programTemplate.format(n=n) for n in range(copies))
+
+def parseWithAntlr(source):
+  lexer = CompiscriptLexer(InputStream(source))
+  lexer.removeErrorListeners()
+  lexer.addErrorListener(LexerErrorListener())
+  parser = CompiscriptParser(CommonTokenStream(lexer))
+  parser.removeErrorListeners()
+  parser.addErrorListener(ParserErrorListener())
+  return parser.program()
+
+def parseWithAntlrTwoStage(source, lexerClass=CompiscriptLexer):
+  lexer = lexerClass(InputStream(source))
+  lexer.removeErrorListeners()
+  lexer.addErrorListener(LexerErrorListener())
+  stream = CommonTokenStream(lexer)
+  parser = CompiscriptParser(stream)
+  parser.removeErrorListeners()
+  return parseProgram(parser, stream, ParserErrorListener())
+
+def parseWithRegexLexer(source):
+  return parseWithAntlrTwoStage(source, CompiscriptScanner)
+
+def parseWithRecursiveDescent(source):
+  scanner = CompiscriptScanner(InputStream(source))
+  scanner.removeErrorListeners()
+  scanner.addErrorListener(LexerErrorListener())
+  parser = RecursiveDescentParser(scanner.getTokens())
+  parser.removeErrorListeners()
+  parser.addErrorListener(ParserErrorListener())
+  return parser.program()
+
+def getTreeShape(tree):
+  """
+  Devuelve el recorrido del árbol (contextos y tokens con su posición) para comparar los dos parsers.
+  """
+  shape = []
+  pending = [tree]
+  while len(pending) > 0:
+    node = pending.pop()
+    if isinstance(node, TerminalNode):
+      token = node.getSymbol()
+      shape.append((token.type, token.text, token.line, token.column))
+    else:
+      shape.append((type(node).__name__, node.start.tokenIndex, node.stop.tokenIndex if node.stop else None))
+      pending += reversed(node.children or [])
+  return shape
+
+def runBenchmark(copies, repetitions=3):
+  """
+  Mide el tiempo del análisis léxico y sintáctico de un programa generado con el parser de ANTLR (predicción LL,
+  en dos etapas SLL-LL y en dos etapas con los tokens de CompiscriptScanner) y con el parser descendente recursivo
+  (el mejor de varias repeticiones), y verifica que todos construyan el mismo árbol.
+  """
+  source = generateProgram(copies)
+  lines = source.count("\n")
+  print(f"programa generado: {copies} copias, {lines} líneas, {len(source)} caracteres")
+  print(f"  {'parser':20} {'segundos':>10} {'líneas/s':>10} {'speedup':>7}")
+
+  trees = []
+  bestTimes = []
+  parsers = (
+    ("antlr", parseWithAntlr), ("antlrTwoStage", parseWithAntlrTwoStage), ("antlrRegexLexer", parseWithRegexLexer),
+    ("recursiveDescent", parseWithRecursiveDescent),
+  )
+  for name, parse in parsers:
+    times = []
+    for _ in range(repetitions):
+      start = time.perf_counter()
+      tree = parse(source)
+      times.append(time.perf_counter() - start)
+
+    trees.append(getTreeShape(tree))
+    bestTimes.append(min(times))
+    print(f"  {name:20} {min(times):10.3f} {lines / min(times):10.0f} {bestTimes[0] / min(times):6.1f}x")
+
+  if any(tree != trees[0] for tree in trees[1:]):
+    raise Exception("Los parsers construyeron árboles distintos.")
+  print("  árboles idénticos")
+
+if __name__ == "__main__":
+  copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+  runBenchmark(copies)
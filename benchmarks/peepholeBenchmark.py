@@ -0,0 +1,39 @@
+import contextlib
+import io
+import os
+import sys
+
+benchmarksPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(benchmarksPath, "..", "compiler_source_code"))
+
+from compiler import executeCompilation
+from CompilerOptions import CompilerOptions
+from optimizations.PeepholeOptimization import PeepholeOptimization
+from loopInvariantBenchmark import getInstructions
+
+def runBenchmark(programPath, window=4):
+  """
+  Compila un programa sin optimización de mirilla, la aplica sobre el assembly generado y muestra
+  la cantidad de instrucciones eliminadas por cada regla.
+  """
+  # El compilador muestra la tabla de símbolos en la salida estándar
+  with contextlib.redirect_stdout(io.StringIO()):
+    hasErrors, errors, assemblyCode = executeCompilation(programPath, CompilerOptions())
+
+  if hasErrors:
+    raise Exception("Error al compilar el programa.", errors)
+
+  peephole = PeepholeOptimization(assemblyCode, window)
+
+  print(f"{os.path.basename(programPath)} (ventana de {window} instrucciones)")
+  for rule, removed in peephole.getReport().items():
+    print(f"  {rule:20} {removed:8}")
+
+  total = sum(1 for line in getInstructions(assemblyCode) if not line.endswith(":"))
+  optimizedTotal = sum(1 for line in getInstructions(peephole.getCode()) if not line.endswith(":"))
+  print(f"  {'instrucciones':20} {total:8} -> {optimizedTotal}")
+
+if __name__ == "__main__":
+  programPath = sys.argv[1] if len(sys.argv) > 1 else os.path.join(benchmarksPath, "programs", "nestedLoops.txt")
+  window = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+  runBenchmark(programPath, window)
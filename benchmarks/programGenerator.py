@@ -0,0 +1,149 @@
+import sys
+
+class ProgramGenerator:
+
+  def __init__(self, functions=10, depth=2, classes=2, loops=2, strings=2, iterations=3) -> None:
+    """
+    Generador de programas Compiscript sintéticos para los benchmarks del compilador.
+    El programa generado es válido (sin errores léxicos, sintácticos ni semánticos) y termina, por lo que
+    también se puede ejecutar.
+
+    @param functions: Cantidad de funciones. Cada una se llama una vez desde el código global.
+    @param depth: Profundidad de anidamiento de los bloques (for, while, if) de cada ciclo de las funciones.
+    @param classes: Cantidad de clases. Cada una tiene una subclase, y se crean instancias de ambas.
+    @param loops: Cantidad de ciclos (con sus bloques anidados) en el cuerpo de cada función.
+    @param strings: Cantidad de operaciones con strings (concatenaciones e impresión) en cada función.
+    @param iterations: Iteraciones de cada ciclo generado. Un ciclo de profundidad depth ejecuta
+      iterations ** depth veces su bloque más interno.
+    """
+    self.functions = functions
+    self.depth = depth
+    self.classes = classes
+    self.loops = loops
+    self.strings = strings
+    self.iterations = iterations
+
+    self.lines = []
+    self.indentation = 0
+
+  def add(self, line):
+    self.lines.append("  " * self.indentation + line)
+
+  def open(self, line):
+    self.add(line + " {")
+    self.indentation += 1
+
+  def close(self, suffix=""):
+    self.indentation -= 1
+    self.add("}" + suffix)
+
+  def generate(self):
+    """
+    Devuelve el código del programa.
+    """
+    self.lines = []
+    self.indentation = 0
+
+    for index in range(self.classes):
+      self.generateClass(index)
+    for index in range(self.functions):
+      self.generateFunction(index)
+    self.generateMain()
+
+    return "\n".join(self.lines) + "\n"
+
+  def generateClass(self, index):
+    self.open(f"class Shape{index}")
+    self.open("init(width, height)")
+    self.add("this.width = width;")
+    self.add("this.height = height;")
+    self.close()
+    self.open("area()")
+    self.add("return this.width * this.height;")
+    self.close()
+    self.open("describe()")
+    self.add('return "shape " + this.area();')
+    self.close()
+    self.close()
+    self.add("")
+
+    self.open(f"class Square{index} extends Shape{index}")
+    self.open("init(side)")
+    self.add("this.width = side;")
+    self.add("this.height = side;")
+    self.close()
+    self.open("describe()")
+    self.add('return "square " + super.describe();')
+    self.close()
+    self.close()
+    self.add("")
+
+  def generateFunction(self, index):
+    self.open(f"fun compute{index}(limit)")
+    self.add("var total = 0;")
+    self.add('var text = "";')
+
+    # Función anidada que utiliza una variable de la función externa
+    self.open("fun scale(value)")
+    self.add("return value + limit + total;")
+    self.close()
+
+    for loop in range(self.loops):
+      self.generateBlock(loop, self.depth)
+
+    for operation in range(self.strings):
+      self.add(f'text = text + "{operation}:" + total;')
+    if self.strings > 0:
+      self.add("print text;")
+
+    self.add("return scale(total % 100);")
+    self.close()
+    self.add("")
+
+  def generateBlock(self, loop, depth):
+    """
+    Genera un bloque de profundidad depth: alterna ciclos for, ciclos while e if/else.
+    """
+    if depth == 0:
+      self.add("total = total + limit * 2 - 1;")
+      return
+
+    variable = f"i{loop}_{depth}"
+    kind = depth % 3
+    if kind == 0:
+      self.open(f"for (var {variable} = 0; {variable} < {self.iterations}; {variable} = {variable} + 1)")
+      self.generateBlock(loop, depth - 1)
+      self.close()
+    elif kind == 1:
+      self.add(f"var {variable} = 0;")
+      self.open(f"while ({variable} < {self.iterations})")
+      self.generateBlock(loop, depth - 1)
+      self.add(f"{variable} = {variable} + 1;")
+      self.close()
+    else:
+      self.open(f"if (total % 2 == 0 and limit >= 0)")
+      self.generateBlock(loop, depth - 1)
+      self.indentation -= 1
+      self.open("} else")
+      self.add("total = total + 1;")
+      self.close()
+
+  def generateMain(self):
+    for index in range(self.classes):
+      self.add(f"var shape{index} = new Shape{index}({index + 1}, 2);")
+      self.add(f"var square{index} = new Square{index}({index + 2});")
+      self.add(f"print shape{index}.describe();")
+      self.add(f"print square{index}.describe();")
+
+    for index in range(self.functions):
+      self.add(f"print compute{index}({index % 5 + 1});")
+
+def generateProgram(functions=10, depth=2, classes=2, loops=2, strings=2, iterations=3):
+  """
+  Devuelve el código de un programa sintético (ver ProgramGenerator).
+  """
+  return ProgramGenerator(functions, depth, classes, loops, strings, iterations).generate()
+
+if __name__ == "__main__":
+  # Uso: python programGenerator.py [functions] [depth] [classes] [loops] [strings]
+  print(generateProgram(*(int(argument) for argument in sys.argv[1:])), end="")
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+
+benchmarksPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(benchmarksPath, "..", "compiler_source_code"))
+
+from compiler import executeCompilation
+from CompilerOptions import CompilerOptions
+from MipsSimulator import MipsSimulator
+from programGenerator import generateProgram
+
+defaultBaselinePath = os.path.join(benchmarksPath, "baselines", "runtimeBenchmark.json")
+
+# Cantidades de la ejecución que se muestran y se comparan con la línea base
+metricNames = ("instructions", "loads", "stores", "syscalls", "heapBytes")
+
+def getPrograms():
+  """
+  Devuelve los programas del benchmark: los de benchmarks/programs y uno generado (ver programGenerator).
+  @return list[(str, str)] - Nombre y código fuente de cada programa.
+  """
+  programs = []
+  for path in sorted(glob.glob(os.path.join(benchmarksPath, "programs", "*.txt"))):
+    with open(path, "r", encoding="utf-8") as file:
+      programs.append((os.path.basename(path), file.read()))
+  programs.append(("generated", generateProgram(functions=6, depth=3, classes=2)))
+  return programs
+
+def runProgram(name, source, options):
+  """
+  Compila un programa y lo ejecuta en el simulador.
+  @return dict - Cantidades de la ejecución (ver MipsSimulator.getStats) y hash de la salida del programa.
+  """
+  # El compilador muestra la tabla de símbolos en la salida estándar
+  with contextlib.redirect_stdout(io.StringIO()):
+    hasErrors, errors, assemblyCode = executeCompilation(name, options, source=source)
+
+  if hasErrors:
+    raise Exception(f"Error al compilar el programa {name}.", errors)
+
+  simulator = MipsSimulator(assemblyCode)
+  output = simulator.run()
+  stats = simulator.getStats()
+
+  result = {metric: stats[metric] for metric in metricNames}
+  result["outputHash"] = hashlib.sha256(output.encode("utf-8")).hexdigest()
+  return result
+
+def compareWithBaseline(results, baseline):
+  """
+  Devuelve la lista de regresiones respecto a la línea base. La ejecución es determinista, por lo que
+  cualquier aumento de una cantidad es una regresión, igual que un cambio en la salida del programa.
+  """
+  regressions = []
+  for name, levels in results.items():
+    for level, result in levels.items():
+      baselineResult = baseline.get(name, {}).get(level)
+      if baselineResult == None:
+        continue
+
+      if result["outputHash"] != baselineResult["outputHash"]:
+        regressions.append(f"{name} -{level}: la salida del programa cambió")
+      for metric in metricNames:
+        if result[metric] > baselineResult[metric]:
+          regressions.append(f"{name} -{level}, {metric}: {baselineResult[metric]} -> {result[metric]}")
+  return regressions
+
+def runBenchmark(optimizationLevels=(0, 1, 2), baselinePath=defaultBaselinePath, saveBaseline=False):
+  """
+  Compila los programas del benchmark con cada nivel de optimización, los ejecuta en el simulador y muestra
+  las instrucciones ejecutadas, los accesos a memoria, los syscalls y los bytes reservados en el heap.
+  La salida de cada programa debe ser la misma con todos los niveles de optimización.
+  @return bool - Indica si no hubo regresiones respecto a la línea base ni diferencias en la salida.
+  """
+  results = {}
+  passed = True
+
+  print(f"  {'programa':20} {'nivel':>5}" + "".join(f" {metric:>12}" for metric in metricNames))
+  for name, source in getPrograms():
+    results[name] = {}
+    for level in optimizationLevels:
+      result = runProgram(name, source, CompilerOptions.fromOptimizationLevel(level))
+      results[name][f"O{level}"] = result
+      print(f"  {name:20} {'-O' + str(level):>5}" + "".join(f" {result[metric]:12}" for metric in metricNames))
+
+    outputHashes = {result["outputHash"] for result in results[name].values()}
+    if len(outputHashes) > 1:
+      print(f"error: la salida de {name} depende del nivel de optimización")
+      passed = False
+
+  if saveBaseline:
+    os.makedirs(os.path.dirname(baselinePath), exist_ok=True)
+    with open(baselinePath, "w", encoding="utf-8") as file:
+      json.dump(results, file, indent=2)
+    print(f"\nlínea base guardada en {baselinePath}")
+    return passed
+
+  if not os.path.exists(baselinePath):
+    return passed
+  with open(baselinePath, "r", encoding="utf-8") as file:
+    baseline = json.load(file)
+
+  regressions = compareWithBaseline(results, baseline)
+  print()
+  if len(regressions) == 0:
+    print("sin regresiones respecto a la línea base")
+  for regression in regressions:
+    print(f"regresión: {regression}")
+  return passed and len(regressions) == 0
+
+if __name__ == "__main__":
+  argumentParser = argparse.ArgumentParser(description="Benchmark del rendimiento del código generado, ejecutado en el simulador de MIPS.")
+  argumentParser.add_argument("-O", dest="optimizationLevels", type=int, choices=(0, 1, 2), action="append", help="Nivel de optimización (se puede repetir). Por defecto 0, 1 y 2.")
+  argumentParser.add_argument("--baseline", dest="baselinePath", default=defaultBaselinePath, help="Archivo JSON de la línea base.")
+  argumentParser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base.")
+  arguments = argumentParser.parse_args()
+
+  passed = runBenchmark(arguments.optimizationLevels or (0, 1, 2), arguments.baselinePath, arguments.save_baseline)
+  sys.exit(0 if passed else 1)
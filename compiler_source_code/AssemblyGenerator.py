@@ -1,13 +1,14 @@
 from assemblyDescriptors import RegisterDescriptor, AddressDescriptor, allowTypeInDescriptor
 from register import RegisterTypes, Register, compilerTemporary, floatCompilerTemporary, temporary as temporaryRegisters, floatTemporary as floatTemporaryRegisters, arguments as argumentRegisters, floatArguments as floatArgumentRegisters, reservedCompilerTemporary
 from compoundTypes import ObjectType, ClassSelfReferenceType, InstanceType
-from IntermediateCodeTokens import STATIC_POINTER, STACK_POINTER, STORE, PRINT_INT, PRINT_FLOAT, PRINT_STR,PRINT_ANY, PLUS, MINUS, MULTIPLY, DIVIDE, MOD, ASSIGN, NEG, EQUAL, NOT_EQUAL, LESS, LESS_EQUAL, GREATER, GREATER_EQUAL, GOTO, LABEL, STRICT_ASSIGN, CONCAT, INT_TO_STR, NOT, REGISTER_FREE, GHOST_REGISTER_FREE, FUNCTION, END_FUNCTION, GET_ARG, RETURN, CALL, RETURN_VAL, PARAM, FLOAT_TO_STR, STORE_CONST, CONST_POINT_CHAR, MALLOC, INPUT_STRING, INPUT_INT, INPUT_FLOAT
+from IntermediateCodeTokens import STATIC_POINTER, STACK_POINTER, STORE, PRINT_INT, PRINT_FLOAT, PRINT_STR,PRINT_ANY, PLUS, MINUS, MULTIPLY, DIVIDE, MOD, SHIFT_LEFT, BIT_AND, ASSIGN, NEG, EQUAL, NOT_EQUAL, LESS, LESS_EQUAL, GREATER, GREATER_EQUAL, GOTO, LABEL, STRICT_ASSIGN, CONCAT, INT_TO_STR, NOT, REGISTER_FREE, GHOST_REGISTER_FREE, REGISTER_RESET, FUNCTION, END_FUNCTION, GET_ARG, RETURN, CALL, RETURN_VAL, PARAM, FLOAT_TO_STR, STORE_CONST, CONST_POINT_CHAR, MALLOC, INPUT_STRING, INPUT_INT, INPUT_FLOAT, WORD_COPY, CLEAR
 from IntermediateCodeInstruction import SingleInstruction, ConditionalInstruction
 from primitiveTypes import FloatType, IntType, StringType, BoolType, NilType
 from utils.decimalToIEEE754 import decimal_to_ieee754
 from utils.consoleColors import yellow_text
-from utils.getUniqueId import getUniqueId
 from Offset import Offset
+from CompilerOptions import CompilerOptions
+from SymbolGenerator import SymbolGenerator
 
 numberSize = 4
 stringSize = 255
@@ -23,7 +24,16 @@ returnFunctionPrefix = "return"
 
 class AssemblyGenerator:
   
-  def __init__(self, code) -> None:
+  def __init__(self, code, options=None, symbolGenerator=None) -> None:
+    self.options = options if options != None else CompilerOptions()
+    self.symbolGenerator = symbolGenerator if symbolGenerator != None else SymbolGenerator() # Labels de la compilación
+    
+    # Enteros y bools guardados directamente en la palabra de memoria (valor << 1 | 1)
+    self.taggedValues = self.options.taggedValues
+    
+    # Ruta rápida int-int en operaciones any, con funciones genéricas para los demás casos
+    self.inlineFastPaths = self.options.inlineFastPaths
+    
     self.registerDescriptor = RegisterDescriptor()
     self.addressDescriptor = AddressDescriptor()
     self.assemblyCode = []
@@ -33,12 +43,22 @@ class AssemblyGenerator:
     self.activeFunctions = [] # Nombre de funciones activas
     
     # Nombre de funciones del compilador
-    self.autoNumberMemoryAlloc = f"auto_number_memory_alloc_{getUniqueId()}"
-    self.getFrameBasePointer = f"get_frame_base_pointer_{getUniqueId()}"
+    self.autoNumberMemoryAlloc = self.symbolGenerator.newLabel("auto_number_memory_alloc")
+    self.getFrameBasePointer = self.symbolGenerator.newLabel("get_frame_base_pointer")
+    self.anyOperationHelpers = {} # (tipo de operación, operador) -> nombre de función genérica
+    
+    # Llamadas en posición de cola (CALL; t = R; RETURN t) que reutilizan el frame actual
+    self.tailCalls = {} # id de instrucción CALL -> FunctionType de la función que la contiene
+    self.skippedInstructions = set() # id de instrucciones R y RETURN de llamadas en cola
+    if self.options.tailCalls:
+      self.findTailCalls(code)
     
     self.generateInitCode()
     
     for instruction in code:
+      if id(instruction) in self.skippedInstructions:
+        continue
+      
       self.addAssemblyCode(f"nop # INSTRUCTION {instruction}")
       self.translateInstruction(instruction)
       #print(yellow_text(instruction), "\n", self.registerDescriptor, self.addressDescriptor, "\n")
@@ -53,6 +73,9 @@ class AssemblyGenerator:
     # Crear función que obtiene el base pointer dentro del frame de una función
     self.getFrameBasePointerFunction()
     
+    # Crear funciones genéricas utilizadas por las operaciones any (solo las requeridas)
+    self.addAnyOperationHelperFunctions()
+    
     self.assemblyCode += self.functionsCode
   
   def addAssemblyCode(self, code):
@@ -76,14 +99,26 @@ class AssemblyGenerator:
     
     
     functionLabel = self.autoNumberMemoryAlloc
-    skipMemoryAllocLabel = f"skip_auto_number_memory_alloc_{getUniqueId()}"
+    skipMemoryAllocLabel = self.symbolGenerator.newLabel("skip_auto_number_memory_alloc")
+    memoryAllocLabel = self.symbolGenerator.newLabel("memory_alloc")
     
     self.addAssemblyCode(f".text")
     self.addAssemblyCode(f".globl {functionLabel}")
     self.addAssemblyCode(f"{functionLabel}:")
     
-    # Verificar si existe un bloque de memoria en el heap, si no crearlo antes de leer
-    self.addAssemblyCode(f"bne $a0, $zero, {skipMemoryAllocLabel} # Si no es cero, ya hay memoria asignada")
+    if not self.taggedValues:
+      # Verificar si existe un bloque de memoria en el heap, si no crearlo antes de leer
+      self.addAssemblyCode(f"bne $a0, $zero, {skipMemoryAllocLabel} # Si no es cero, ya hay memoria asignada")
+    
+    else:
+      # Con valores etiquetados solo los floats usan esta función. La palabra puede contener un entero
+      # etiquetado o la dirección de un bloque de otro tipo, en ambos casos se debe crear uno nuevo.
+      self.addAssemblyCode(f"beq $a0, $zero, {memoryAllocLabel} # Si es cero, no hay memoria asignada")
+      self.addAssemblyCode(f"andi $v0, $a0, 1")
+      self.addAssemblyCode(f"bne $v0, $zero, {memoryAllocLabel} # Es un entero etiquetado, no una dirección")
+      self.addAssemblyCode(f"lb $v0, 0($a0)")
+      self.addAssemblyCode(f"beq $v0, $a2, {skipMemoryAllocLabel} # El bloque ya es del tipo correcto")
+      self.addAssemblyCode(f"{memoryAllocLabel}:")
         
     # Reservar memoria en el heap
     self.addAssemblyCode(f"li $v0, 9")
@@ -121,8 +156,8 @@ class AssemblyGenerator:
     # $fp anterior = $fp actual
     # functionLevel = $fp + 4
         
-    equalFunctionLevelLabel = f"equal_function_level_{getUniqueId()}"
-    repeatFunctionLevelCheckLabel = f"repeat_function_level_check_{getUniqueId()}"
+    equalFunctionLevelLabel = self.symbolGenerator.newLabel("equal_function_level")
+    repeatFunctionLevelCheckLabel = self.symbolGenerator.newLabel("repeat_function_level_check")
     
     self.addAssemblyCode(f"{self.getFrameBasePointer}:")
     
@@ -146,6 +181,142 @@ class AssemblyGenerator:
     # Se encontró el functionLevel correcto, retornarlo como base pointer
     self.addAssemblyCode(f"jr $ra")          
     return reservedCompilerTemporary[1]
+  
+  def addWordTypeCode(self, wordReg, typeReg):
+    """
+    Obtiene en typeReg el tipo de la palabra de memoria de un valor (entero etiquetado o dirección en el heap).
+    """
+    
+    if not self.taggedValues:
+      self.addAssemblyCode(f"lb {typeReg}, 0({wordReg})")
+      return
+    
+    referenceLabel = self.symbolGenerator.newLabel("word_reference")
+    endLabel = self.symbolGenerator.newLabel("word_type_end")
+    
+    self.addAssemblyCode(f"andi {typeReg}, {wordReg}, 1")
+    self.addAssemblyCode(f"beqz {typeReg}, {referenceLabel}")
+    self.addAssemblyCode(f"li {typeReg}, {intId} # Entero etiquetado")
+    self.addAssemblyCode(f"j {endLabel}")
+    self.addAssemblyCode(f"{referenceLabel}:")
+    self.addAssemblyCode(f"lb {typeReg}, 0({wordReg})")
+    self.addAssemblyCode(f"{endLabel}:")
+  
+  def addWordIntValueCode(self, wordReg, valueReg):
+    """
+    Obtiene en valueReg el valor entero de la palabra de memoria de un valor.
+    """
+    if self.taggedValues:
+      self.addAssemblyCode(f"sra {valueReg}, {wordReg}, 1")
+    else:
+      self.addAssemblyCode(f"lw {valueReg}, 4({wordReg})")
+  
+  def addWordsToFloatCode(self):
+    """
+    Carga en floatCompilerTemporary el valor (convertido a float si es entero) de las palabras en $a0 y $a1.
+    compilerTemporary debe contener el tipo de cada una y $a2 el id de float.
+    """
+    
+    words = ("$a0", "$a1")
+    for i in range(2):
+      onlyLoadFloatLabel = self.symbolGenerator.newLabel(f"only_load_float_{i}")
+      endLoadFloatLabel = self.symbolGenerator.newLabel(f"end_load_float_{i}")
+      
+      self.addAssemblyCode(f"beq {compilerTemporary[i]}, $a2, {onlyLoadFloatLabel}")
+      
+      # Convertir a float
+      self.addWordIntValueCode(words[i], compilerTemporary[i])
+      self.addAssemblyCode(f"mtc1 {compilerTemporary[i]}, {floatCompilerTemporary[i]}") # Mover a registro float
+      self.addAssemblyCode(f"cvt.s.w {floatCompilerTemporary[i]}, {floatCompilerTemporary[i]}") # Convertir a float
+      self.addAssemblyCode(f"j {endLoadFloatLabel}")
+      
+      # Solo cargar valor float
+      self.addAssemblyCode(f"{onlyLoadFloatLabel}:")
+      self.addAssemblyCode(f"l.s {floatCompilerTemporary[i]}, 4({words[i]})")
+      
+      self.addAssemblyCode(f"{endLoadFloatLabel}:")
+  
+  def addAnyOperationHelperFunctions(self):
+    """
+    Agrega las funciones genéricas de operaciones any utilizadas en el programa.
+    Reciben en $a0 y $a1 la palabra de memoria de cada operando.
+    Las aritméticas retornan en $v0 la palabra del resultado (entero etiquetado o dirección de un nuevo bloque),
+    las comparaciones retornan en $v0 el resultado (0 o 1).
+    
+    Modifica: $a0, $a1, $a2, $v0, compilerTemporary, floatCompilerTemporary, $f12.
+    """
+    
+    for (kind, operator), functionLabel in self.anyOperationHelpers.items():
+      
+      floatLabel = f"{functionLabel}_float"
+      stringLabel = f"{functionLabel}_string"
+      
+      self.addAssemblyCode(f"{functionLabel}:")
+      
+      # Obtener tipos
+      self.addWordTypeCode("$a0", compilerTemporary[0])
+      self.addWordTypeCode("$a1", compilerTemporary[1])
+      
+      # Verificar si alguno de los valores es float
+      self.addAssemblyCode(f"li $a2, {floatId}")
+      
+      if kind == "arith":
+        
+        if operator != DIVIDE:
+          self.addAssemblyCode(f"beq {compilerTemporary[0]}, $a2, {floatLabel}")
+          self.addAssemblyCode(f"beq {compilerTemporary[1]}, $a2, {floatLabel}")
+          
+          # Ambos son enteros
+          for i in range(2):
+            self.addWordIntValueCode(argumentRegisters[i], compilerTemporary[i])
+          self.addArithmeticOperation(compilerTemporary[0], compilerTemporary[0], compilerTemporary[1], operator, floatOperation=False)
+          
+          if self.taggedValues:
+            self.addAssemblyCode(f"sll $v0, {compilerTemporary[0]}, 1")
+            self.addAssemblyCode(f"ori $v0, $v0, 1")
+          else:
+            heapAddress = self.createHeapMemory(numberSize + 4, None)
+            self.addAssemblyCode(f"sw {compilerTemporary[0]}, 4({heapAddress})")
+            self.saveTypeInHeapMemory(intId, heapAddress)
+          
+          self.addAssemblyCode(f"jr $ra")
+        
+        # Alguno es float (o es división)
+        self.addAssemblyCode(f"{floatLabel}:")
+        self.addWordsToFloatCode()
+        self.addArithmeticOperation(floatArgumentRegisters[0], floatCompilerTemporary[0], floatCompilerTemporary[1], operator, floatOperation=True)
+        
+        heapAddress = self.createHeapMemory(numberSize + 4, None)
+        self.addAssemblyCode(f"s.s {floatArgumentRegisters[0]}, 4({heapAddress})")
+        self.saveTypeInHeapMemory(floatId, heapAddress)
+        self.addAssemblyCode(f"jr $ra")
+        
+      else:
+        
+        self.addAssemblyCode(f"beq {compilerTemporary[0]}, $a2, {floatLabel}")
+        self.addAssemblyCode(f"beq {compilerTemporary[1]}, $a2, {floatLabel}")
+        
+        # Verificar si alguno de los valores es string
+        self.addAssemblyCode(f"li $a2, {stringId}")
+        self.addAssemblyCode(f"beq {compilerTemporary[0]}, $a2, {stringLabel}")
+        self.addAssemblyCode(f"beq {compilerTemporary[1]}, $a2, {stringLabel}")
+        
+        # Comparación entera
+        for i in range(2):
+          self.addWordIntValueCode(argumentRegisters[i], compilerTemporary[i])
+        self.simpleComparisonOperation("$v0", compilerTemporary[0], compilerTemporary[1], operator, floatOperation=False)
+        self.addAssemblyCode(f"jr $ra")
+        
+        # Comparación float
+        self.addAssemblyCode(f"{floatLabel}:")
+        self.addWordsToFloatCode()
+        self.simpleComparisonOperation("$v0", floatCompilerTemporary[0], floatCompilerTemporary[1], operator, floatOperation=True)
+        self.addAssemblyCode(f"jr $ra")
+        
+        # Comparación string
+        self.addAssemblyCode(f"{stringLabel}:")
+        self.stringComparisonOperation("$v0", "$a0", "$a1", operator)
+        self.addAssemblyCode(f"jr $ra")
       
       
   def saveIntRegisterValueInMemory(self, register, object):
@@ -153,9 +324,18 @@ class AssemblyGenerator:
     Guarda el valor de un registro en memoria, en la ubicación correspondiente al objeto.
     Guarda el valor del numero en el heap, es decir, objectStatic->heapAddress->storeValue.
     
+    Con valores etiquetados, el número se guarda directamente en la palabra del objeto.
+    
     Modifica valores de $a0, $a1, $a2, $v0.
     """
     
+    if self.taggedValues:
+      # Agregar etiqueta de entero (bit menos significativo en 1)
+      self.addAssemblyCode(f"sll $a0, {register}, 1 # Guardar int etiquetado en memoria")
+      self.addAssemblyCode(f"ori $a0, $a0, 1")
+      self.addAssemblyCode(f"sw $a0, {self.getOffset(object)}({self.getBasePointer(object)})")
+      return
+    
     objectBasePointer = self.getBasePointer(object)
     objectOffset = self.getOffset(object)
     
@@ -230,15 +410,12 @@ class AssemblyGenerator:
     else:
       # Caso any, se debe realizar una verificación del tipo en tiempo de ejecución
       
-      saveIntRegLabel = f"save_int_reg_{getUniqueId()}"
-      saveFloatRegLabel = f"save_float_reg_{getUniqueId()}"
-      endSaveRegLabel = f"end_save_reg_{getUniqueId()}"
-      
-      # Obtener dirección en el heap
-      self.addAssemblyCode(f"lw $a0, {self.getOffset(object)}({self.getBasePointer(object)})")
+      saveIntRegLabel = self.symbolGenerator.newLabel("save_int_reg")
+      saveFloatRegLabel = self.symbolGenerator.newLabel("save_float_reg")
+      endSaveRegLabel = self.symbolGenerator.newLabel("end_save_reg")
       
       # obtener tipo
-      self.addAssemblyCode(f"lb $a0, 0($a0)")
+      self.getTypeFromHeapMemory(object, "$a0", tempRegister="$a1")
       
       # Estructura de if type == int
       self.addAssemblyCode(f"li $a1, {intId}")
@@ -456,10 +633,15 @@ class AssemblyGenerator:
         # Tratar com int
         
         address = self.getRegister(objectToSave=value, ignoreRegisters=ignoreRegisters) # Obtener registro entero
-        # Cargar dirrección del bloque de memoria en el heap
-        self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})  # cargar addr de heap int {value}")
-        # Cargar valor final (offset de 4 para omitir el byte de tipo)
-        self.addAssemblyCode(f"lw {address}, 4({compilerTemporary[0]}) # NOTA")
+        
+        if self.taggedValues:
+          # El valor está en la misma palabra, solo eliminar la etiqueta
+          self.getIntFromMemory(value, address)
+        else:
+          # Cargar dirrección del bloque de memoria en el heap
+          self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})  # cargar addr de heap int {value}")
+          # Cargar valor final (offset de 4 para omitir el byte de tipo)
+          self.addAssemblyCode(f"lw {address}, 4({compilerTemporary[0]}) # NOTA")
       else:
         raise Exception("No se puede obtener el valor de este objeto.", str(value))
       
@@ -526,15 +708,52 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"li {compilerTemporary[0]}, {typeId} # Guardar tipo en heap")
     self.addAssemblyCode(f"sb {compilerTemporary[0]}, 0({heapAddress})")
   
-  def getTypeFromHeapMemory(self, object, register):
+  def getTypeFromHeapMemory(self, object, register, tempRegister=None):
     """
     Obtiene el tipo de un objeto guardado en memoria dinámica.
     Lo guarda en el registro register.
     
-    Modifica el registro dado en register.
+    Con valores etiquetados, los enteros se reconocen por el bit menos significativo de la palabra
+    y solo las referencias al heap se leen para obtener el byte de tipo.
+    @param tempRegister: Registro temporal, requerido si se utilizan valores etiquetados.
+    
+    Modifica el registro dado en register y tempRegister.
     """
     self.addAssemblyCode(f"lw {register}, {self.getOffset(object)}({self.getBasePointer(object)})")
+    
+    if not self.taggedValues:
+      self.addAssemblyCode(f"lb {register}, 0({register})")
+      return
+    
+    if tempRegister == None:
+      raise Exception("Se requiere un registro temporal para obtener el tipo de un valor etiquetado.")
+    
+    referenceTypeLabel = self.symbolGenerator.newLabel("reference_type")
+    endTypeLabel = self.symbolGenerator.newLabel("end_type")
+    
+    self.addAssemblyCode(f"andi {tempRegister}, {register}, 1 # Verificar etiqueta de entero")
+    self.addAssemblyCode(f"beqz {tempRegister}, {referenceTypeLabel}")
+    self.addAssemblyCode(f"li {register}, {intId}")
+    self.addAssemblyCode(f"j {endTypeLabel}")
+    
+    # Es una referencia al heap, leer el byte de tipo
+    self.addAssemblyCode(f"{referenceTypeLabel}:")
     self.addAssemblyCode(f"lb {register}, 0({register})")
+    self.addAssemblyCode(f"{endTypeLabel}:")
+    
+  def getIntFromMemory(self, object, register):
+    """
+    Carga en register el valor entero de un objeto guardado en memoria.
+    Si se utilizan valores etiquetados, se elimina la etiqueta de la palabra. Si no, se lee del heap.
+    
+    Modifica el registro dado en register.
+    """
+    self.addAssemblyCode(f"lw {register}, {self.getOffset(object)}({self.getBasePointer(object)})")
+    
+    if self.taggedValues:
+      self.addAssemblyCode(f"sra {register}, {register}, 1 # Eliminar etiqueta de entero")
+    else:
+      self.addAssemblyCode(f"lw {register}, 4({register})")
   
   def getHeapMemory(self, object, register):
     """
@@ -572,6 +791,10 @@ class AssemblyGenerator:
         self.translateArithmeticOperation(instruction)
         return
       
+      elif instruction.operator in (SHIFT_LEFT, BIT_AND):
+        self.translateBitwiseOperation(instruction)
+        return
+      
       # elif instruction.operator == ASSIGN:
       #   self.translateAssignmentInstruction(instruction)
       #   return
@@ -623,6 +846,11 @@ class AssemblyGenerator:
         self.freeAllRegisters(updateDescriptors=False)
         return
       
+      elif instruction.operator == REGISTER_RESET:
+        # El código anterior no es alcanzable, los registros no contienen valores que se deban guardar
+        self.freeAllRegisters(saveValues=False)
+        return
+      
       elif instruction.operator == FUNCTION:
         self.translateFunctionDeclaration(instruction)
         return
@@ -670,6 +898,14 @@ class AssemblyGenerator:
       elif instruction.operator == INPUT_FLOAT:
         self.translateInputFloatInstruction(instruction)
         return
+      
+      elif instruction.operator == WORD_COPY:
+        self.translateWordCopyInstruction(instruction)
+        return
+      
+      elif instruction.operator == CLEAR:
+        self.translateClearInstruction(instruction)
+        return
 
     elif isinstance(instruction, ConditionalInstruction):
       self.translateConditionalJumpInstruction(instruction)
@@ -704,10 +940,12 @@ class AssemblyGenerator:
         
     if valueType.equalsType((IntType, BoolType, NilType)):
       # Asignación de número
-      memoryAddressReg = self.createHeapMemory(numberSize + 4, destination)
-      
-      # Guardar el tipo en el heap
-      self.saveTypeInHeapMemory(intId, memoryAddressReg)      
+      # Con valores etiquetados no se necesita memoria en el heap, el valor se guarda al liberar el registro
+      if not self.taggedValues:
+        memoryAddressReg = self.createHeapMemory(numberSize + 4, destination)
+        
+        # Guardar el tipo en el heap
+        self.saveTypeInHeapMemory(intId, memoryAddressReg)      
       
       # Guardar en registro el valor final
       register = self.getRegister(objectToSave=destination)
@@ -815,8 +1053,8 @@ class AssemblyGenerator:
     address = self.getValueInRegister(value, typeId=stringId)
     
     # Cargar e imprimir cada caracter hasta encontrar el nulo
-    loopLabel = f"print_string_{getUniqueId()}"
-    endLabel = f"end_print_string_{getUniqueId()}"
+    loopLabel = self.symbolGenerator.newLabel("print_string")
+    endLabel = self.symbolGenerator.newLabel("end_print_string")
     
     self.addAssemblyCode(f"move {compilerTemporary[0]}, {address} # Guardar dirección de memoria del string")
     self.addAssemblyCode(f"addi {compilerTemporary[0]}, {compilerTemporary[0]}, 1") # Ignorar byte de tipo
@@ -846,15 +1084,12 @@ class AssemblyGenerator:
     # Liberar registros (región ambigua)
     self.freeAllRegisters()
     
-    # Obtener ubicación de inicio de bloque de mem en el heap
-    self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
-    
-    floatPrintLabel = f"print_float_{getUniqueId()}"
-    stringPrintLabel = f"print_string_{getUniqueId()}"
-    endPrintLabel = f"end_print_{getUniqueId()}"
+    floatPrintLabel = self.symbolGenerator.newLabel("print_float")
+    stringPrintLabel = self.symbolGenerator.newLabel("print_string")
+    endPrintLabel = self.symbolGenerator.newLabel("end_print")
     
     # Obtener tipo
-    self.addAssemblyCode(f"lb {compilerTemporary[0]}, 0({compilerTemporary[0]})")
+    self.getTypeFromHeapMemory(value, compilerTemporary[0], tempRegister=compilerTemporary[1])
     
     # Estructura de if else
     self.addAssemblyCode(f"li {compilerTemporary[1]}, {stringId}")
@@ -930,11 +1165,13 @@ class AssemblyGenerator:
       floatOperation = operation == DIVIDE or values[0].strictEqualsType(FloatType) or values[1].strictEqualsType(FloatType)
       
       # Reservar ubicación en heap correspondiente al resultado
-      heapAddress = self.createHeapMemory(numberSize + 4, destination)
-      
-      # Guardar el tipo
-      typeId = floatId if floatOperation else intId
-      self.saveTypeInHeapMemory(typeId, heapAddress)
+      # Con valores etiquetados, un resultado entero no necesita memoria en el heap
+      if floatOperation or not self.taggedValues:
+        heapAddress = self.createHeapMemory(numberSize + 4, destination)
+        
+        # Guardar el tipo
+        typeId = floatId if floatOperation else intId
+        self.saveTypeInHeapMemory(typeId, heapAddress)
       
       
       # Cargar valores en registros
@@ -969,7 +1206,35 @@ class AssemblyGenerator:
       # Actualizar descriptores
       self.registerDescriptor.replaceValueInRegister(resultReg, destination)
       self.addressDescriptor.replaceAddress(destination, resultReg)
-  
+
+  def translateBitwiseOperation(self, instruction):
+    """
+    Desplazamiento a la izquierda (SHIFT_LEFT) o máscara de bits (BIT_AND) de un entero.
+    El segundo operando es un Value con el desplazamiento o la máscara, que se utiliza como inmediato.
+    Se generan en la reducción de fuerza de multiplicaciones y módulos con potencias de dos.
+    """
+    value = instruction.arg1
+    destination = instruction.result
+    immediate = instruction.arg2.value
+
+    # Reservar ubicación en heap correspondiente al resultado
+    # Con valores etiquetados, un resultado entero no necesita memoria en el heap
+    if not self.taggedValues:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
+      self.saveTypeInHeapMemory(intId, heapAddress)
+
+    valueReg = self.getValueInRegister(value)
+    resultReg = self.getRegister(objectToSave=destination, ignoreRegisters=[valueReg])
+
+    if instruction.operator == SHIFT_LEFT:
+      self.addAssemblyCode(f"sll {resultReg}, {valueReg}, {immediate}")
+    else:
+      self.addAssemblyCode(f"andi {resultReg}, {valueReg}, {immediate}")
+
+    # Actualizar descriptores
+    self.registerDescriptor.replaceValueInRegister(resultReg, destination)
+    self.addressDescriptor.replaceAddress(destination, resultReg)
+
   def translateAnyArithmeticOperation(self, instruction):
     """
     Se utiliza cuando alguno de los dos operandos es any (o ambos).
@@ -991,14 +1256,17 @@ class AssemblyGenerator:
     floatTempReg = self.getRegister(objectToSave=None, useFloat=True)
     
     # Reservar ubicación en heap correspondiente al resultado
-    heapAddress = self.createHeapMemory(numberSize + 4, destination)
+    # Con valores etiquetados, se reserva solo si el resultado es float (ver saveAnyOperationResult)
+    heapAddress = None
+    if not self.taggedValues:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
     
     # Obtener tipos
-    self.getTypeFromHeapMemory(object=values[0],register=compilerTemporary[0])
-    self.getTypeFromHeapMemory(object=values[1],register=compilerTemporary[1])
+    self.getTypeFromHeapMemory(object=values[0],register=compilerTemporary[0], tempRegister=tempReg)
+    self.getTypeFromHeapMemory(object=values[1],register=compilerTemporary[1], tempRegister=tempReg)
     
-    arithFloatLabel = f"arith_float_{getUniqueId()}"
-    arithEndLabel = f"arith_end_{getUniqueId()}"
+    arithFloatLabel = self.symbolGenerator.newLabel("arith_float")
+    arithEndLabel = self.symbolGenerator.newLabel("arith_end")
     
     self.addAssemblyCode("# Inicio de operación aritmética any")
     
@@ -1011,18 +1279,14 @@ class AssemblyGenerator:
     
     # cargar valores
     for i in range(2):
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, {self.getOffset(values[i])}({self.getBasePointer(values[i])})")
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, 4({compilerTemporary[i]})")
+      self.getIntFromMemory(values[i], compilerTemporary[i])
     
     if operator != DIVIDE:
       # Realizar la operación
       self.addArithmeticOperation(tempReg, compilerTemporary[0], compilerTemporary[1], operator, floatOperation=False)
       
-      # Guardar resultado en memoria
-      self.addAssemblyCode(f"sw {tempReg}, 4({heapAddress})")
-      
-      # Guardar tipo int en resultado
-      self.saveTypeInHeapMemory(intId, heapAddress)
+      # Guardar resultado int en memoria
+      self.saveAnyOperationResult(tempReg, destination, heapAddress, intId)
     
     else: 
       # Si la operación es división, ambos valores deben ser convertidos a float
@@ -1033,11 +1297,8 @@ class AssemblyGenerator:
       # Realizar la operación
       self.addArithmeticOperation(floatTempReg, floatCompilerTemporary[0], floatCompilerTemporary[1], operator, floatOperation=True)
       
-      # Guardar resultado en memoria
-      self.addAssemblyCode(f"s.s {floatTempReg}, 4({heapAddress})")
-      
-      # Guardar tipo float en resultado
-      self.saveTypeInHeapMemory(floatId, heapAddress)
+      # Guardar resultado float en memoria
+      self.saveAnyOperationResult(floatTempReg, destination, heapAddress, floatId)
     
     self.addAssemblyCode(f"j {arithEndLabel}")  
     
@@ -1049,15 +1310,14 @@ class AssemblyGenerator:
     
     # Verificar si cada uno es float, si no convertir
     for i in range(2):
-      onlyLoadFloatLabel = f"only_load_float_{i}_{getUniqueId()}"
-      endLoadFloatLabel = f"end_load_float_{i}_{getUniqueId()}"
+      onlyLoadFloatLabel = self.symbolGenerator.newLabel(f"only_load_float_{i}")
+      endLoadFloatLabel = self.symbolGenerator.newLabel(f"end_load_float_{i}")
       
       self.addAssemblyCode(f"beq {compilerTemporary[i]}, {tempReg}, {onlyLoadFloatLabel}")
       
       # Convertir a float
       # Cargar valor en registro int. CompilerTemporary[i] = valor int
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, {self.getOffset(values[i])}({self.getBasePointer(values[i])})")
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, 4({compilerTemporary[i]})")
+      self.getIntFromMemory(values[i], compilerTemporary[i])
       
       self.addAssemblyCode(f"mtc1 {compilerTemporary[i]}, {floatCompilerTemporary[i]}") # Mover a registro float
       self.addAssemblyCode(f"cvt.s.w {floatCompilerTemporary[i]}, {floatCompilerTemporary[i]}") # Convertir a float
@@ -1075,15 +1335,151 @@ class AssemblyGenerator:
     # Ya se tienen los valores en registros flotantes, realizar la operación
     self.addArithmeticOperation(floatTempReg, floatCompilerTemporary[0], floatCompilerTemporary[1], operator, floatOperation=True)
     
-    # Guardar resultado en memoria
-    self.addAssemblyCode(f"s.s {floatTempReg}, 4({heapAddress})")
-    
-    # Guardar tipo float en resultado
-    self.saveTypeInHeapMemory(floatId, heapAddress)
+    # Guardar resultado float en memoria
+    self.saveAnyOperationResult(floatTempReg, destination, heapAddress, floatId)
     
     
     self.addAssemblyCode(f"{arithEndLabel}:") # Etiqueta para que int salte a este punto
     
+  def saveAnyOperationResult(self, resultReg, destination, heapAddress, typeId):
+    """
+    Guarda un valor int o float (resultado de una operación any o asignación) en la memoria de destination.
+    @param resultReg: Registro que contiene el resultado.
+    @param heapAddress: Registro con la dirección del bloque reservado para el resultado. 
+      Si es None, se reserva en este punto (al utilizar valores etiquetados, solo los floats lo necesitan).
+    @param typeId: Tipo del resultado, intId o floatId.
+    
+    Modifica: $a0, $v0, compilerTemporary[0].
+    """
+    
+    if typeId == intId and self.taggedValues:
+      self.saveIntRegisterValueInMemory(resultReg, destination)
+      return
+    
+    if heapAddress == None:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
+    
+    storeInstruction = "s.s" if typeId == floatId else "sw"
+    self.addAssemblyCode(f"{storeInstruction} {resultReg}, 4({heapAddress})")
+    
+    # Guardar tipo en resultado
+    self.saveTypeInHeapMemory(typeId, heapAddress)
+  
+  def loadAnyOperandWords(self, values):
+    """
+    Carga en $a0 y $a1 la palabra de memoria de cada operando: un entero etiquetado o 
+    la dirección de su bloque en el heap. Si algún operando está en un registro, primero se guarda en memoria.
+    
+    Modifica: $a0, $a1, $a2, $v0, reservedCompilerTemporary.
+    """
+    
+    # Guardar en memoria si está en registro
+    for value in values:
+      address = self.addressDescriptor.getAddress(value)
+      
+      if isinstance(address, Register):
+        self.saveRegisterValueInMemory(register=address, object=value)
+    
+    for i in range(2):
+      self.addAssemblyCode(f"lw {argumentRegisters[i]}, {self.getOffset(values[i])}({self.getBasePointer(values[i])})")
+  
+  def addIntTypeGuard(self, slowPathLabel):
+    """
+    Agrega una única verificación de que las palabras en $a0 y $a1 son ambas enteros.
+    Si alguna no lo es, salta a slowPathLabel.
+    Con valores etiquetados basta el and de ambas palabras: el bit de etiqueta queda en 1 solo si ambos lo tienen.
+    Sin etiquetas, la suma de ambos tipos es 2 * intId solo si ambos son enteros (los ids inician en 1).
+    
+    Modifica: compilerTemporary.
+    """
+    
+    if self.taggedValues:
+      self.addAssemblyCode(f"and {compilerTemporary[0]}, $a0, $a1")
+      self.addAssemblyCode(f"andi {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
+      self.addAssemblyCode(f"beqz {compilerTemporary[0]}, {slowPathLabel} # Alguno no es entero")
+    else:
+      self.addAssemblyCode(f"lb {compilerTemporary[0]}, 0($a0)")
+      self.addAssemblyCode(f"lb {compilerTemporary[1]}, 0($a1)")
+      self.addAssemblyCode(f"add {compilerTemporary[0]}, {compilerTemporary[0]}, {compilerTemporary[1]}")
+      self.addAssemblyCode(f"li {compilerTemporary[1]}, {intId * 2}")
+      self.addAssemblyCode(f"bne {compilerTemporary[0]}, {compilerTemporary[1]}, {slowPathLabel} # Alguno no es entero")
+  
+  def getAnyOperationHelper(self, kind, operator):
+    """
+    Devuelve el nombre de la función genérica que resuelve una operación any.
+    La función se agrega al final del programa solo si es utilizada.
+    @param kind: "arith" o "comp".
+    """
+    key = (kind, operator)
+    if key not in self.anyOperationHelpers:
+      self.anyOperationHelpers[key] = self.symbolGenerator.newLabel(f"any_{kind}_helper")
+    return self.anyOperationHelpers[key]
+  
+  def translateFastPathAnyArithmeticOperation(self, instruction):
+    """
+    Operación aritmética en la que alguno de los dos operandos es any (o ambos).
+    Si ambos son enteros en tiempo de ejecución, la operación se realiza en línea. 
+    En otro caso se llama a la función genérica correspondiente.
+    """
+    
+    values = (instruction.arg1, instruction.arg2)
+    destination = instruction.result
+    operator = instruction.operator
+    
+    helperLabel = self.getAnyOperationHelper("arith", operator)
+    slowPathLabel = self.symbolGenerator.newLabel("arith_slow_path")
+    arithEndLabel = self.symbolGenerator.newLabel("arith_end")
+    
+    self.addAssemblyCode("# Inicio de operación aritmética any (ruta rápida)")
+    
+    self.loadAnyOperandWords(values)
+    
+    # La división siempre produce float, no tiene ruta rápida entera
+    if operator != DIVIDE:
+      
+      self.addIntTypeGuard(slowPathLabel)
+      
+      if self.taggedValues:
+        # Operar directamente sobre las palabras etiquetadas (2a+1, 2b+1)
+        if operator == PLUS:
+          self.addAssemblyCode(f"add {compilerTemporary[0]}, $a0, $a1")
+          self.addAssemblyCode(f"addi {compilerTemporary[0]}, {compilerTemporary[0]}, -1")
+        elif operator == MINUS:
+          self.addAssemblyCode(f"sub {compilerTemporary[0]}, $a0, $a1")
+          self.addAssemblyCode(f"addi {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
+        elif operator == MULTIPLY:
+          # a * 2b + 1
+          self.addAssemblyCode(f"sra {compilerTemporary[0]}, $a0, 1")
+          self.addAssemblyCode(f"addi {compilerTemporary[1]}, $a1, -1")
+          self.addAssemblyCode(f"mul {compilerTemporary[0]}, {compilerTemporary[0]}, {compilerTemporary[1]}")
+          self.addAssemblyCode(f"addi {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
+        else:
+          self.addAssemblyCode(f"sra {compilerTemporary[0]}, $a0, 1")
+          self.addAssemblyCode(f"sra {compilerTemporary[1]}, $a1, 1")
+          self.addArithmeticOperation(compilerTemporary[0], compilerTemporary[0], compilerTemporary[1], operator, floatOperation=False)
+          self.addAssemblyCode(f"sll {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
+          self.addAssemblyCode(f"ori {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
+        
+        self.addAssemblyCode(f"sw {compilerTemporary[0]}, {self.getOffset(destination)}({self.getBasePointer(destination)})")
+        
+      else:
+        self.addAssemblyCode(f"lw {compilerTemporary[0]}, 4($a0)")
+        self.addAssemblyCode(f"lw {compilerTemporary[1]}, 4($a1)")
+        self.addArithmeticOperation(compilerTemporary[0], compilerTemporary[0], compilerTemporary[1], operator, floatOperation=False)
+        
+        heapAddress = self.createHeapMemory(numberSize + 4, destination)
+        self.addAssemblyCode(f"sw {compilerTemporary[0]}, 4({heapAddress})")
+        self.saveTypeInHeapMemory(intId, heapAddress)
+      
+      self.addAssemblyCode(f"j {arithEndLabel}")
+      self.addAssemblyCode(f"{slowPathLabel}:")
+    
+    # Caso general: la función retorna en $v0 la palabra del resultado
+    self.addAssemblyCode(f"jal {helperLabel}")
+    self.addAssemblyCode(f"sw $v0, {self.getOffset(destination)}({self.getBasePointer(destination)})")
+    
+    self.addAssemblyCode(f"{arithEndLabel}:")
+
   
   def translateArithmeticOperation(self, instruction):
     
@@ -1099,7 +1495,10 @@ class AssemblyGenerator:
       
     else:
       # Al menos uno es any
-      self.translateAnyArithmeticOperation(instruction)
+      if self.inlineFastPaths:
+        self.translateFastPathAnyArithmeticOperation(instruction)
+      else:
+        self.translateAnyArithmeticOperation(instruction)
       
       
       
@@ -1136,6 +1535,21 @@ class AssemblyGenerator:
       valueReg = self.getValueInRegister(value)
       self.saveRegisterValueInMemory(register=valueReg, object=result, typeId=stringId)
     
+    elif self.taggedValues and not isValueAny:
+      # Valores etiquetados: el int se guarda en la palabra de result y el float en un bloque nuevo,
+      # sin importar el tipo anterior de result
+      valueTypeId = floatId if value.strictEqualsType(FloatType) else intId
+      valueReg = self.getValueInRegister(value, typeId=valueTypeId)
+      
+      if valueTypeId == intId:
+        self.saveIntRegisterValueInMemory(valueReg, result)
+      else:
+        self.saveAnyOperationResult(valueReg, result, None, floatId)
+    
+    elif self.taggedValues:
+      # Valores etiquetados y value any: verificar etiqueta y tipo en tiempo de ejecución
+      self.taggedAnyAssignment(value, result)
+    
     elif not isValueAny and not isResultAny:
       # Ambos son de tipo conocido
       
@@ -1167,10 +1581,10 @@ class AssemblyGenerator:
       self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
       self.addAssemblyCode(f"lb {compilerTemporary[0]}, 0({compilerTemporary[0]})")
       
-      endAssignmentLabel = f"end_strict_assignment_{getUniqueId()}"
-      assignStringOrObjectLabel = f"assign_string_or_object_{getUniqueId()}"
-      assignNumberLabel = f"assign_number_{getUniqueId()}"
-      saveNumberLabel = f"save_number_{getUniqueId()}"
+      endAssignmentLabel = self.symbolGenerator.newLabel("end_strict_assignment")
+      assignStringOrObjectLabel = self.symbolGenerator.newLabel("assign_string_or_object")
+      assignNumberLabel = self.symbolGenerator.newLabel("assign_number")
+      saveNumberLabel = self.symbolGenerator.newLabel("save_number")
       
       # Verificar si el tipo de value es string u object. Si lo es solo asignar dirección de heap a result.
       self.addAssemblyCode(f"li {compilerTemporary[1]}, {stringId}")
@@ -1209,7 +1623,7 @@ class AssemblyGenerator:
       # Guardar valor de number en memoria
       self.addAssemblyCode(f"{saveNumberLabel}:")
       
-      saveAsFloatLabel = f"save_as_float_{getUniqueId()}"
+      saveAsFloatLabel = self.symbolGenerator.newLabel("save_as_float")
       
       # Solo si value es any, realizar verificación en tiempo de ejecución
       # Si any ya trae un tipo, solo se crean la asignación del valor directo según el tipo
@@ -1243,6 +1657,44 @@ class AssemblyGenerator:
         
     self.addressDescriptor.freeAddress(result) # Eliminar registros de address de result
     
+  def taggedAnyAssignment(self, value, result):
+    """
+    Asignación de un valor any utilizando valores etiquetados.
+    Los enteros etiquetados, strings y objetos se copian como palabra. Los floats se copian 
+    por valor a un bloque nuevo, para que result no comparta el bloque con value (por ejemplo, 
+    un parámetro con el argumento de la llamada).
+    
+    Modifica: compilerTemporary[0], compilerTemporary[1], floatCompilerTemporary[0], $a0, $a1, $a2, $v0.
+    """
+    
+    copyWordLabel = self.symbolGenerator.newLabel("copy_word_assignment")
+    assignFloatLabel = self.symbolGenerator.newLabel("assign_float")
+    endAssignmentLabel = self.symbolGenerator.newLabel("end_strict_assignment")
+    
+    self.addAssemblyCode(f"# Asignación de tipo any (valores etiquetados)")
+    self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
+    
+    # Si es un entero etiquetado, copiar la palabra
+    self.addAssemblyCode(f"andi {compilerTemporary[1]}, {compilerTemporary[0]}, 1")
+    self.addAssemblyCode(f"bne {compilerTemporary[1]}, $zero, {copyWordLabel}")
+    
+    # Es una referencia, verificar si es float
+    self.addAssemblyCode(f"lb {compilerTemporary[1]}, 0({compilerTemporary[0]})")
+    self.addAssemblyCode(f"xori {compilerTemporary[1]}, {compilerTemporary[1]}, {floatId}")
+    self.addAssemblyCode(f"beqz {compilerTemporary[1]}, {assignFloatLabel}")
+    
+    # Entero, string u objeto
+    self.addAssemblyCode(f"{copyWordLabel}:")
+    self.addAssemblyCode(f"sw {compilerTemporary[0]}, {self.getOffset(result)}({self.getBasePointer(result)})")
+    self.addAssemblyCode(f"j {endAssignmentLabel}")
+    
+    # Float
+    self.addAssemblyCode(f"{assignFloatLabel}:")
+    self.addAssemblyCode(f"l.s {floatCompilerTemporary[0]}, 4({compilerTemporary[0]})")
+    self.saveAnyOperationResult(floatCompilerTemporary[0], result, None, floatId)
+    
+    self.addAssemblyCode(f"{endAssignmentLabel}:")
+    
   def negativeOperationWithType(self, instruction):
     
     value = instruction.arg1
@@ -1254,11 +1706,13 @@ class AssemblyGenerator:
     floatOperation = value.strictEqualsType(FloatType)
     
     # Reservar ubicación en heap correspondiente al resultado
-    heapAddress = self.createHeapMemory(numberSize + 4, destination)
-    
-    # Guardar el tipo
-    typeId = floatId if floatOperation else intId
-    self.saveTypeInHeapMemory(typeId, heapAddress)
+    # Con valores etiquetados, un resultado entero no necesita memoria en el heap
+    if floatOperation or not self.taggedValues:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
+      
+      # Guardar el tipo
+      typeId = floatId if floatOperation else intId
+      self.saveTypeInHeapMemory(typeId, heapAddress)
     
     # Realizar la operación
     if floatOperation:
@@ -1279,16 +1733,20 @@ class AssemblyGenerator:
     destination = instruction.result
     
     # Reservar espacio para resultado
-    heapAddress = self.createHeapMemory(numberSize + 4, destination)
+    # Con valores etiquetados, se reserva solo si el resultado es float (ver saveAnyOperationResult)
+    heapAddress = None
+    if not self.taggedValues:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
     
     # Obtener tipo del valor
-    self.getTypeFromHeapMemory(value, compilerTemporary[1])
+    self.getTypeFromHeapMemory(value, compilerTemporary[1], tempRegister=compilerTemporary[0])
     
     # Guardar tipo resultante en heap
-    self.addAssemblyCode(f"sb {compilerTemporary[1]}, 0({heapAddress})")
+    if heapAddress != None:
+      self.addAssemblyCode(f"sb {compilerTemporary[1]}, 0({heapAddress})")
     
-    floatNegationLabel = f"float_negation_{getUniqueId()}"
-    endNegationLabel = f"end_negation_{getUniqueId()}"
+    floatNegationLabel = self.symbolGenerator.newLabel("float_negation")
+    endNegationLabel = self.symbolGenerator.newLabel("end_negation")
     
     # Verificar tipo
     self.addAssemblyCode(f"li {compilerTemporary[0]}, {floatId}")
@@ -1297,12 +1755,14 @@ class AssemblyGenerator:
     # Es un entero
     
     # Cargar valor del número entero y negarlo
-    self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
-    self.addAssemblyCode(f"lw {compilerTemporary[0]}, 4({compilerTemporary[0]})")
+    self.getIntFromMemory(value, compilerTemporary[0])
     self.addAssemblyCode(f"neg {compilerTemporary[0]}, {compilerTemporary[0]}")
     
     # Guardar en memoria
-    self.addAssemblyCode(f"sw {compilerTemporary[0]}, 4({heapAddress})")
+    if heapAddress != None:
+      self.addAssemblyCode(f"sw {compilerTemporary[0]}, 4({heapAddress})")
+    else:
+      self.saveIntRegisterValueInMemory(compilerTemporary[0], destination)
     self.addAssemblyCode(f"j {endNegationLabel}")
     
     
@@ -1316,7 +1776,10 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"neg.s {floatCompilerTemporary[0]}, {floatCompilerTemporary[0]}")
     
     # Guardar en memoria
-    self.addAssemblyCode(f"s.s {floatCompilerTemporary[0]}, 4({heapAddress})")
+    if heapAddress != None:
+      self.addAssemblyCode(f"s.s {floatCompilerTemporary[0]}, 4({heapAddress})")
+    else:
+      self.saveAnyOperationResult(floatCompilerTemporary[0], destination, heapAddress, floatId)
     
     
     self.addAssemblyCode(f"{endNegationLabel}:")
@@ -1354,8 +1817,8 @@ class AssemblyGenerator:
       # Operación float
       # Mayor, mayor o igual y no igual se invierten
       invert = operation in (NOT_EQUAL, GREATER, GREATER_EQUAL)
-      falseLabel = f"false_float_comp_{getUniqueId()}"
-      endLabel = f"end_float_comp_{getUniqueId()}"
+      falseLabel = self.symbolGenerator.newLabel("false_float_comp")
+      endLabel = self.symbolGenerator.newLabel("end_float_comp")
       
       self.addAssemblyCode(f"{operationMap[operation][1]} {addresses[0]}, {addresses[1]} # Comparación flotante")
       if not invert:
@@ -1412,10 +1875,10 @@ class AssemblyGenerator:
       if addr in compilerTemporary:
         raise ValueError("Los registros temporales del compilador no pueden ser utilizados para comparación de strings.")
       
-    repeatLabel = f"repeat_string_comp_{getUniqueId()}"
-    equalLabel = f"equal_string_comp_{getUniqueId()}"
-    endLabel = f"end_string_comp_{getUniqueId()}"
-    charDiffLabel = f"char_diff_{getUniqueId()}"
+    repeatLabel = self.symbolGenerator.newLabel("repeat_string_comp")
+    equalLabel = self.symbolGenerator.newLabel("equal_string_comp")
+    endLabel = self.symbolGenerator.newLabel("end_string_comp")
+    charDiffLabel = self.symbolGenerator.newLabel("char_diff")
     
     # Loop de comparación de caracteres
     self.addAssemblyCode(f"{repeatLabel}:")
@@ -1494,13 +1957,13 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"# Comparación de tipo any")
     
     # Obtener tipos
-    self.getTypeFromHeapMemory(object=values[0],register=compilerTemporary[0])
-    self.getTypeFromHeapMemory(object=values[1],register=compilerTemporary[1])
+    self.getTypeFromHeapMemory(object=values[0],register=compilerTemporary[0], tempRegister=tempReg)
+    self.getTypeFromHeapMemory(object=values[1],register=compilerTemporary[1], tempRegister=tempReg)
     
     
-    floatCompLabel = f"float_comp_{getUniqueId()}"
-    stringCompLabel = f"string_comp_{getUniqueId()}"
-    endCompLabel = f"end_comp_{getUniqueId()}"
+    floatCompLabel = self.symbolGenerator.newLabel("float_comp")
+    stringCompLabel = self.symbolGenerator.newLabel("string_comp")
+    endCompLabel = self.symbolGenerator.newLabel("end_comp")
     
     # Verificar si alguno de los valores es float
     self.addAssemblyCode(f"li {tempReg}, {floatId}")
@@ -1516,8 +1979,7 @@ class AssemblyGenerator:
     # Comparación entera
     # Cargar ambos valores
     for i in range(2):
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, {self.getOffset(values[i])}({self.getBasePointer(values[i])})")
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, 4({compilerTemporary[i]})")
+      self.getIntFromMemory(values[i], compilerTemporary[i])
       
     # Realizar la operación
     self.simpleComparisonOperation(resultReg, compilerTemporary[0], compilerTemporary[1], operation, floatOperation=False)
@@ -1532,15 +1994,15 @@ class AssemblyGenerator:
     # Verificar si cada uno es float, si no convertir
     # tempreg sigue siendo floatId
     for i in range(2):
-      onlyLoadFloatLabel = f"only_load_float_{i}_{getUniqueId()}"
-      endLoadFloatLabel = f"end_load_float_{i}_{getUniqueId()}"
+      onlyLoadFloatLabel = self.symbolGenerator.newLabel(f"only_load_float_{i}")
+      endLoadFloatLabel = self.symbolGenerator.newLabel(f"end_load_float_{i}")
       
       self.addAssemblyCode(f"beq {compilerTemporary[i]}, {tempReg}, {onlyLoadFloatLabel}")
       
       # Convertir a float
       # floatCompilerTemporary[i] = valor float
-      self.addAssemblyCode(f"lw {compilerTemporary[i]}, {self.getOffset(values[i])}({self.getBasePointer(values[i])})")
-      self.addAssemblyCode(f"l.s {floatCompilerTemporary[i]}, 4({compilerTemporary[i]})")
+      self.getIntFromMemory(values[i], compilerTemporary[i])
+      self.addAssemblyCode(f"mtc1 {compilerTemporary[i]}, {floatCompilerTemporary[i]}") # Mover a registro float
       self.addAssemblyCode(f"cvt.s.w {floatCompilerTemporary[i]}, {floatCompilerTemporary[i]}") # Convertir a float
       
       self.addAssemblyCode(f"j {endLoadFloatLabel}")
@@ -1574,6 +2036,43 @@ class AssemblyGenerator:
     
     
     
+  def fastPathAnyComparisonOperation(self, resultReg, value1, value2, operation):
+    """
+    Comparación en la que alguno de los dos operandos es any (o ambos).
+    Si ambos son enteros en tiempo de ejecución, se comparan en línea. 
+    En otro caso se llama a la función genérica correspondiente.
+    
+    Modifica: resultReg.
+    """
+    
+    values = (value1, value2)
+    
+    helperLabel = self.getAnyOperationHelper("comp", operation)
+    slowPathLabel = self.symbolGenerator.newLabel("comp_slow_path")
+    endCompLabel = self.symbolGenerator.newLabel("end_comp")
+    
+    self.addAssemblyCode(f"# Comparación de tipo any (ruta rápida)")
+    
+    self.loadAnyOperandWords(values)
+    self.addIntTypeGuard(slowPathLabel)
+    
+    if self.taggedValues:
+      # La etiqueta conserva el orden e igualdad de los enteros, se comparan las palabras directamente
+      self.simpleComparisonOperation(resultReg, "$a0", "$a1", operation, floatOperation=False)
+    else:
+      self.addAssemblyCode(f"lw {compilerTemporary[0]}, 4($a0)")
+      self.addAssemblyCode(f"lw {compilerTemporary[1]}, 4($a1)")
+      self.simpleComparisonOperation(resultReg, compilerTemporary[0], compilerTemporary[1], operation, floatOperation=False)
+    
+    self.addAssemblyCode(f"j {endCompLabel}")
+    
+    # Caso general: la función retorna en $v0 el resultado (0 o 1)
+    self.addAssemblyCode(f"{slowPathLabel}:")
+    self.addAssemblyCode(f"jal {helperLabel}")
+    self.addAssemblyCode(f"move {resultReg}, $v0")
+    
+    self.addAssemblyCode(f"{endCompLabel}:")
+    
   def translateComparisonOperation(self, instruction):
     
     values = (instruction.arg1, instruction.arg2)
@@ -1588,16 +2087,21 @@ class AssemblyGenerator:
     stringOperation = any([value.strictEqualsType(StringType) for value in values])
     
     # Reservar ubicación en heap correspondiente al resultado
-    heapAddress = self.createHeapMemory(numberSize + 4, destination)
-    
-    # Guardar el tipo
-    self.saveTypeInHeapMemory(intId, heapAddress) # Resultado bool: entero
+    # Con valores etiquetados, el bool resultante se guarda en la palabra de destination
+    if not self.taggedValues:
+      heapAddress = self.createHeapMemory(numberSize + 4, destination)
+      
+      # Guardar el tipo
+      self.saveTypeInHeapMemory(intId, heapAddress) # Resultado bool: entero
       
     resultReg = self.getRegister(objectToSave=destination)
       
     if anyOperation:
       # Al menos uno es any
-      self.anyComparisonOperation(resultReg, values[0], values[1], operation)
+      if self.inlineFastPaths:
+        self.fastPathAnyComparisonOperation(resultReg, values[0], values[1], operation)
+      else:
+        self.anyComparisonOperation(resultReg, values[0], values[1], operation)
     else:
       # Todos los operadores son de tipo conocido
       
@@ -1624,6 +2128,11 @@ class AssemblyGenerator:
   
   def translateConditionalJumpInstruction(self, instruction):
     
+    if instruction.operator != None:
+      # Comparación fusionada con el salto
+      self.translateComparisonJumpInstruction(instruction)
+      return
+    
     value = instruction.arg1
     branchIfFalse = instruction.branchIfFalse
     goToLabel = instruction.goToLabel
@@ -1638,6 +2147,72 @@ class AssemblyGenerator:
       # Saltar si es verdadero
       self.addAssemblyCode(f"bne {address}, $zero, {goToLabel}")
   
+  def translateComparisonJumpInstruction(self, instruction):
+    """
+    Salto condicional con comparación entre dos valores numéricos de tipo conocido (int, bool, nil o float).
+    La comparación se realiza con la instrucción de salto, sin guardar el bool resultante.
+    
+    Los operandos que no están en un registro se cargan sin actualizar los descriptores: en la etiqueta destino
+    el descriptor corresponde al código siguiente al salto, por lo que no puede contener valores cargados
+    solo en uno de los caminos.
+    """
+    
+    values = (instruction.arg1, instruction.arg2)
+    operation = instruction.operator
+    goToLabel = instruction.goToLabel
+    
+    # Si se salta cuando la condición es falsa, se utiliza la comparación opuesta
+    if instruction.branchIfFalse:
+      operation = {
+        EQUAL: NOT_EQUAL,
+        NOT_EQUAL: EQUAL,
+        LESS: GREATER_EQUAL,
+        LESS_EQUAL: GREATER,
+        GREATER: LESS_EQUAL,
+        GREATER_EQUAL: LESS
+      }[operation]
+    
+    floatOperation = any([value.strictEqualsType(FloatType) for value in values])
+    
+    # Cargar valores en registros
+    addresses = [None, None]
+    for i in range(2):
+      typeId = floatId if values[i].strictEqualsType(FloatType) else intId
+      addresses[i] = self.getValueInRegister(values[i], ignoreRegisters=addresses, typeId=typeId, updateDescriptors=False)
+    
+    if not floatOperation:
+      branchMap = {
+        EQUAL: "beq",
+        NOT_EQUAL: "bne",
+        LESS: "blt",
+        LESS_EQUAL: "ble",
+        GREATER: "bgt",
+        GREATER_EQUAL: "bge"
+      }
+      self.addAssemblyCode(f"{branchMap[operation]} {addresses[0]}, {addresses[1]}, {goToLabel} # Comparación entera y salto")
+      return
+    
+    # Convertir a float los valores enteros
+    for i in range(2):
+      if not values[i].strictEqualsType(FloatType):
+        self.addAssemblyCode(f"mtc1 {addresses[i]} {floatCompilerTemporary[i]}")
+        self.addAssemblyCode(f"cvt.s.w {floatCompilerTemporary[i]}, {floatCompilerTemporary[i]}")
+        addresses[i] = floatCompilerTemporary[i]
+    
+    # Mayor, mayor o igual y no igual se obtienen negando la comparación
+    operationMap = {
+      EQUAL: ("c.eq.s", False),
+      NOT_EQUAL: ("c.eq.s", True),
+      LESS: ("c.lt.s", False),
+      LESS_EQUAL: ("c.le.s", False),
+      GREATER: ("c.le.s", True),
+      GREATER_EQUAL: ("c.lt.s", True)
+    }
+    comparison, invert = operationMap[operation]
+    
+    self.addAssemblyCode(f"{comparison} {addresses[0]}, {addresses[1]} # Comparación flotante")
+    self.addAssemblyCode(f"{'bc1f' if invert else 'bc1t'} {goToLabel}")
+  
   def translateJumpInstruction(self, instruction):
     
     goToLabel = instruction.arg1
@@ -1670,8 +2245,8 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"# translateConcatOperation: concatenar dos strings {stringsReg[0]} y {stringsReg[1]}")
     self.addAssemblyCode(f"li {compilerTemporary[0]}, 0   # Contador de tamaño de ambos strings")
     for i in range(2):
-      strLenLoopLabel = f"str_len_loop{i+1}_{getUniqueId()}"
-      strLenEndLabel = f"str_len_end{i+1}_{getUniqueId()}"
+      strLenLoopLabel = self.symbolGenerator.newLabel(f"str_len_loop{i+1}")
+      strLenEndLabel = self.symbolGenerator.newLabel(f"str_len_end{i+1}")
       
       # Copiar inicio de string a temporal, para que el original no se modifique
       self.addAssemblyCode(f"move {wordCopyReg}, {stringsReg[i]}   # Copiar dirección de memoria del string {i+1}")
@@ -1719,8 +2294,8 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"addi {compilerTemporary[0]}, {compilerTemporary[0]}, 1")
       
     # Iniciar a copiar strings
-    loopCopyLabels = (f"copy_string1_{getUniqueId()}", f"copy_string2_{getUniqueId()}")
-    endCopyLabels = (f"end_copy_string1_{getUniqueId()}", f"end_copy_string2_{getUniqueId()}")
+    loopCopyLabels = (self.symbolGenerator.newLabel("copy_string1"), self.symbolGenerator.newLabel("copy_string2"))
+    endCopyLabels = (self.symbolGenerator.newLabel("end_copy_string1"), self.symbolGenerator.newLabel("end_copy_string2"))
     
     for i in range(2):     
       self.addAssemblyCode(f"move {wordCopyReg}, {stringsReg[i]}   # Copiar dirección de memoria del string {i+1}")
@@ -1782,6 +2357,11 @@ class AssemblyGenerator:
     # Obtener operador any
     anyValue = values[0] if values[0] != stringValue else values[1]
     
+    # Guardar en memoria todos los registros. El tipo del valor any se verifica en memoria y cada rama de la
+    # verificación obtiene registros: si una rama guardara un valor en memoria para liberar su registro,
+    # después de las ramas los descriptores no corresponderían a las demás
+    self.freeAllRegisters()
+    
     # Registro para guardar el string resultante de conversión a string
     anyValueAsStringReg = self.getRegister(objectToSave=None) 
     
@@ -1791,14 +2371,13 @@ class AssemblyGenerator:
       intTempRegs.append(self.getRegister(objectToSave=None, ignoreRegisters=[anyValueAsStringReg] + intTempRegs))
 
     
-    intConcatConvLabel = f"int_concat_conversion_{getUniqueId()}"
-    floatConcatConvLabel = f"float_concat_conversion_{getUniqueId()}"
-    endConcatConvLabel = f"end_concat_conversion_{getUniqueId()}"
+    intConcatConvLabel = self.symbolGenerator.newLabel("int_concat_conversion")
+    floatConcatConvLabel = self.symbolGenerator.newLabel("float_concat_conversion")
+    endConcatConvLabel = self.symbolGenerator.newLabel("end_concat_conversion")
     
     # Verificar si el valor any es float
+    self.getTypeFromHeapMemory(anyValue, compilerTemporary[1], tempRegister=compilerTemporary[0])
     self.addAssemblyCode(f"li {compilerTemporary[0]}, {floatId}")
-    self.addAssemblyCode(f"lw {compilerTemporary[1]}, {self.getOffset(anyValue)}({self.getBasePointer(anyValue)})")
-    self.addAssemblyCode(f"lb {compilerTemporary[1]}, 0({compilerTemporary[1]})")
     self.addAssemblyCode(f"beq {compilerTemporary[0]}, {compilerTemporary[1]}, {floatConcatConvLabel}")
     
     # Verificar si es int
@@ -1912,9 +2491,9 @@ class AssemblyGenerator:
     
     # Guardar el divisor base 10
 
-    handleZeroLabel = f"handle_zero_{getUniqueId()}"
-    convertLoopLabel = f"convert_loop_{getUniqueId()}"
-    endConvertLabel = f"end_convert_{getUniqueId()}"
+    handleZeroLabel = self.symbolGenerator.newLabel("handle_zero")
+    convertLoopLabel = self.symbolGenerator.newLabel("convert_loop")
+    endConvertLabel = self.symbolGenerator.newLabel("end_convert")
     
     # Copiar inicio de string a registro temporal
     self.addAssemblyCode(f"move {tempStringReg}, {stringResultReg}")
@@ -1962,7 +2541,7 @@ class AssemblyGenerator:
     
     # Hacer reverse de la cadena
     
-    reverseLoopLabel = f"reverse_loop_{getUniqueId()}"
+    reverseLoopLabel = self.symbolGenerator.newLabel("reverse_loop")
     
     self.addAssemblyCode(f"{reverseLoopLabel}:")
     
@@ -2013,7 +2592,15 @@ class AssemblyGenerator:
     
     # Obtener ubicación más reciente del número.
     # No se actualizan descriptores porque se va a operar el número
-    tempNumberReg = self.getValueInRegister(number, ignoreRegisters=[stringResultReg], updateDescriptors=False)
+    numberReg = self.getValueInRegister(number, ignoreRegisters=[stringResultReg], updateDescriptors=False)
+
+    # Si el número ya estaba en un registro, este sigue en los descriptores: operar una copia
+    # (con propagación de copias un temporal puede leerse otra vez después de la conversión)
+    if number in self.registerDescriptor.getValuesInRegister(numberReg):
+      tempNumberReg = self.getRegister(objectToSave=None, ignoreRegisters=[stringResultReg, numberReg])
+      self.addAssemblyCode(f"move {tempNumberReg}, {numberReg}")
+    else:
+      tempNumberReg = numberReg
 
     # temporal para string
     tempStringReg = self.getRegister(objectToSave=None, ignoreRegisters=[stringResultReg, tempNumberReg])
@@ -2192,16 +2779,16 @@ class AssemblyGenerator:
     functionName = functionDef.getUniqueName()
     numParams = functionDef.getRealParamsNumber()
     
+    # Guardar registros del camino que llega al final de la función sin return
+    self.freeAllRegisters()
+    
     # Agregar etiqueta a la que apuntan los returns para ejecutar desmontaje de registro de activación
+    # Cada return ya guardó sus registros en memoria, por lo que aquí no se escribe nada de vuelta
     self.addAssemblyCode(f"{returnFunctionPrefix}_{functionName}:")
     
-    # Limpiar registros y descriptores que fueron modificados en la función (saliendo región ambigua)
-    # Al salir de una función se debe considerar que todos los registros fueron vaciados
-    self.freeAllRegisters()
-    
     # Mover $sp a $fp y colocar ceros en toda la memoria liberada
-    clearStackLoopLabel = f"clear_stack_loop_{getUniqueId()}"
-    clearStackEndLabel = f"clear_stack_end_{getUniqueId()}"
+    clearStackLoopLabel = self.symbolGenerator.newLabel("clear_stack_loop")
+    clearStackEndLabel = self.symbolGenerator.newLabel("clear_stack_end")
     
     self.addAssemblyCode(f"{clearStackLoopLabel}:")
     self.addAssemblyCode(f"beq $sp, $fp, {clearStackEndLabel}  # Si $sp es igual a $fp, terminar clear loop")
@@ -2256,6 +2843,12 @@ class AssemblyGenerator:
     offset = topPosition - 4 * (argNumber + 1)
     
     self.addAssemblyCode(f"lw {compilerTemporary[0]}, {offset}($fp)  # Cargar argumento {argNumber}")
+    
+    if self.isOwnNumberCopyRequired(destination):
+      # Parámetro numérico con tipo inferido: no compartir el bloque del argumento del llamador
+      self.saveNumberWordCopy(compilerTemporary[0], destination)
+      return
+    
     self.addAssemblyCode(f"sw {compilerTemporary[0]}, {self.getOffset(destination)}({self.getBasePointer(destination)})  # Guardar argumento en destino")
     
   
@@ -2264,10 +2857,9 @@ class AssemblyGenerator:
     
     value = instruction.arg1
     
-    # Si el valor está en un registro, guardar en memoria
-    valueAddr = self.addressDescriptor.getAddress(value)
-    if isinstance(valueAddr, Register):
-      self.saveRegisterValueInMemory(valueAddr, value)
+    # Guardar en memoria todos los registros de este camino. La etiqueta de retorno es compartida por todos
+    # los returns, por lo que ahí no se conoce qué registros son válidos y no se puede escribir nada de vuelta
+    self.freeAllRegisters(updateDescriptors=False)
     
     # Lo que se retorna es la dirección de memoria del heap
     # Cargar dirección de heap a $v1: los valores de funciones retornan siempre ahi
@@ -2277,11 +2869,101 @@ class AssemblyGenerator:
     currentFunctionName = self.activeFunctions[-1]
     self.addAssemblyCode(f"j {returnFunctionPrefix}_{currentFunctionName}")
     
+  def findTailCalls(self, code):
+    """
+    Busca las llamadas en posición de cola: un CALL seguido de t = R y RETURN t dentro de una función.
+    Solo se consideran las llamadas a funciones con nivel de anidamiento menor o igual al de la función
+    actual, pues la función llamada no puede acceder al frame que se reemplaza.
+    """
+    activeFunctionDefs = []
+    
+    for index, instruction in enumerate(code):
+      operator = getattr(instruction, "operator", None)
+      
+      if operator == FUNCTION:
+        activeFunctionDefs.append(instruction.arg1)
+      elif operator == END_FUNCTION:
+        activeFunctionDefs.pop()
+      
+      if operator != CALL or len(activeFunctionDefs) == 0 or index + 2 >= len(code):
+        continue
+      
+      returnValueInstruction = code[index + 1]
+      returnInstruction = code[index + 2]
+      
+      if getattr(returnValueInstruction, "operator", None) != RETURN_VAL or getattr(returnInstruction, "operator", None) != RETURN:
+        continue
+      if not isinstance(returnInstruction.arg1, ObjectType) or returnInstruction.arg1 != returnValueInstruction.result:
+        continue
+      
+      currentFunctionDef = activeFunctionDefs[-1]
+      if instruction.arg1.getFunctionLevel() > currentFunctionDef.getFunctionLevel():
+        continue
+      
+      self.tailCalls[id(instruction)] = currentFunctionDef
+      self.skippedInstructions.add(id(returnValueInstruction))
+      self.skippedInstructions.add(id(returnInstruction))
+  
+  def translateTailCallInstruction(self, instruction):
+    """
+    Llamada en posición de cola: el frame de la función actual se reemplaza por el de la función llamada.
+    Los argumentos (ya en el stack) se mueven al inicio del frame actual, se limpia el resto del frame
+    y se salta a la función con la dirección de retorno y el frame pointer del llamador de la función actual.
+    
+    Modifica: $a0, $ra, compilerTemporary[0] y compilerTemporary[1].
+    """
+    
+    functionDef = instruction.arg1
+    functionName = functionDef.getUniqueName()
+    currentFunctionDef = self.tailCalls[id(instruction)]
+    
+    numParams = int(instruction.arg2)
+    currentNumParams = currentFunctionDef.getRealParamsNumber()
+    
+    # Dirección del último argumento en el nuevo frame (relativa a $fp): justo debajo de los
+    # argumentos de la función actual, sobre $fp anterior, function level y dirección de retorno
+    argumentsBase = 4 * (3 + currentNumParams - numParams)
+    
+    # Limpiar registros y descriptores pues variables podrían modificarse dentro de función
+    self.freeAllRegisters()
+    
+    self.addAssemblyCode(f"# Llamada en cola a {functionName}")
+    
+    # Guardar dirección de retorno y frame pointer del llamador antes de sobreescribir el frame
+    self.addAssemblyCode(f"lw $ra, 8($fp)  # Dirección de retorno de la función actual")
+    self.addAssemblyCode(f"lw {compilerTemporary[1]}, 0($fp)  # Frame pointer anterior")
+    
+    # Mover argumentos, iniciando por el de dirección más alta (el destino siempre está sobre el origen)
+    for argNumber in range(numParams):
+      offset = 4 * (numParams - 1 - argNumber)
+      self.addAssemblyCode(f"lw {compilerTemporary[0]}, {offset}($sp)  # Mover argumento {argNumber}")
+      self.addAssemblyCode(f"sw {compilerTemporary[0]}, {argumentsBase + offset}($fp)")
+    
+    # Limpiar memoria liberada, desde $sp hasta el inicio de los argumentos movidos
+    clearStackLoopLabel = self.symbolGenerator.newLabel("clear_stack_loop")
+    clearStackEndLabel = self.symbolGenerator.newLabel("clear_stack_end")
+    
+    self.addAssemblyCode(f"addu $a0, $fp, {argumentsBase}")
+    self.addAssemblyCode(f"{clearStackLoopLabel}:")
+    self.addAssemblyCode(f"beq $sp, $a0, {clearStackEndLabel}")
+    self.addAssemblyCode(f"sw $zero, 0($sp)  # Limpiar valor en memoria")
+    self.addAssemblyCode(f"addu $sp, $sp, 4")
+    self.addAssemblyCode(f"j {clearStackLoopLabel}")
+    self.addAssemblyCode(f"{clearStackEndLabel}:")
+    
+    # Restaurar frame pointer del llamador y saltar (sin jal, se conserva la dirección de retorno)
+    self.addAssemblyCode(f"move $fp, {compilerTemporary[1]}")
+    self.addAssemblyCode(f"j {functionName}")
+  
   def translateCallInstruction(self, instruction):
     
     functionDef = instruction.arg1
     functionName = functionDef.getUniqueName()
     
+    if id(instruction) in self.tailCalls:
+      self.translateTailCallInstruction(instruction)
+      return
+    
     # Limpiar registros y descriptores pues variables podrían modificarse dentro de función
     self.freeAllRegisters()
     
@@ -2292,26 +2974,35 @@ class AssemblyGenerator:
     
     destination = instruction.result
     
+    # El nuevo valor está solo en memoria, no en registros. El valor anterior del registro no se guarda,
+    # pues se escribiría en el bloque retornado por la función
+    self.removeValueFromRegisters(destination)
+    
+    if self.isOwnNumberCopyRequired(destination):
+      # El bloque retornado puede ser el de una variable de otro frame (return de un parámetro o global)
+      self.saveNumberWordCopy("$v1", destination)
+      return
+    
     # Lo que se obtiene de $v1 es la dirección de memoria del heap
     # Se sobreescribe en la dirección de destination
     self.addAssemblyCode(f"sw $v1, {self.getOffset(destination)}({self.getBasePointer(destination)})")    
     
-    # El nuevo valor está solo en memoria, no en registros.
-    # Actualizar descriptores
-    destAddresss = self.addressDescriptor.getAddress(destination)
-    if isinstance(destAddresss, Register):
-      # Guardar valor en memoria
-      self.saveRegisterValueInMemory(destAddresss, destination)
-      
-      # Eliminar valor de destination en
-      self.addressDescriptor.removeAddress(object=destination, address=destAddresss)
-      self.registerDescriptor.removeValueFromRegister(register=destAddresss, value=destination)
-    
     
   def translateParamInstruction(self, instruction):
     
     value = instruction.arg1
     
+    if self.taggedValues:
+      # Guardar en memoria el valor si está en un registro y pasar la palabra (entero etiquetado o referencia)
+      valueAddress = self.addressDescriptor.getAddress(value)
+      if isinstance(valueAddress, Register):
+        self.saveRegisterValueInMemory(valueAddress, value)
+        
+      self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
+      self.addAssemblyCode(f"subu $sp, $sp, 4  # Hacer push de argumento")
+      self.addAssemblyCode(f"sw {compilerTemporary[0]}, 0($sp)")
+      return
+    
     # Obtener dirección de memoria del heap que contiene el valor
     self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
     
@@ -2331,7 +3022,7 @@ class AssemblyGenerator:
         # Obtener el tipo int o string en tiempo de ejecución
         self.addAssemblyCode(f"lb {compilerTemporary[1]}, 0({compilerTemporary[0]})")
         
-        endStoreParamLabel = f"end_store_param_{getUniqueId()}"
+        endStoreParamLabel = self.symbolGenerator.newLabel("end_store_param")
         
         # Si es string no se guarda el valor, ya está en el heap
         self.addAssemblyCode(f"beq {compilerTemporary[1]}, {stringId}, {endStoreParamLabel}")
@@ -2346,6 +3037,75 @@ class AssemblyGenerator:
     self.addAssemblyCode(f"subu $sp, $sp, 4  # Hacer push de argumento")
     self.addAssemblyCode(f"sw {compilerTemporary[0]}, 0($sp)")
     
+  def isOwnNumberCopyRequired(self, destination):
+    """
+    Indica si un valor recibido de otro objeto (GET_ARG, R o WORD_COPY) se debe copiar a un bloque propio
+    de destination en lugar de compartir el bloque. Los números con tipo conocido se mantienen en registros
+    y se guardan en su bloque al liberarlos, lo que modificaría la variable que comparte el bloque
+    (por ejemplo, el argumento del llamador). Con valores etiquetados solo los floats utilizan un bloque.
+    """
+    if self.taggedValues:
+      return destination.strictEqualsType(FloatType)
+    return destination.strictEqualsType((IntType, BoolType, NilType)) or destination.strictEqualsType(FloatType)
+  
+  def saveNumberWordCopy(self, wordReg, destination):
+    """
+    Guarda en destination una copia del número cuya palabra de memoria (dirección del bloque en el heap)
+    está en wordReg, en un bloque nuevo.
+    
+    Modifica: $a0, $v0, compilerTemporary[0], compilerTemporary[1], floatCompilerTemporary[0].
+    """
+    if destination.strictEqualsType(FloatType):
+      self.addAssemblyCode(f"l.s {floatCompilerTemporary[0]}, 4({wordReg}) # Copiar float a bloque propio")
+      self.saveAnyOperationResult(floatCompilerTemporary[0], destination, None, floatId)
+    else:
+      self.addAssemblyCode(f"lw {compilerTemporary[1]}, 4({wordReg}) # Copiar int a bloque propio")
+      self.saveAnyOperationResult(compilerTemporary[1], destination, None, intId)
+    
+  def translateWordCopyInstruction(self, instruction):
+    """
+    Copia la palabra de memoria de un valor (dirección del heap o entero etiquetado) a otro objeto,
+    de la misma forma en que PARAM + GET_ARG o RETURN + R pasan valores entre funciones.
+    """
+
+    value = instruction.arg1
+    destination = instruction.result
+
+    # Si el último valor está en un registro, guardarlo en memoria antes de copiar la palabra
+    valueAddress = self.addressDescriptor.getAddress(value)
+    if isinstance(valueAddress, Register):
+      self.saveRegisterValueInMemory(valueAddress, value)
+
+    # El nuevo valor de destination está solo en memoria
+    self.removeValueFromRegisters(destination)
+
+    self.addAssemblyCode(f"lw {compilerTemporary[0]}, {self.getOffset(value)}({self.getBasePointer(value)})")
+
+    if self.isOwnNumberCopyRequired(destination):
+      self.saveNumberWordCopy(compilerTemporary[0], destination)
+      return
+
+    self.addAssemblyCode(f"sw {compilerTemporary[0]}, {self.getOffset(destination)}({self.getBasePointer(destination)})")
+
+  def translateClearInstruction(self, instruction):
+    """
+    Coloca cero en la palabra de memoria de un objeto (sin valor asignado), como en un frame nuevo.
+    """
+
+    destination = instruction.result
+
+    self.addAssemblyCode(f"sw $zero, {self.getOffset(destination)}({self.getBasePointer(destination)})")
+    self.removeValueFromRegisters(destination)
+
+  def removeValueFromRegisters(self, object):
+    """
+    Elimina el objeto de los descriptores de registros, sin guardar su valor en memoria.
+    """
+    address = self.addressDescriptor.getAddress(object)
+    if isinstance(address, Register):
+      self.addressDescriptor.removeAddress(object=object, address=address)
+      self.registerDescriptor.removeValueFromRegister(register=address, value=object)
+
   def translateMallocInstruction(self, instruction):
     
     size = int(instruction.arg1)
@@ -2381,6 +3141,13 @@ class AssemblyGenerator:
     
     destination = instruction.result
     
+    if self.taggedValues:
+      # Leer int y guardarlo etiquetado en la palabra de destination
+      self.addAssemblyCode(f"li $v0, 5  # Leer int")
+      self.addAssemblyCode("syscall")
+      self.saveIntRegisterValueInMemory("$v0", destination)
+      return
+    
     # Guardar espacio en heap para almacenar número
     address = self.createHeapMemory(numberSize + 4, destination)
     
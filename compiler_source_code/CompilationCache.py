@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import tempfile
+from Errors import SemanticError, LexicalError, SyntaxError
+
+# Versión del formato de las entradas. Se incrementa si cambia el contenido guardado.
+cacheFormatVersion = 1
+
+# Opciones que no modifican el resultado de la compilación y no forman parte de la llave
+ignoredOptions = ("parserStatePath", "compileCachePath", "compileCacheSize")
+
+# Clases de error que se pueden guardar en la caché
+errorClasses = {errorClass.__name__: errorClass for errorClass in (SemanticError, LexicalError, SyntaxError)}
+
+compilerHash = None
+
+def getCompilerHash():
+  """
+  Devuelve el hash del código fuente del compilador (todos los módulos .py, incluyendo el parser generado por ANTLR).
+  Cambia con cualquier modificación del compilador, por lo que las entradas de versiones anteriores no se utilizan.
+  Se calcula una sola vez por proceso.
+  """
+  global compilerHash
+  if compilerHash != None:
+    return compilerHash
+
+  compilerPath = os.path.dirname(os.path.abspath(__file__))
+  paths = []
+  for directory, directories, files in os.walk(compilerPath):
+    directories[:] = sorted(name for name in directories if name != "__pycache__")
+    paths += [os.path.join(directory, name) for name in files if name.endswith(".py")]
+
+  compilerSourceHash = hashlib.sha256()
+  for path in sorted(paths):
+    compilerSourceHash.update(os.path.relpath(path, compilerPath).encode("utf-8") + b"\0")
+    with open(path, "rb") as file:
+      compilerSourceHash.update(file.read() + b"\0")
+
+  compilerHash = compilerSourceHash.hexdigest()
+  return compilerHash
+
+class CompilationCache:
+
+  def __init__(self, path, maxSize) -> None:
+    """
+    Caché en disco de los resultados de la compilación (assembly y errores), direccionada por contenido.
+    La llave de cada entrada es el hash del código fuente, del compilador (ver getCompilerHash) y de las opciones,
+    por lo que una entrada nunca se invalida: un cambio en cualquiera de ellos produce otra llave.
+
+    Cada entrada es un archivo JSON en el directorio path. Las escrituras son atómicas (archivo temporal y
+    os.replace), por lo que varios procesos pueden compartir el directorio. Al leer una entrada se actualiza su
+    fecha de modificación y, al guardar una nueva, si el directorio supera maxSize bytes se eliminan las entradas
+    usadas hace más tiempo (LRU).
+
+    @param path: Ruta del directorio de la caché.
+    @param maxSize: Tamaño máximo del directorio en bytes.
+    """
+    self.path = path
+    self.maxSize = maxSize
+
+  def getKey(self, source, options):
+    """
+    Devuelve la llave de la compilación del código source con las opciones indicadas.
+    @param source: str - Código fuente.
+    @param options: CompilerOptions - Opciones de la compilación.
+    """
+    optionValues = {name: value for name, value in sorted(vars(options).items()) if name not in ignoredOptions}
+    content = json.dumps([cacheFormatVersion, getCompilerHash(), optionValues, source])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+  def getEntryPath(self, key):
+    return os.path.join(self.path, key + ".json")
+
+  def load(self, key):
+    """
+    Busca el resultado de una compilación.
+    @return (hasErrors, errors, assemblyCode) o None si la entrada no existe o no se puede leer.
+    """
+    entryPath = self.getEntryPath(key)
+    try:
+      with open(entryPath, "r", encoding="utf-8") as file:
+        entry = json.load(file)
+      os.utime(entryPath) # La fecha de modificación indica el último uso
+
+      errors = [errorClasses[error["type"]](error["message"], error["line"], error["column"]) for error in entry["errors"]]
+      return entry["hasErrors"], errors, entry["assembly"]
+
+    except (OSError, ValueError, KeyError, TypeError):
+      return None
+
+  def store(self, key, hasErrors, errors, assemblyCode):
+    """
+    Guarda el resultado de una compilación y elimina las entradas más antiguas si se supera el tamaño máximo.
+    Los resultados con errores que no son de compilación (excepciones del compilador) no se guardan.
+    @return bool - Indica si se guardó la entrada.
+    """
+    if any(type(error).__name__ not in errorClasses for error in errors):
+      return False
+
+    entry = {
+      "hasErrors": hasErrors,
+      "errors": [
+        {"type": type(error).__name__, "message": error.message, "line": error.line, "column": error.column}
+        for error in errors
+      ],
+      "assembly": assemblyCode,
+    }
+
+    temporaryPath = None
+    try:
+      os.makedirs(self.path, exist_ok=True)
+      descriptor, temporaryPath = tempfile.mkstemp(dir=self.path, prefix=".entry")
+      with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        json.dump(entry, file)
+      os.replace(temporaryPath, self.getEntryPath(key))
+
+    except OSError:
+      # La caché es solo una optimización: si no se puede escribir, la compilación continúa
+      if temporaryPath != None and os.path.exists(temporaryPath):
+        os.remove(temporaryPath)
+      return False
+
+    self.evict()
+    return True
+
+  def evict(self):
+    """
+    Elimina las entradas usadas hace más tiempo hasta que el directorio no supere el tamaño máximo.
+    """
+    entries = []
+    totalSize = 0
+    with os.scandir(self.path) as directory:
+      for item in directory:
+        if not item.name.endswith(".json"):
+          continue
+        try:
+          status = item.stat()
+        except OSError:
+          continue # Eliminada por otro proceso
+        entries.append((status.st_mtime, item.path, status.st_size))
+        totalSize += status.st_size
+
+    entries.sort()
+    for _, path, size in entries:
+      if totalSize <= self.maxSize:
+        break
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+      totalSize -= size
@@ -0,0 +1,126 @@
+import contextlib
+import json
+import time
+import tracemalloc
+from antlr4.tree.Tree import TerminalNode
+
+def countParseTreeNodes(tree):
+  """
+  Devuelve la cantidad de nodos del árbol sintáctico (contextos y tokens).
+  """
+  count = 0
+  pending = [tree]
+  while len(pending) > 0:
+    node = pending.pop()
+    count += 1
+    if not isinstance(node, TerminalNode) and node.children != None:
+      pending += node.children
+  return count
+
+class PhaseStats:
+
+  def __init__(self, name) -> None:
+    """
+    Medición de una fase de la compilación.
+    name: nombre de la fase
+    wallSeconds: tiempo transcurrido
+    cpuSeconds: tiempo de CPU del proceso (incluye otros hilos del proceso, si los hay)
+    peakMemory: memoria máxima reservada durante la fase por encima de la reservada al iniciarla, en bytes
+      (tracemalloc). None si no se midió la memoria.
+    counts: cantidades de la fase, p. ej. {"tokens": 120} o {"irInstructions": 300}
+    passReports: informe de los passes de la fase que lo generan, p. ej.
+      {"PeepholeOptimization": {"redundantLoads": 12}} (ver PassManager.getReports)
+    """
+    self.name = name
+    self.wallSeconds = 0
+    self.cpuSeconds = 0
+    self.peakMemory = None
+    self.counts = {}
+    self.passReports = {}
+
+  def toDict(self):
+    return {
+      "name": self.name, "wallSeconds": self.wallSeconds, "cpuSeconds": self.cpuSeconds,
+      "peakMemory": self.peakMemory, "counts": self.counts, "passReports": self.passReports,
+    }
+
+  def __repr__(self) -> str:
+    return f"PhaseStats({self.toDict()})"
+
+class CompilationStats:
+
+  def __init__(self, traceMemory=True) -> None:
+    """
+    Estadísticas de una compilación por fase: análisis léxico (lexing), sintáctico (parsing), semántico
+    (semantic), aplanamiento del código intermedio (intermediateCode), passes de código intermedio (optimization),
+    generación de assembly (assembly) y passes de assembly (assemblyOptimization). Se pasa a executeCompilation,
+    que agrega las fases ejecutadas.
+
+    Si el resultado proviene de la caché de compilaciones, cacheHit es True y no se agregan fases.
+
+    @param traceMemory: Si se mide la memoria máxima de cada fase con tracemalloc. La medición hace que la
+      compilación sea varias veces más lenta, por lo que los tiempos no son comparables con los de una
+      compilación sin medición de memoria.
+    """
+    self.traceMemory = traceMemory
+    self.cacheHit = False
+    self.phases = []
+
+  @contextlib.contextmanager
+  def measure(self, name):
+    """
+    Mide el bloque with como la fase name y la agrega a las fases. Devuelve el PhaseStats de la fase,
+    en el que se pueden agregar cantidades.
+    """
+    phase = PhaseStats(name)
+    self.phases.append(phase)
+
+    startedTracing = self.traceMemory and not tracemalloc.is_tracing()
+    if startedTracing:
+      tracemalloc.start()
+    if self.traceMemory:
+      tracemalloc.reset_peak()
+      startMemory = tracemalloc.get_traced_memory()[0]
+
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+    try:
+      yield phase
+    finally:
+      phase.wallSeconds = time.perf_counter() - wallStart
+      phase.cpuSeconds = time.process_time() - cpuStart
+
+      if self.traceMemory:
+        phase.peakMemory = max(tracemalloc.get_traced_memory()[1] - startMemory, 0)
+      if startedTracing:
+        tracemalloc.stop()
+
+  def getPhase(self, name):
+    """
+    Devuelve la última medición de la fase name, o None si no se ejecutó.
+    """
+    for phase in reversed(self.phases):
+      if phase.name == name:
+        return phase
+    return None
+
+  def getWallSeconds(self):
+    return sum(phase.wallSeconds for phase in self.phases)
+
+  def getCpuSeconds(self):
+    return sum(phase.cpuSeconds for phase in self.phases)
+
+  def toDict(self):
+    return {
+      "cacheHit": self.cacheHit,
+      "wallSeconds": self.getWallSeconds(),
+      "cpuSeconds": self.getCpuSeconds(),
+      "peakMemory": max((phase.peakMemory for phase in self.phases if phase.peakMemory != None), default=None),
+      "phases": [phase.toDict() for phase in self.phases],
+    }
+
+  def toJson(self, indent=2):
+    """
+    Devuelve las estadísticas en formato JSON.
+    """
+    return json.dumps(self.toDict(), indent=indent)
@@ -0,0 +1,117 @@
+# Opciones habilitadas en cada nivel de optimización (-O0, -O1, -O2)
+optimizationLevels = {
+  0: {},
+  1: {
+    "inlineFastPaths": True, "typeInference": True, "fuseComparisonBranches": True, "jumpCodeConditions": True,
+    "propagateCopies": True, "eliminateDeadCode": True, "peepholeOptimization": True,
+  },
+  2: {
+    "inlineFastPaths": True, "typeInference": True, "fuseComparisonBranches": True, "jumpCodeConditions": True,
+    "propagateCopies": True, "eliminateDeadCode": True, "peepholeOptimization": True,
+    "inlineFunctions": True, "specializeFunctions": True, "tailCalls": True, "eliminateCommonSubexpressions": True,
+    "hoistLoopInvariants": True, "reduceStrength": True,
+  },
+}
+
+class CompilerOptions:
+
+  def __init__(self, taggedValues=False, inlineFastPaths=False, typeInference=False,
+               specializeFunctions=False, specializationBudget=1000, inlineFunctions=False,
+               inlineThreshold=20, tailCalls=False, fuseComparisonBranches=False,
+               jumpCodeConditions=False, eliminateDeadCode=False, eliminateCommonSubexpressions=False,
+               propagateCopies=False, hoistLoopInvariants=False, reduceStrength=False,
+               peepholeOptimization=False, peepholeWindow=4, verifyPasses=False,
+               recursiveDescentParser=False, regexLexer=False, parserStatePath=None,
+               compileCachePath=None, compileCacheSize=64 * 1024 * 1024) -> None:
+    """
+    Opciones que modifican la forma en que se genera el código.
+    Los valores por defecto conservan el comportamiento original del compilador.
+
+    taggedValues: Si los enteros (y bools) se representan directamente en la palabra de memoria
+      de la variable, con la etiqueta 1 en el bit menos significativo (valor << 1 | 1).
+      Floats, strings y objetos continúan siendo referencias al heap (bit menos significativo en 0).
+      Los enteros quedan limitados a 31 bits.
+    inlineFastPaths: Si las operaciones aritméticas y comparaciones con operandos any verifican en línea,
+      con una sola comparación, que ambos operandos sean enteros y en ese caso realizan la operación entera
+      directamente. Los demás casos (float, string) se resuelven llamando a funciones genéricas del compilador.
+      Con taggedValues la verificación es un único and sobre los bits de etiqueta.
+    typeInference: Si se ejecuta la inferencia de tipos de todo el programa sobre el código intermedio,
+      para que parámetros y temporales numéricos any utilicen las operaciones con tipo.
+    specializeFunctions: Si se crean copias de las funciones por cada combinación de tipos numéricos de
+      argumentos encontrada en sus llamadas, redirigiendo cada llamada a la copia con tipos concretos.
+    specializationBudget: Cantidad máxima de instrucciones de código intermedio que pueden agregar las copias.
+    inlineFunctions: Si las llamadas a funciones pequeñas y no recursivas se reemplazan por el cuerpo de la función.
+    inlineThreshold: Cantidad máxima de instrucciones de código intermedio del cuerpo de una función para sustituirla.
+    tailCalls: Si las llamadas en posición de cola (return f(...)) reutilizan el frame de la función actual,
+      de forma que la recursión en cola utiliza memoria de stack constante.
+    fuseComparisonBranches: Si las comparaciones numéricas que solo se utilizan como condición de un salto
+      (if, while, for) se traducen directamente a una instrucción de salto, sin crear el bool intermedio.
+    jumpCodeConditions: Si las operaciones and/or utilizadas como condición de if, while o for generan
+      solo saltos entre etiquetas de verdadero y falso. El bool se guarda únicamente si se utiliza como valor.
+    eliminateDeadCode: Si se eliminan del código intermedio las funciones que no se utilizan, el código no
+      alcanzable y las definiciones de temporales que nunca se leen, antes de generar el assembly.
+    eliminateCommonSubexpressions: Si las operaciones aritméticas y comparaciones que se repiten con los mismos
+      operandos (sin modificaciones entre ellas) reutilizan el temporal calculado la primera vez.
+    propagateCopies: Si las lecturas de variables asignadas desde un temporal leen directamente el temporal,
+      uniendo las variables que se definen una sola vez con su temporal y eliminando las asignaciones sin uso.
+    hoistLoopInvariants: Si las constantes y operaciones numéricas cuyos operandos no cambian dentro de un ciclo
+      se calculan una sola vez antes del ciclo.
+    reduceStrength: Si las operaciones enteras con una constante se simplifican: se eliminan las identidades
+      (x + 0, x * 1), x * 0 se reemplaza por 0 y las multiplicaciones y módulos con potencias de dos se
+      traducen a desplazamientos (sll) y máscaras (andi).
+    peepholeOptimization: Si se aplica la optimización de mirilla sobre el assembly generado (movimientos a sí mismo,
+      saltos a la siguiente etiqueta, loads después de un store a la misma dirección, li repetidos y marcadores nop).
+    peepholeWindow: Cantidad de instrucciones siguientes que examina cada regla de la optimización de mirilla.
+    verifyPasses: Si se verifican las invariantes del código intermedio después de cada pass de optimización
+      (modo de depuración, ver IntermediateCodeVerifier).
+    recursiveDescentParser: Si el análisis léxico y sintáctico se realiza con CompiscriptScanner y el parser
+      descendente recursivo escrito a mano (RecursiveDescentParser) en lugar de los generados por ANTLR.
+      El árbol es el mismo, pero solo se reporta el primer error sintáctico.
+    regexLexer: Si el parser de ANTLR recibe los tokens de CompiscriptScanner (una sola expresión regular) en lugar
+      de CompiscriptLexer. Los tokens y los errores léxicos son los mismos.
+    parserStatePath: Ruta del archivo en el que se guarda el estado del parser de ANTLR (ATN y DFA de predicción)
+      después de cada análisis y del que se carga al iniciar el proceso (ver ParserStateCache). None para no usarlo.
+    compileCachePath: Directorio de la caché de compilaciones (ver CompilationCache). Si el mismo código fuente ya se
+      compiló con la misma versión del compilador y las mismas opciones, se devuelve el resultado guardado. None para
+      no usarla.
+    compileCacheSize: Tamaño máximo en bytes de la caché de compilaciones.
+    """
+    self.taggedValues = taggedValues
+    self.inlineFastPaths = inlineFastPaths
+    self.typeInference = typeInference
+    self.specializeFunctions = specializeFunctions
+    self.specializationBudget = specializationBudget
+    self.inlineFunctions = inlineFunctions
+    self.inlineThreshold = inlineThreshold
+    self.tailCalls = tailCalls
+    self.fuseComparisonBranches = fuseComparisonBranches
+    self.jumpCodeConditions = jumpCodeConditions
+    self.eliminateDeadCode = eliminateDeadCode
+    self.eliminateCommonSubexpressions = eliminateCommonSubexpressions
+    self.propagateCopies = propagateCopies
+    self.hoistLoopInvariants = hoistLoopInvariants
+    self.reduceStrength = reduceStrength
+    self.peepholeOptimization = peepholeOptimization
+    self.peepholeWindow = peepholeWindow
+    self.verifyPasses = verifyPasses
+    self.recursiveDescentParser = recursiveDescentParser
+    self.regexLexer = regexLexer
+    self.parserStatePath = parserStatePath
+    self.compileCachePath = compileCachePath
+    self.compileCacheSize = compileCacheSize
+
+  @staticmethod
+  def fromOptimizationLevel(level, **options):
+    """
+    Crea las opciones de un nivel de optimización (0, 1 o 2). Las opciones indicadas reemplazan las del nivel.
+    -O1 habilita los passes que no aumentan el tamaño del código y -O2 agrega inlining, especialización,
+    llamadas en cola y las optimizaciones de ciclos. Los valores etiquetados (taggedValues) limitan los
+    enteros a 31 bits, por lo que no se habilitan en ningún nivel.
+    """
+    if level not in optimizationLevels:
+      raise Exception(f"Nivel de optimización no válido: {level}.")
+
+    return CompilerOptions(**{**optimizationLevels[level], **options})
+
+  def __repr__(self) -> str:
+    return f"CompilerOptions({self.__dict__})"
@@ -0,0 +1,148 @@
+import re
+from antlr4 import Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Lexer import TokenSource
+from antlr4.Recognizer import Recognizer
+from antlr4.Token import CommonToken
+from antlr.CompiscriptLexer import CompiscriptLexer
+
+# Tipo de token de cada literal de la gramática ('class' -> 1, ..., 'super' -> 45)
+literalTypes = {name[1:-1]: tokenType for tokenType, name in enumerate(CompiscriptLexer.literalNames) if tokenType > 0}
+
+# Palabras reservadas: un identificador con el mismo texto recibe el tipo del literal
+keywordTypes = {text: tokenType for text, tokenType in literalTypes.items() if text[0].isalpha()}
+
+# Símbolos de uno y dos caracteres
+symbolTypes = {text: tokenType for text, tokenType in literalTypes.items() if not text[0].isalpha()}
+
+# Expresión regular con todas las reglas del lexer. Cada coincidencia inicia con los espacios y comentarios
+# (que se omiten) anteriores al token. Los símbolos de dos caracteres van primero para que se reconozca el
+# más largo, y las últimas alternativas reconocen los errores léxicos.
+tokenPattern = re.compile(r"[ \t\r\n]*(?://[^\n]*\n?[ \t\r\n]*)*(?:" + "|".join((
+  r"(?P<IDENTIFIER>[a-zA-Z_][a-zA-Z_0-9]*)",
+  r"(?P<NUMBER>[0-9]+(?:\.[0-9]+)?)",
+  r'(?P<STRING>"[^"\\]*")',
+  r"(?P<SYMBOL>" + "|".join(re.escape(symbol) for symbol in sorted(symbolTypes, key=len, reverse=True)) + ")",
+  r'(?P<INVALID_STRING>"[^"\\]*\\?)', # String sin cerrar o con \, hasta el carácter inválido
+  r"(?P<INVALID>.)",
+  r"(?P<EOF>\Z)",
+)) + ")", re.DOTALL)
+
+class CompiscriptScanner(Recognizer, TokenSource):
+
+  literalNames = CompiscriptLexer.literalNames
+  symbolicNames = CompiscriptLexer.symbolicNames
+
+  def __init__(self, input) -> None:
+    """
+    Analizador léxico equivalente a CompiscriptLexer, implementado con una sola expresión regular.
+
+    Produce los mismos tokens que el lexer generado por ANTLR (tipo, texto, línea, columna, índices de
+    caracteres e índice de token), omitiendo espacios y comentarios. Es una fuente de tokens para
+    CommonTokenStream (nextToken), por lo que puede reemplazar a CompiscriptLexer en CompiscriptParser.
+    Un carácter no reconocido o un string sin cerrar se reporta a los error listeners con el mensaje de
+    ANTLR (token recognition error at: ...) y el análisis continúa después del texto inválido.
+
+    Todos los tokens se generan en la primera llamada a nextToken o getTokens.
+
+    @param input: InputStream (o FileStream) con el código fuente.
+    """
+    super().__init__()
+    self._input = input
+    self._factory = CommonTokenFactory.DEFAULT
+    self._tokenFactorySourcePair = (self, input)
+    self.line = 1
+    self.column = 0
+
+    self.tokens = None
+    self.nextTokenIndex = 0
+
+  @property
+  def inputStream(self):
+    return self._input
+
+  @property
+  def sourceName(self):
+    return self._input.getSourceName()
+
+  def getInputStream(self):
+    return self._input
+
+  def getSourceName(self):
+    return self._input.getSourceName()
+
+  def getTokens(self):
+    """
+    Devuelve la lista de tokens del código fuente, terminada con el token EOF.
+    """
+    if self.tokens == None:
+      self.tokens = self.scan()
+    return self.tokens
+
+  def nextToken(self):
+    tokens = self.getTokens()
+    token = tokens[min(self.nextTokenIndex, len(tokens) - 1)]
+    self.nextTokenIndex += 1
+    return token
+
+  def reportError(self, text, line, column):
+    display = text.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
+    self.getErrorListenerDispatch().syntaxError(self, None, line, column, f"token recognition error at: '{display}'", None)
+
+  def scan(self):
+    text = self._input.strdata
+    source = self._tokenFactorySourcePair
+    tokens = []
+    line = 1
+    lineStart = 0 # Índice del primer carácter de la línea actual
+
+    position = 0
+    while True:
+      match = tokenPattern.match(text, position)
+      rule = match.lastgroup
+      start = match.start(rule)
+
+      # Líneas de los espacios y comentarios omitidos
+      newLines = text.count("\n", position, start)
+      if newLines > 0:
+        line += newLines
+        lineStart = text.rindex("\n", position, start) + 1
+
+      if rule == "EOF":
+        break
+
+      lexeme = match.group(rule)
+      position = match.end()
+
+      if rule == "IDENTIFIER" or rule == "NUMBER" or rule == "STRING" or rule == "SYMBOL":
+        if rule == "IDENTIFIER":
+          tokenType = keywordTypes.get(lexeme, CompiscriptLexer.IDENTIFIER)
+        elif rule == "SYMBOL":
+          tokenType = symbolTypes[lexeme]
+        else:
+          tokenType = CompiscriptLexer.NUMBER if rule == "NUMBER" else CompiscriptLexer.STRING
+
+        token = CommonToken(source, tokenType, Token.DEFAULT_CHANNEL, start, position - 1)
+        token.text = lexeme
+        token.line = line
+        token.column = start - lineStart
+        token.tokenIndex = len(tokens)
+        tokens.append(token)
+      else:
+        self.reportError(lexeme, line, start - lineStart)
+
+      # Líneas dentro de un string
+      if rule != "IDENTIFIER" and rule != "NUMBER" and rule != "SYMBOL" and "\n" in lexeme:
+        line += lexeme.count("\n")
+        lineStart = start + lexeme.rindex("\n") + 1
+
+    self.line = line
+    self.column = len(text) - lineStart
+
+    eof = CommonToken(source, Token.EOF, Token.DEFAULT_CHANNEL, len(text), len(text) - 1)
+    eof.text = "<EOF>"
+    eof.line = line
+    eof.column = self.column
+    eof.tokenIndex = len(tokens)
+    tokens.append(eof)
+    return tokens
@@ -9,16 +9,18 @@ from antlr4 import tree
 from Offset import Offset
 from ParamsTree import ParamsTree
 from SymbolTable import ScopeType
+from CompilerOptions import CompilerOptions
 
 trueValue = Value(1, BoolType())
 falseValue = Value(0, BoolType())
 class IntermediateCodeGenerator():
 
-  def __init__(self, symbolTable, semanticErrors = [], stopGeneration=False) -> None:
+  def __init__(self, symbolTable, semanticErrors=None, stopGeneration=False, options=None) -> None:
+    self.options = options if options != None else CompilerOptions()
     self.symbolTable = symbolTable
-    self.semanticErrors = semanticErrors
+    self.semanticErrors = semanticErrors if semanticErrors != None else [] # Una lista nueva por compilación
+    self.symbolGenerator = symbolTable.symbolGenerator # Nombres únicos de la compilación
     self.tempCounter = 0
-    self.labelCounter = 0
     self.stopGeneration = stopGeneration
     
     self.loopParams = ParamsTree() # Almacena labels de inicio y fin de loops
@@ -59,9 +61,113 @@ class IntermediateCodeGenerator():
     """
     Crea un nuevo label
     """
-    label = f"L{self.labelCounter}"
-    self.labelCounter += 1
-    return label
+    return f"L{self.symbolGenerator.nextNumber('L')}"
+
+  def isPassThroughNode(self, ctx):
+    """
+    Indica si el nodo solo pasa el valor de su hijo (un solo hijo o expresión en paréntesis).
+    """
+    if ctx.getChildCount() == 1:
+      return True
+    return isinstance(ctx, CompiscriptParser.PrimaryContext) and ctx.expression() != None
+  
+  def isConditionExpression(self, ctx):
+    """
+    Indica si el nodo es la expresión de condición de un if, while o for.
+    """
+    parent = ctx.parentCtx
+    if isinstance(parent, (CompiscriptParser.IfStmtContext, CompiscriptParser.WhileStmtContext)):
+      return parent.expression() is ctx
+    if isinstance(parent, CompiscriptParser.ForStmtContext):
+      return self.forHasConditionExpression(parent) and parent.expression(0) is ctx
+    return False
+  
+  def isJumpingContext(self, ctx):
+    """
+    Indica si el valor bool de un nodo solo se utiliza como condición de un salto: es la condición de
+    un if, while o for, o es operando de un and u or que también se utiliza solo como condición.
+    En ese caso el nodo puede generar código de saltos, sin guardar el bool en un temporal.
+    """
+    node = ctx
+    while True:
+      if self.isConditionExpression(node):
+        return True
+      
+      parent = node.parentCtx
+      if parent == None:
+        return False
+      
+      if isinstance(parent, (CompiscriptParser.Logic_orContext, CompiscriptParser.Logic_andContext)) and parent.getChildCount() > 1:
+        return self.isJumpingContext(parent)
+      
+      if not self.isPassThroughNode(parent):
+        return False
+      
+      node = parent
+  
+  def getJumpCondition(self, ctx):
+    """
+    Si el nodo (o el nodo al que pasa su valor) generó código de saltos, devuelve la lista de etiquetas
+    a las que salta si la condición es falsa. Si la condición es verdadera el código continúa. 
+    Las etiquetas deben ser colocadas por el nodo padre. Retorna None si el nodo tiene un valor en addr.
+    """
+    node = ctx
+    while True:
+      falseLabels = getattr(node, "falseLabels", None)
+      if falseLabels != None:
+        return falseLabels
+      
+      if not self.isPassThroughNode(node) or node.getChildCount() == 0:
+        return None
+      
+      if isinstance(node, CompiscriptParser.PrimaryContext) and node.expression() != None:
+        node = node.expression()
+      else:
+        node = node.getChild(0)
+  
+  def getConditionalJump(self, ctx, branchIfFalse, goToLabel):
+    """
+    Devuelve el salto condicional según el valor de un nodo utilizado como condición.
+    Si el nodo (o el nodo al que pasa su valor) es una comparación que no guardó el bool (ver isComparisonJump),
+    el salto realiza la comparación: IF a < b GOTO goToLabel.
+    """
+    node = ctx
+    while getattr(node, "jumpComparison", None) == None and self.isPassThroughNode(node) and node.getChildCount() > 0:
+      if isinstance(node, CompiscriptParser.PrimaryContext) and node.expression() != None:
+        node = node.expression()
+      else:
+        node = node.getChild(0)
+
+    comparison = getattr(node, "jumpComparison", None)
+    if comparison == None:
+      return ConditionalInstruction(arg1=ctx.addr, branchIfFalse=branchIfFalse, goToLabel=goToLabel)
+
+    operator, operand1, operand2 = comparison
+    return ConditionalInstruction(arg1=operand1, arg2=operand2, operator=operator, branchIfFalse=branchIfFalse, goToLabel=goToLabel)
+
+  def isComparisonJump(self, ctx, operand1, operand2):
+    """
+    Indica si una comparación solo se utiliza como condición de un salto y sus operandos son números de tipo
+    conocido (int, bool, nil o float). En ese caso el salto realiza la comparación, sin guardar el bool.
+    """
+    if not self.options.jumpCodeConditions or not self.isJumpingContext(ctx):
+      return False
+
+    for operand in (operand1, operand2):
+      if not isinstance(operand, (ObjectType, Offset)):
+        return False
+      if not (operand.strictEqualsType((IntType, BoolType, NilType)) or operand.strictEqualsType(FloatType)):
+        return False
+    return True
+
+  def getLabelsCode(self, labels):
+    """
+    Devuelve el código que coloca todas las etiquetas en el mismo punto.
+    """
+    code = EmptyInstruction()
+    for label in labels:
+      code.concat(SingleInstruction(operator=LABEL, arg1=label))
+    return code
   
   def getChildrenCode(self, ctx):
     """
@@ -237,23 +343,35 @@ class IntermediateCodeGenerator():
     currentParams.add("repeatLabel", repeatLabel)
     currentParams.add("endLabel", endLabel)
 
-  def exitForStmt(self, ctx: CompiscriptParser.ForStmtContext):
-    if not self.continueCodeGeneration(): return
-    
-    self.insideFor = False
-    
-    # Determinar posición de último ; y ), que son los limites de la expresión de actualización
+  def getForUpdateExpressionLimits(self, ctx: CompiscriptParser.ForStmtContext):
+    """
+    Determinar posición de último ; y ), que son los limites de la expresión de actualización
+    """
     updateExpressionLimits = [None, None]
     for i, child in enumerate(ctx.children):
       if child.getText() == ";":
         updateExpressionLimits[0] = i
       elif child.getText() == ")":
         updateExpressionLimits[1] = i
-    
+    return updateExpressionLimits
+  
+  def forHasConditionExpression(self, ctx: CompiscriptParser.ForStmtContext):
     # Si solo hay una expresión y hay más de un elemento entre último ; y ) (no son índices continuos)
     # es la expresion de actualización. De lo contrario, es la condición
-    hasConditionExpression = len(ctx.expression()) > 0 and (len(ctx.expression()) == 2 or updateExpressionLimits[1] - updateExpressionLimits[0] == 1)
-    hasUpdateExpression = len(ctx.expression()) > 0 and (len(ctx.expression()) == 2 or updateExpressionLimits[1] - updateExpressionLimits[0] > 1)
+    updateExpressionLimits = self.getForUpdateExpressionLimits(ctx)
+    return len(ctx.expression()) > 0 and (len(ctx.expression()) == 2 or updateExpressionLimits[1] - updateExpressionLimits[0] == 1)
+  
+  def forHasUpdateExpression(self, ctx: CompiscriptParser.ForStmtContext):
+    updateExpressionLimits = self.getForUpdateExpressionLimits(ctx)
+    return len(ctx.expression()) > 0 and (len(ctx.expression()) == 2 or updateExpressionLimits[1] - updateExpressionLimits[0] > 1)
+  
+  def exitForStmt(self, ctx: CompiscriptParser.ForStmtContext):
+    if not self.continueCodeGeneration(): return
+    
+    self.insideFor = False
+    
+    hasConditionExpression = self.forHasConditionExpression(ctx)
+    hasUpdateExpression = self.forHasUpdateExpression(ctx)
     
     code = EmptyInstruction()
     
@@ -277,6 +395,8 @@ class IntermediateCodeGenerator():
     
       
     
+    conditionFalseLabels = [] # Etiquetas de falso de la condición, si generó código de saltos
+    
     # Realizar la evaluación de la condición (si la hay)
     if hasConditionExpression:
       # Existe una condición
@@ -286,7 +406,11 @@ class IntermediateCodeGenerator():
       code.concat(conditionExpression.code)
       
       # Si la condición es falsa, saltar al final
-      code.concat(ConditionalInstruction(arg1=conditionExpression.addr, branchIfFalse=True, goToLabel=endLabel))
+      falseLabels = self.getJumpCondition(conditionExpression)
+      if falseLabels == None:
+        code.concat(self.getConditionalJump(conditionExpression, branchIfFalse=True, goToLabel=endLabel))
+      else:
+        conditionFalseLabels = falseLabels
       
     
     # Concatenar código de statement
@@ -318,6 +442,10 @@ class IntermediateCodeGenerator():
     # Fin de ejecución ambigua, se liberan los registros
     code.concat(SingleInstruction(operator=REGISTER_FREE))
     
+    # Etiquetas de falso de la condición. Se colocan después de liberar registros, pues los saltos
+    # de la condición se realizan con todos los valores guardados en memoria
+    code.concat(self.getLabelsCode(conditionFalseLabels))
+    
     ctx.code = code
     
 
@@ -330,7 +458,6 @@ class IntermediateCodeGenerator():
     hasElseStatement = len(ctx.statement()) > 1
     
     expressionNode = ctx.expression()
-    expression = expressionNode.addr
     statementCode = ctx.statement(0).code
     
     ctx.code = expressionNode.code # Agregar código necesario para evaluar la expresión
@@ -342,7 +469,12 @@ class IntermediateCodeGenerator():
     endLabel = self.newLabel()
     
     # Si la condición es falsa, saltar al final
-    conditionalCode = ConditionalInstruction(arg1=expression, branchIfFalse=True, goToLabel=skipLabel)
+    falseLabels = self.getJumpCondition(expressionNode)
+    if falseLabels == None:
+      conditionalCode = self.getConditionalJump(expressionNode, branchIfFalse=True, goToLabel=skipLabel)
+    else:
+      # La condición ya contiene los saltos, sus etiquetas de falso se colocan junto a skipLabel
+      conditionalCode = EmptyInstruction()
     conditionalCode.concat(statementCode)
     
     # Fin de ejecución ambigua del if, liberar registros
@@ -350,6 +482,7 @@ class IntermediateCodeGenerator():
     
     conditionalCode.concat(SingleInstruction(operator=GOTO, arg1=endLabel)) # Evitar else (si existe)
     conditionalCode.concat(SingleInstruction(operator=LABEL, arg1=skipLabel)) # Evitar if statement
+    conditionalCode.concat(self.getLabelsCode(falseLabels or []))
     
     # Si hay else, ejecutarlo
     if hasElseStatement:
@@ -422,7 +555,6 @@ class IntermediateCodeGenerator():
     if not self.continueCodeGeneration(): return
     
     expressionNode = ctx.expression()
-    expression = expressionNode.addr
     statementCode = ctx.statement().code
     
     # Obtener labels de inicio y fin de loop, eliminandolos del arbol de params
@@ -440,7 +572,9 @@ class IntermediateCodeGenerator():
     whileCode.concat(expressionNode.code)
     
     # Si la condición es falsa, saltar al final
-    whileCode.concat(ConditionalInstruction(arg1=expression, branchIfFalse=True, goToLabel=endLabel))
+    falseLabels = self.getJumpCondition(expressionNode)
+    if falseLabels == None:
+      whileCode.concat(self.getConditionalJump(expressionNode, branchIfFalse=True, goToLabel=endLabel))
     
     # Concatenar código de statement
     whileCode.concat(statementCode)
@@ -454,6 +588,10 @@ class IntermediateCodeGenerator():
     # Fin de ejecución ambigua, liberar registros
     whileCode.concat(SingleInstruction(operator=REGISTER_FREE))
     
+    # Etiquetas de falso de la condición. Se colocan después de liberar registros, pues los saltos
+    # de la condición se realizan con todos los valores guardados en memoria
+    whileCode.concat(self.getLabelsCode(falseLabels or []))
+    
     ctx.code = whileCode
 
   def enterBlock(self, ctx: CompiscriptParser.BlockContext, parameters:list[ObjectType]=None):
@@ -729,6 +867,11 @@ class IntermediateCodeGenerator():
       ctx.code = self.getChildrenCode(ctx)
       return
     
+    if self.options.jumpCodeConditions and self.isJumpingContext(ctx):
+      # El resultado solo se utiliza como condición de un salto, no se guarda el bool
+      self.logicOrJumpCode(ctx)
+      return
+    
     # Operación lógica or
     
     code = None
@@ -776,6 +919,87 @@ class IntermediateCodeGenerator():
     # Guardar addr de resultado de operación and y concatenar código
     ctx.addr = temp
     ctx.code = code
+  def logicOrJumpCode(self, ctx: CompiscriptParser.Logic_orContext):
+    """
+    Código de saltos para una operación or utilizada como condición.
+    Si un operando es verdadero se salta al final (la condición se cumple y el código continúa).
+    Si el último operando es falso se salta a las etiquetas de falso, que coloca el nodo padre.
+    Los operandos que son comparaciones numéricas saltan con la comparación (IF a < b GOTO verdadero).
+    """
+    code = EmptyInstruction()
+    falseLabels = []
+    trueLabel = self.newLabel()
+    
+    operands = ctx.logic_and()
+    for i, operand in enumerate(operands):
+      isLastOperand = i == len(operands) - 1
+      code.concat(operand.code)
+      
+      operandFalseLabels = self.getJumpCondition(operand)
+      
+      if operandFalseLabels != None:
+        # El operando generó código de saltos: si continúa es verdadero
+        if isLastOperand:
+          falseLabels += operandFalseLabels
+        else:
+          # Liberar registros antes de saltar, el siguiente operando es ambiguo
+          code.concat(SingleInstruction(operator=REGISTER_FREE))
+          code.concat(SingleInstruction(operator=GOTO, arg1=trueLabel))
+          code.concat(self.getLabelsCode(operandFalseLabels))
+        continue
+      
+      # Liberar registros antes del salto, el siguiente operando es ambiguo
+      code.concat(SingleInstruction(operator=REGISTER_FREE))
+      
+      if isLastOperand:
+        falseLabel = self.newLabel()
+        code.concat(self.getConditionalJump(operand, branchIfFalse=True, goToLabel=falseLabel))
+        falseLabels.append(falseLabel)
+      else:
+        code.concat(self.getConditionalJump(operand, branchIfFalse=False, goToLabel=trueLabel))
+    
+    # Etiqueta de verdadero: la condición se cumple. Se liberan registros para que todos los
+    # caminos lleguen a la etiqueta con los valores en memoria
+    code.concat(SingleInstruction(operator=REGISTER_FREE))
+    code.concat(SingleInstruction(operator=LABEL, arg1=trueLabel))
+    
+    ctx.addr = None
+    ctx.code = code
+    ctx.falseLabels = falseLabels
+  
+  def logicAndJumpCode(self, ctx: CompiscriptParser.Logic_andContext):
+    """
+    Código de saltos para una operación and utilizada como condición.
+    Si un operando es falso se salta a las etiquetas de falso, que coloca el nodo padre.
+    Si todos los operandos son verdaderos el código continúa.
+    Los operandos que son comparaciones numéricas saltan con la comparación (IF NOT a < b GOTO falso).
+    """
+    code = EmptyInstruction()
+    falseLabels = []
+    falseLabel = None
+    
+    for operand in ctx.equality():
+      code.concat(operand.code)
+      
+      operandFalseLabels = self.getJumpCondition(operand)
+      
+      if operandFalseLabels != None:
+        # El operando generó código de saltos, sus etiquetas de falso son las del and
+        falseLabels += operandFalseLabels
+        continue
+      
+      if falseLabel == None:
+        falseLabel = self.newLabel()
+        falseLabels.append(falseLabel)
+      
+      # Liberar registros antes del salto, el siguiente operando es ambiguo
+      code.concat(SingleInstruction(operator=REGISTER_FREE))
+      code.concat(self.getConditionalJump(operand, branchIfFalse=True, goToLabel=falseLabel))
+    
+    ctx.addr = None
+    ctx.code = code
+    ctx.falseLabels = falseLabels
+    
   def enterLogic_and(self, ctx: CompiscriptParser.Logic_andContext):
     if not self.continueCodeGeneration(): return
 
@@ -789,6 +1013,11 @@ class IntermediateCodeGenerator():
       ctx.code = self.getChildrenCode(ctx)
       return
     
+    if self.options.jumpCodeConditions and self.isJumpingContext(ctx):
+      # El resultado solo se utiliza como condición de un salto, no se guarda el bool
+      self.logicAndJumpCode(ctx)
+      return
+    
     # Operación lógica and
     
     code = None
@@ -856,6 +1085,13 @@ class IntermediateCodeGenerator():
     instruction = None
     numOperations = (len(ctx.children) - 1) // 2
     
+    operand1, operand2 = ctx.getChild(0).addr, ctx.getChild(2).addr
+    if numOperations == 1 and self.isComparisonJump(ctx, operand1, operand2):
+      # La comparación solo se utiliza como condición: el salto la realiza (ver getConditionalJump)
+      ctx.addr = None
+      ctx.jumpComparison = (EQUAL if ctx.getChild(1).getText() == "==" else NOT_EQUAL, operand1, operand2)
+      return
+    
     temp = self.newTemp(BoolType())
     
     for i in range(numOperations):
@@ -892,6 +1128,14 @@ class IntermediateCodeGenerator():
     
     instruction = None
     numOperations = (len(ctx.children) - 1) // 2
+    comparisonOperators = {"<": LESS, ">": GREATER, "<=": LESS_EQUAL, ">=": GREATER_EQUAL}
+    
+    operand1, operand2 = ctx.getChild(0).addr, ctx.getChild(2).addr
+    if numOperations == 1 and self.isComparisonJump(ctx, operand1, operand2):
+      # La comparación solo se utiliza como condición: el salto la realiza (ver getConditionalJump)
+      ctx.addr = None
+      ctx.jumpComparison = (comparisonOperators[ctx.getChild(1).getText()], operand1, operand2)
+      return
   
     temp = self.newTemp(BoolType())
     
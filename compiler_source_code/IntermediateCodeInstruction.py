@@ -16,6 +16,10 @@ def format(value):
   
   if isinstance(value, Offset):
     return f"{format(value.base)}[{format(value.offset)}]"
+  
+  if isinstance(value, list):
+    # Operandos de una PHI
+    return f"[{', '.join(str(format(element)) for element in value)}]"
 
   return value
 
@@ -106,7 +110,7 @@ class SingleInstruction(Instruction):
     
     raise Exception("Single instruction no válida para imprimir")
 class ConditionalInstruction(Instruction):
-  def __init__(self, arg1, goToLabel, branchIfFalse=False, nextInstruction=None):
+  def __init__(self, arg1, goToLabel, branchIfFalse=False, nextInstruction=None, operator=None, arg2=None):
     """
     Instrucción de salto condicional.
     branchIfFalse == False:
@@ -115,13 +119,22 @@ class ConditionalInstruction(Instruction):
       IF arg1 == 0 GOTO goToLabel
     Ejemplo:
     IF a == b GOTO L1
+    
+    Si se indica operator (operador de comparación), la condición es la comparación arg1 operator arg2:
+      IF arg1 < arg2 GOTO goToLabel (o su negación si branchIfFalse == True)
     """
     super().__init__(nextInstruction)
     
     self.arg1 = arg1
+    self.arg2 = arg2
+    self.operator = operator
     self.branchIfFalse = branchIfFalse
     self.goToLabel = goToLabel
   
   def __str__(self):
+    if self.operator != None:
+      negation = "not " if self.branchIfFalse else ""
+      return f"if {negation}{format(self.arg1)} {self.operator} {format(self.arg2)} goto {self.goToLabel}"
+    
     compValue = 0 if self.branchIfFalse else 1
     return f"if {format(self.arg1)} == {compValue} goto {self.goToLabel}"
\ No newline at end of file
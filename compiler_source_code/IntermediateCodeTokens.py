@@ -4,6 +4,8 @@ MINUS = "-"
 MULTIPLY = "*"
 DIVIDE = "/"
 MOD = "%"
+SHIFT_LEFT = "<<"
+BIT_AND = "&"
 CONCATENATE = "CONCAT"
 LABEL = "LABEL"
 GET_ARG = "GET_ARG"
@@ -43,6 +45,10 @@ FLOAT_TO_STR = "FLOAT_TO_STR"
 FLOAT_TO_INT = "FLOAT_TO_INT"
 REGISTER_FREE = "REGISTER_FREE"
 GHOST_REGISTER_FREE = "GHOST_REGISTER_FREE"
+REGISTER_RESET = "REGISTER_RESET"
+WORD_COPY = "WORD_COPY"
+CLEAR = "CLEAR"
+PHI = "PHI"
 CONST_ONE = "const_one_int"
 CONST_DECIMAL_CONV_FACTOR = "const_decimal_conv_factor"
 CONST_POINT_CHAR = "const_point_char"
\ No newline at end of file
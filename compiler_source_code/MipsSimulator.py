@@ -0,0 +1,547 @@
+import argparse
+import math
+import re
+import struct
+import sys
+
+# Números de los registros enteros
+registerNumbers = {"zero": 0, "at": 1, "v0": 2, "v1": 3, "a0": 4, "a1": 5, "a2": 6, "a3": 7, "gp": 28, "sp": 29, "fp": 30, "ra": 31}
+registerNumbers.update({f"t{index}": 8 + index for index in range(8)})
+registerNumbers.update({f"s{index}": 16 + index for index in range(8)})
+registerNumbers.update({"t8": 24, "t9": 25, "k0": 26, "k1": 27})
+
+# Valores iniciales de los registros y del heap (los mismos de MARS)
+initialStackPointer = 0x7fffeffc
+initialGlobalPointer = 0x10008000
+heapStart = 0x10040000
+
+# Instrucciones que leen o escriben memoria
+loadOperators = {"lw", "lb", "lbu", "l.s"}
+storeOperators = {"sw", "sb", "s.s"}
+
+# Operaciones con registro destino, registro fuente y un segundo operando (registro o inmediato)
+arithmeticOperators = {
+  "add", "addu", "addi", "addiu", "sub", "subu", "subi", "mul", "and", "andi", "or", "ori", "xor", "xori", "nor",
+  "sll", "sllv", "srl", "srlv", "sra", "srav", "rem", "remu", "div", "seq", "sne", "slt", "slti", "sltu", "sle",
+  "sgt", "sge",
+}
+comparisonBranchOperators = {"beq", "bne", "blt", "ble", "bgt", "bge", "bltu", "bgeu"}
+zeroBranchOperators = {"beqz", "bnez", "bltz", "bgez", "bgtz", "blez"}
+floatArithmeticOperators = {"add.s", "sub.s", "mul.s", "div.s"}
+floatUnaryOperators = {"mov.s", "neg.s", "cvt.s.w", "cvt.w.s", "trunc.w.s", "floor.w.s"}
+floatComparisonOperators = {"c.eq.s", "c.lt.s", "c.le.s"}
+
+labelPattern = re.compile(r"^([A-Za-z_][\w.]*):\s*(.*)$")
+memoryOperandPattern = re.compile(r"^(-?\w*)\((\$\w+)\)$")
+
+def toSigned(value):
+  value &= 0xffffffff
+  return value - (1 << 32) if value & 0x80000000 else value
+
+def floatToBits(value):
+  return struct.unpack("<I", struct.pack("<f", value))[0]
+
+def bitsToFloat(bits):
+  return struct.unpack("<f", struct.pack("<I", bits & 0xffffffff))[0]
+
+def roundToFloat(value):
+  """
+  Redondea un número de Python (doble precisión) a precisión simple. Devuelve los bits del float.
+  """
+  try:
+    return floatToBits(value)
+  except OverflowError:
+    return floatToBits(math.copysign(math.inf, value))
+
+def formatFloat(value):
+  """
+  Formatea un float como MARS (Float.toString de Java): la menor cantidad de dígitos que identifica el valor,
+  con notación científica fuera del rango [10^-3, 10^7).
+  """
+  if value != value:
+    return "NaN"
+  if math.isinf(value):
+    return "Infinity" if value > 0 else "-Infinity"
+
+  for precision in range(1, 10):
+    text = "%.*g" % (precision, value)
+    if bitsToFloat(floatToBits(float(text))) == value:
+      break
+
+  number = float(text)
+  if number != 0 and (abs(number) >= 1e7 or abs(number) < 1e-3):
+    mantissa, exponent = f"{number:.{precision - 1}e}".split("e")
+    if "." not in mantissa:
+      mantissa += ".0"
+    return f"{mantissa}E{int(exponent)}"
+
+  text = repr(number)
+  return text if "." in text else text + ".0"
+
+def integerDivision(dividend, divisor):
+  """
+  División entera con truncamiento hacia cero (como MIPS). Devuelve (cociente, residuo).
+  """
+  if divisor == 0:
+    raise Exception("División entre cero.")
+  quotient = abs(dividend) // abs(divisor)
+  if (dividend < 0) != (divisor < 0):
+    quotient = -quotient
+  return quotient, dividend - quotient * divisor
+
+class MipsSimulator:
+
+  def __init__(self, assemblyCode, inputs=(), maxInstructions=100_000_000) -> None:
+    """
+    Simulador del subconjunto de MIPS32 que genera AssemblyGenerator, para ejecutar el código generado sin MARS.
+
+    Incluye las instrucciones enteras y sus pseudoinstrucciones (li, la, move, mul, div, rem, seq, sge, blt, ...),
+    las de punto flotante de precisión simple (l.s, s.s, add.s, ..., conversiones, comparaciones c.*.s y los
+    saltos bc1t y bc1f) y los syscalls 1, 2, 4, 5, 6, 8, 9, 10 y 11 con la semántica de MARS.
+    Las directivas (.text, .globl) se ignoran y la ejecución inicia en el label main.
+
+    Además de la salida del programa, cuenta las instrucciones ejecutadas (en total y por operación), los
+    accesos a memoria, los syscalls y los bytes reservados en el heap (ver getStats).
+
+    @param assemblyCode: Lista de líneas del código assembly.
+    @param inputs: Líneas de la entrada estándar, utilizadas por los syscalls de lectura (5, 6 y 8).
+    @param maxInstructions: Cantidad máxima de instrucciones a ejecutar. Si se supera, se lanza una excepción.
+    """
+    self.inputs = list(inputs)
+    self.maxInstructions = maxInstructions
+
+    self.sourceInstructions = [] # (operación, operandos) de cada instrucción
+    self.labels = {} # label -> índice de instrucción
+    self.parse(assemblyCode)
+    self.instructions = [self.decode(operator, operands) for operator, operands in self.sourceInstructions]
+
+    self.registers = [0] * 32
+    self.registers[registerNumbers["sp"]] = initialStackPointer
+    self.registers[registerNumbers["gp"]] = initialGlobalPointer
+    self.floatRegisters = [0] * 32 # Bits de cada registro
+    self.hi = 0
+    self.lo = 0
+    self.conditionFlag = False
+    self.memory = {} # dirección de palabra -> valor
+    self.heapPointer = heapStart
+
+    self.output = []
+    self.instructionCounts = [0] * len(self.instructions)
+    self.syscallCount = 0
+    self.heapBytes = 0
+
+  def parse(self, assemblyCode):
+    for line in assemblyCode:
+      line = line.split("#", 1)[0].strip()
+
+      # Una línea puede iniciar con uno o varios labels
+      match = labelPattern.match(line)
+      while match != None:
+        self.labels[match.group(1)] = len(self.sourceInstructions)
+        line = match.group(2).strip()
+        match = labelPattern.match(line)
+
+      if line == "" or line.startswith("."):
+        continue
+
+      parts = line.split(None, 1)
+      operands = [operand for operand in re.split(r"[,\s]+", parts[1].strip()) if operand != ""] if len(parts) > 1 else []
+      self.sourceInstructions.append((parts[0], operands))
+
+  def getRegister(self, operand):
+    name = operand.lstrip("$")
+    if name.isdigit():
+      return int(name)
+    if name not in registerNumbers:
+      raise Exception(f"Registro no válido: {operand}.")
+    return registerNumbers[name]
+
+  def getFloatRegister(self, operand):
+    return int(operand.lstrip("$")[1:])
+
+  def getLabel(self, operand):
+    if operand not in self.labels:
+      raise Exception(f"Label no definido: {operand}.")
+    return self.labels[operand]
+
+  def getMemoryOperand(self, operand):
+    """
+    Devuelve (offset, registro base) de un operando de memoria offset($registro).
+    """
+    match = memoryOperandPattern.match(operand)
+    if match == None:
+      raise Exception(f"Operando de memoria no soportado: {operand}.")
+    offset = int(match.group(1), 0) if match.group(1) != "" else 0
+    return offset, self.getRegister(match.group(2))
+
+  def decode(self, operator, operands):
+    """
+    Traduce los operandos de una instrucción a números (registros, inmediatos, índices de labels), para no
+    interpretar texto durante la ejecución. Devuelve (operación, a, b, c).
+    """
+    if operator in arithmeticOperators and len(operands) == 3:
+      # c es un registro o un inmediato: se distingue con el nombre de la operación (operación + "#")
+      if operands[2].startswith("$"):
+        return (operator, self.getRegister(operands[0]), self.getRegister(operands[1]), self.getRegister(operands[2]))
+      return (operator + "#", self.getRegister(operands[0]), self.getRegister(operands[1]), int(operands[2], 0))
+
+    if operator == "div" and len(operands) == 2:
+      return ("divHiLo", self.getRegister(operands[0]), self.getRegister(operands[1]), None)
+
+    if operator in ("lw", "sw", "lb", "lbu", "sb", "la"):
+      offset, base = self.getMemoryOperand(operands[1])
+      return (operator, self.getRegister(operands[0]), offset, base)
+
+    if operator in ("l.s", "s.s"):
+      offset, base = self.getMemoryOperand(operands[1])
+      return (operator, self.getFloatRegister(operands[0]), offset, base)
+
+    if operator == "li":
+      return (operator, self.getRegister(operands[0]), int(operands[1], 0), None)
+
+    if operator in ("move", "neg", "not"):
+      return (operator, self.getRegister(operands[0]), self.getRegister(operands[1]), None)
+
+    if operator in ("mfhi", "mflo", "jr"):
+      return (operator, self.getRegister(operands[0]), None, None)
+
+    if operator in ("j", "b", "jal", "bc1t", "bc1f"):
+      return (operator, self.getLabel(operands[0]), None, None)
+
+    if operator in comparisonBranchOperators:
+      if operands[1].startswith("$"):
+        return (operator, self.getRegister(operands[0]), self.getRegister(operands[1]), self.getLabel(operands[2]))
+      return (operator + "#", self.getRegister(operands[0]), int(operands[1], 0), self.getLabel(operands[2]))
+
+    if operator in zeroBranchOperators:
+      return (operator, self.getRegister(operands[0]), self.getLabel(operands[1]), None)
+
+    if operator in ("mtc1", "mfc1"):
+      return (operator, self.getRegister(operands[0]), self.getFloatRegister(operands[1]), None)
+
+    if operator in floatArithmeticOperators:
+      return (operator, *(self.getFloatRegister(operand) for operand in operands))
+
+    if operator in floatUnaryOperators or operator in floatComparisonOperators:
+      return (operator, self.getFloatRegister(operands[0]), self.getFloatRegister(operands[1]), None)
+
+    if operator in ("syscall", "nop"):
+      return (operator, None, None, None)
+
+    raise Exception(f"Instrucción no soportada: {operator} {', '.join(operands)}.")
+
+  def loadWord(self, address):
+    if address % 4 != 0:
+      raise Exception(f"Dirección no alineada: {address:#x}.")
+    return self.memory.get(address, 0)
+
+  def storeWord(self, address, value):
+    if address % 4 != 0:
+      raise Exception(f"Dirección no alineada: {address:#x}.")
+    self.memory[address] = value & 0xffffffff
+
+  def loadByte(self, address):
+    word = self.memory.get(address & ~3, 0)
+    return (word >> (8 * (address & 3))) & 0xff
+
+  def storeByte(self, address, value):
+    wordAddress = address & ~3
+    shift = 8 * (address & 3)
+    word = self.memory.get(wordAddress, 0)
+    self.memory[wordAddress] = (word & ~(0xff << shift) | (value & 0xff) << shift) & 0xffffffff
+
+  def readInput(self):
+    if len(self.inputs) == 0:
+      raise Exception("El programa leyó más líneas de las indicadas en la entrada.")
+    return self.inputs.pop(0)
+
+  def syscall(self):
+    """
+    Ejecuta el syscall indicado en $v0. Devuelve False si el programa termina (syscall 10).
+    """
+    registers = self.registers
+    service = registers[2]
+    self.syscallCount += 1
+
+    if service == 1:
+      self.output.append(str(toSigned(registers[4])))
+    elif service == 2:
+      self.output.append(formatFloat(bitsToFloat(self.floatRegisters[12])))
+    elif service == 4:
+      address = registers[4]
+      characters = []
+      character = self.loadByte(address)
+      while character != 0:
+        characters.append(chr(character))
+        address += 1
+        character = self.loadByte(address)
+      self.output.append("".join(characters))
+    elif service == 5:
+      registers[2] = int(self.readInput()) & 0xffffffff
+    elif service == 6:
+      self.floatRegisters[0] = roundToFloat(float(self.readInput()))
+    elif service == 8:
+      # Como fgets: se leen hasta $a1 - 1 caracteres, incluyendo el salto de línea si cabe, y se agrega el nulo
+      maxLength = toSigned(registers[5]) - 1
+      text = (self.readInput() + "\n")[:max(maxLength, 0)]
+      for index, character in enumerate(text):
+        self.storeByte(registers[4] + index, ord(character))
+      self.storeByte(registers[4] + len(text), 0)
+    elif service == 9:
+      size = (toSigned(registers[4]) + 3) & ~3 # El heap se mantiene alineado a palabras
+      registers[2] = self.heapPointer
+      self.heapPointer += size
+      self.heapBytes += size
+    elif service == 10:
+      return False
+    elif service == 11:
+      self.output.append(chr(registers[4] & 0xff))
+    else:
+      raise Exception(f"Syscall no soportado: {service}.")
+    return True
+
+  def run(self):
+    """
+    Ejecuta el programa desde el label main hasta el syscall 10 o el final del código.
+    @return str - Salida del programa.
+    """
+    registers = self.registers
+    floatRegisters = self.floatRegisters
+    instructions = self.instructions
+    counts = self.instructionCounts
+    instructionCount = len(instructions)
+    executed = 0
+    pc = self.labels.get("main", 0)
+
+    while pc < instructionCount:
+      executed += 1
+      if executed > self.maxInstructions:
+        raise Exception(f"Se superó el máximo de {self.maxInstructions} instrucciones ejecutadas.")
+
+      counts[pc] += 1
+      operator, a, b, c = instructions[pc]
+      pc += 1
+
+      # Instrucciones más frecuentes primero
+      if operator == "li":
+        registers[a] = b & 0xffffffff
+      elif operator == "lw":
+        registers[a] = self.loadWord((registers[c] + b) & 0xffffffff)
+      elif operator == "sw":
+        self.storeWord((registers[c] + b) & 0xffffffff, registers[a])
+      elif operator == "jal":
+        registers[31] = pc
+        pc = a
+      elif operator == "addi#" or operator == "add#" or operator == "addiu#" or operator == "addu#":
+        registers[a] = (registers[b] + c) & 0xffffffff
+      elif operator == "move":
+        registers[a] = registers[b]
+      elif operator == "sb":
+        self.storeByte((registers[c] + b) & 0xffffffff, registers[a])
+      elif operator == "lb":
+        value = self.loadByte((registers[c] + b) & 0xffffffff)
+        registers[a] = value | 0xffffff00 if value & 0x80 else value
+      elif operator == "lbu":
+        registers[a] = self.loadByte((registers[c] + b) & 0xffffffff)
+      elif operator == "j" or operator == "b":
+        pc = a
+      elif operator == "nop":
+        pass
+      elif operator == "syscall":
+        if not self.syscall():
+          break
+      elif operator == "beqz":
+        if registers[a] == 0:
+          pc = b
+      elif operator == "bnez":
+        if registers[a] != 0:
+          pc = b
+      elif operator == "jr":
+        pc = registers[a]
+      elif operator == "la":
+        registers[a] = (registers[c] + b) & 0xffffffff
+      elif operator in comparisonBranchOperators or operator.endswith("#") and operator[:-1] in comparisonBranchOperators:
+        pc = self.executeComparisonBranch(operator.rstrip("#"), registers[a], registers[b] if operator[-1] != "#" else b, c, pc)
+      elif operator in zeroBranchOperators:
+        value = toSigned(registers[a])
+        if (operator == "bltz" and value < 0 or operator == "bgez" and value >= 0 or
+            operator == "bgtz" and value > 0 or operator == "blez" and value <= 0):
+          pc = b
+      elif operator == "l.s":
+        floatRegisters[a] = self.loadWord((registers[c] + b) & 0xffffffff)
+      elif operator == "s.s":
+        self.storeWord((registers[c] + b) & 0xffffffff, floatRegisters[a])
+      elif operator == "mfhi":
+        registers[a] = self.hi
+      elif operator == "mflo":
+        registers[a] = self.lo
+      elif operator == "divHiLo":
+        quotient, remainder = integerDivision(toSigned(registers[a]), toSigned(registers[b]))
+        self.lo, self.hi = quotient & 0xffffffff, remainder & 0xffffffff
+      elif operator == "neg":
+        registers[a] = -registers[b] & 0xffffffff
+      elif operator == "not":
+        registers[a] = ~registers[b] & 0xffffffff
+      elif operator == "mtc1":
+        floatRegisters[b] = registers[a]
+      elif operator == "mfc1":
+        registers[a] = floatRegisters[b]
+      elif operator in floatArithmeticOperators:
+        floatRegisters[a] = self.executeFloatArithmetic(operator, bitsToFloat(floatRegisters[b]), bitsToFloat(floatRegisters[c]))
+      elif operator in floatUnaryOperators:
+        floatRegisters[a] = self.executeFloatUnary(operator, floatRegisters[b])
+      elif operator in floatComparisonOperators:
+        x, y = bitsToFloat(floatRegisters[a]), bitsToFloat(floatRegisters[b])
+        self.conditionFlag = x == y if operator == "c.eq.s" else x < y if operator == "c.lt.s" else x <= y
+      elif operator == "bc1t":
+        if self.conditionFlag:
+          pc = a
+      elif operator == "bc1f":
+        if not self.conditionFlag:
+          pc = a
+      else:
+        immediate = operator[-1] == "#"
+        registers[a] = self.executeArithmetic(operator.rstrip("#"), registers[b], c if immediate else registers[c]) & 0xffffffff
+
+      registers[0] = 0
+
+    return self.getOutput()
+
+  def executeComparisonBranch(self, operator, x, y, target, pc):
+    if operator == "bltu" or operator == "bgeu":
+      x, y = x & 0xffffffff, y & 0xffffffff
+    else:
+      x, y = toSigned(x), toSigned(y)
+
+    taken = (operator == "beq" and x == y or operator == "bne" and x != y or
+             (operator == "blt" or operator == "bltu") and x < y or operator == "ble" and x <= y or
+             operator == "bgt" and x > y or (operator == "bge" or operator == "bgeu") and x >= y)
+    return target if taken else pc
+
+  def executeArithmetic(self, operator, x, y):
+    """
+    Ejecuta una operación entera entre el valor x de un registro y el valor y (registro o inmediato).
+    """
+    if operator in ("add", "addu", "addi", "addiu"):
+      return x + y
+    if operator in ("sub", "subu", "subi"):
+      return x - y
+    if operator == "mul":
+      return toSigned(x) * toSigned(y)
+    if operator in ("and", "andi"):
+      return x & y
+    if operator in ("or", "ori"):
+      return x | y
+    if operator in ("xor", "xori"):
+      return x ^ y
+    if operator == "nor":
+      return ~(x | y)
+    if operator in ("sll", "sllv"):
+      return x << (y & 31)
+    if operator in ("srl", "srlv"):
+      return (x & 0xffffffff) >> (y & 31)
+    if operator in ("sra", "srav"):
+      return toSigned(x) >> (y & 31)
+    if operator == "div":
+      return integerDivision(toSigned(x), toSigned(y))[0]
+    if operator == "rem":
+      return integerDivision(toSigned(x), toSigned(y))[1]
+    if operator == "remu":
+      if y & 0xffffffff == 0:
+        raise Exception("División entre cero.")
+      return (x & 0xffffffff) % (y & 0xffffffff)
+    if operator == "sltu":
+      return int((x & 0xffffffff) < (y & 0xffffffff))
+
+    x, y = toSigned(x), toSigned(y)
+    if operator == "seq":
+      return int(x == y)
+    if operator == "sne":
+      return int(x != y)
+    if operator in ("slt", "slti"):
+      return int(x < y)
+    if operator == "sle":
+      return int(x <= y)
+    if operator == "sgt":
+      return int(x > y)
+    if operator == "sge":
+      return int(x >= y)
+    raise Exception(f"Instrucción no soportada: {operator}.")
+
+  def executeFloatArithmetic(self, operator, x, y):
+    if operator == "add.s":
+      return roundToFloat(x + y)
+    if operator == "sub.s":
+      return roundToFloat(x - y)
+    if operator == "mul.s":
+      return roundToFloat(x * y)
+    if y == 0:
+      return roundToFloat(math.nan if x == 0 or x != x else math.copysign(math.inf, x) * math.copysign(1, y))
+    return roundToFloat(x / y)
+
+  def executeFloatUnary(self, operator, bits):
+    if operator == "mov.s":
+      return bits
+    if operator == "neg.s":
+      return bits ^ 0x80000000
+    if operator == "cvt.s.w":
+      return roundToFloat(float(toSigned(bits)))
+
+    # Conversión a entero: NaN e infinitos se convierten al límite del rango, como en MARS
+    value = bitsToFloat(bits)
+    if value != value:
+      return 0x7fffffff
+    if math.isinf(value):
+      return 0x7fffffff if value > 0 else 0x80000000
+    integer = math.floor(value) if operator == "floor.w.s" else int(value)
+    return max(min(integer, 0x7fffffff), -0x80000000) & 0xffffffff
+
+  def getOutput(self):
+    return "".join(self.output)
+
+  def getStats(self):
+    """
+    Devuelve las estadísticas de la ejecución: instrucciones ejecutadas, lecturas y escrituras de memoria,
+    syscalls, bytes reservados en el heap y cantidad de instrucciones ejecutadas por operación.
+    """
+    operatorCounts = {}
+    for (operator, _), count in zip(self.sourceInstructions, self.instructionCounts):
+      if count > 0:
+        operatorCounts[operator] = operatorCounts.get(operator, 0) + count
+
+    return {
+      "instructions": sum(self.instructionCounts),
+      "loads": sum(count for operator, count in operatorCounts.items() if operator in loadOperators),
+      "stores": sum(count for operator, count in operatorCounts.items() if operator in storeOperators),
+      "syscalls": self.syscallCount,
+      "heapBytes": self.heapBytes,
+      "operatorCounts": dict(sorted(operatorCounts.items(), key=lambda item: -item[1])),
+    }
+
+def runAssembly(assemblyCode, inputs=()):
+  """
+  Ejecuta un programa en el simulador.
+  @return output, stats: str, dict - Salida del programa y estadísticas de la ejecución (ver MipsSimulator.getStats).
+  """
+  simulator = MipsSimulator(assemblyCode, inputs)
+  output = simulator.run()
+  return output, simulator.getStats()
+
+if __name__ == "__main__":
+  argumentParser = argparse.ArgumentParser(description="Ejecuta un programa assembly MIPS generado por el compilador.")
+  argumentParser.add_argument("file", help="Archivo con el código assembly.")
+  argumentParser.add_argument("--input", dest="inputPath", help="Archivo con la entrada del programa (una línea por lectura).")
+  arguments = argumentParser.parse_args()
+
+  with open(arguments.file, "r", encoding="utf-8") as file:
+    assemblyCode = file.read().split("\n")
+
+  inputs = []
+  if arguments.inputPath != None:
+    with open(arguments.inputPath, "r", encoding="utf-8") as file:
+      inputs = file.read().split("\n")
+
+  output, stats = runAssembly(assemblyCode, inputs)
+  print(output, end="")
+  for name in ("instructions", "loads", "stores", "syscalls", "heapBytes"):
+    print(f"{name:15} {stats[name]:10}", file=sys.stderr)
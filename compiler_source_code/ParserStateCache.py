@@ -0,0 +1,152 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from importlib import metadata
+from antlr4.ParserRuleContext import RuleContext
+from antlr4.PredictionContext import PredictionContext
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.LexerAction import LexerSkipAction, LexerPopModeAction, LexerMoreAction
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr.CompiscriptLexer import CompiscriptLexer, serializedATN as lexerSerializedATN
+from antlr.CompiscriptParser import CompiscriptParser, serializedATN as parserSerializedATN
+
+# Versión del formato del archivo. Se incrementa si cambia el contenido guardado.
+cacheFormatVersion = 1
+
+# Profundidad de recursión necesaria para serializar el grafo del ATN y los estados del DFA
+pickleRecursionLimit = 20000
+
+# Instancias únicas del runtime de ANTLR que se comparan por identidad (is). No se serializan: al cargar el
+# estado se reemplazan por las instancias del proceso actual.
+runtimeSingletons = {
+  "PredictionContext.EMPTY": PredictionContext.EMPTY,
+  "SemanticContext.NONE": SemanticContext.NONE,
+  "ATNSimulator.ERROR": ATNSimulator.ERROR,
+  "LexerATNSimulator.ERROR": LexerATNSimulator.ERROR,
+  "RuleContext.EMPTY": RuleContext.EMPTY,
+  "LexerSkipAction.INSTANCE": LexerSkipAction.INSTANCE,
+  "LexerPopModeAction.INSTANCE": LexerPopModeAction.INSTANCE,
+  "LexerMoreAction.INSTANCE": LexerMoreAction.INSTANCE,
+}
+
+class StatePickler(pickle.Pickler):
+
+  singletonNames = {id(instance): name for name, instance in runtimeSingletons.items()}
+
+  def persistent_id(self, obj):
+    return self.singletonNames.get(id(obj))
+
+class StateUnpickler(pickle.Unpickler):
+
+  def persistent_load(self, pid):
+    return runtimeSingletons[pid]
+
+def getRuntimeVersion():
+  try:
+    return metadata.version("antlr4-python3-runtime")
+  except metadata.PackageNotFoundError:
+    return "unknown"
+
+def getGrammarHash():
+  """
+  Devuelve el hash de los ATN serializados del lexer y del parser, la versión del runtime de ANTLR y la de Python.
+  Cambia cuando se vuelve a generar el parser a partir de una gramática distinta.
+  """
+  content = repr((cacheFormatVersion, lexerSerializedATN(), parserSerializedATN(), getRuntimeVersion(), sys.version_info[:2]))
+  return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class ParserStateCache:
+
+  # Archivos ya cargados en el proceso actual
+  loadedPaths = set()
+
+  def __init__(self, path) -> None:
+    """
+    Estado del lexer y del parser de ANTLR guardado en disco: el ATN deserializado y los DFA de predicción
+    construidos durante los análisis anteriores, junto con la caché de contextos de predicción.
+
+    Al cargarlo, el estado reemplaza al de las clases CompiscriptLexer y CompiscriptParser, de forma que los
+    parsers creados después inician con el DFA ya construido y el primer análisis no paga su construcción.
+    El archivo incluye el hash de la gramática (ver getGrammarHash). Si no coincide o el archivo no se puede
+    leer, se conserva el estado inicial de las clases (inicialización en frío).
+
+    @param path: Ruta del archivo del estado.
+    """
+    self.path = path
+    self.loadedStateCount = self.getStateCount()
+
+  def getStateCount(self):
+    """
+    Devuelve la cantidad de estados de los DFA del lexer y del parser.
+    """
+    return sum(len(dfa._states) for dfa in CompiscriptLexer.decisionsToDFA + CompiscriptParser.decisionsToDFA)
+
+  def load(self):
+    """
+    Carga el estado del archivo, si corresponde a la gramática actual y no se cargó antes en el proceso.
+    @return bool - Indica si el estado de las clases proviene del archivo.
+    """
+    if self.path in ParserStateCache.loadedPaths:
+      return True
+
+    try:
+      with open(self.path, "rb") as file:
+        if pickle.load(file) != getGrammarHash():
+          return False
+
+        recursionLimit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursionLimit, pickleRecursionLimit))
+        try:
+          lexerState, parserState = StateUnpickler(file).load()
+        finally:
+          sys.setrecursionlimit(recursionLimit)
+
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError, KeyError):
+      return False
+
+    CompiscriptLexer.atn, CompiscriptLexer.decisionsToDFA = lexerState
+    CompiscriptParser.atn, CompiscriptParser.decisionsToDFA, CompiscriptParser.sharedContextCache = parserState
+
+    ParserStateCache.loadedPaths.add(self.path)
+    self.loadedStateCount = self.getStateCount()
+    return True
+
+  def save(self):
+    """
+    Guarda el estado actual de las clases si los DFA tienen estados nuevos desde que se cargó el archivo.
+    La escritura es atómica: se escribe un archivo temporal en el mismo directorio y se reemplaza el anterior.
+    @return bool - Indica si se guardó el archivo (False si no hay estados nuevos o no se pudo escribir).
+    """
+    stateCount = self.getStateCount()
+    if stateCount <= self.loadedStateCount and os.path.exists(self.path):
+      return False
+
+    lexerState = (CompiscriptLexer.atn, CompiscriptLexer.decisionsToDFA)
+    parserState = (CompiscriptParser.atn, CompiscriptParser.decisionsToDFA, CompiscriptParser.sharedContextCache)
+
+    recursionLimit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursionLimit, pickleRecursionLimit))
+    temporaryPath = None
+    try:
+      directory = os.path.dirname(os.path.abspath(self.path))
+      os.makedirs(directory, exist_ok=True)
+      descriptor, temporaryPath = tempfile.mkstemp(dir=directory, prefix=".parserState")
+
+      with os.fdopen(descriptor, "wb") as file:
+        pickle.dump(getGrammarHash(), file, protocol=pickle.HIGHEST_PROTOCOL)
+        StatePickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump((lexerState, parserState))
+      os.replace(temporaryPath, self.path)
+
+    except OSError:
+      # El estado es solo una optimización: si no se puede escribir, la compilación continúa
+      if temporaryPath != None and os.path.exists(temporaryPath):
+        os.remove(temporaryPath)
+      return False
+    finally:
+      sys.setrecursionlimit(recursionLimit)
+
+    self.loadedStateCount = stateCount
+    return True
@@ -0,0 +1,508 @@
+from antlr4 import Token
+from antlr4.Recognizer import Recognizer
+from antlr.CompiscriptParser import CompiscriptParser
+
+P = CompiscriptParser
+
+# Tokens con los que puede iniciar una expresión
+expressionFirst = {
+  P.IDENTIFIER, P.NUMBER, P.STRING, P.T__40, P.T__41, P.T__42, P.T__43, P.T__44, # true false nil this super
+  P.T__11, P.T__36, P.T__38, P.T__4, P.T__39, P.T__31, # ( [ new fun ! -
+  P.T__18, P.T__19, P.T__20, # inputFloat inputInt inputString
+}
+
+statementStart = {
+  P.T__10: "forStmt", P.T__13: "ifStmt", P.T__15: "printStmt", P.T__16: "returnStmt", P.T__17: "whileStmt",
+  P.T__8: "breakStmt", P.T__9: "continueStmt", P.T__2: "block",
+}
+
+declarationFirst = expressionFirst | set(statementStart) | {P.T__0, P.T__5} # class var
+
+inputRules = {P.T__18: "inputFloat", P.T__19: "inputInt", P.T__20: "inputString"}
+
+# Operadores de cada nivel de precedencia de las operaciones binarias
+binaryOperators = {
+  "logic_or": {P.T__23}, # or
+  "logic_and": {P.T__24}, # and
+  "equality": {P.T__25, P.T__26}, # != ==
+  "comparison": {P.T__27, P.T__28, P.T__29, P.T__30}, # > >= < <=
+  "term": {P.T__31, P.T__32}, # - +
+  "factor": {P.T__33, P.T__34, P.T__35}, # / * %
+}
+
+class RecognitionError(Exception):
+  pass
+
+class RecursiveDescentParser(Recognizer):
+
+  literalNames = P.literalNames
+  symbolicNames = P.symbolicNames
+  ruleNames = P.ruleNames
+
+  def __init__(self, tokens) -> None:
+    """
+    Analizador sintáctico descendente recursivo escrito a mano, alternativa más rápida a CompiscriptParser.
+
+    Construye el mismo árbol que el parser generado por ANTLR (los mismos contextos de CompiscriptParser, con
+    los mismos hijos, start y stop), por lo que el árbol se recorre con SemanticChecker sin modificaciones.
+    La gramática es LL(1) salvo en dos decisiones, que se resuelven igual que la predicción de ANTLR:
+    - declaration: fun IDENTIFIER es una declaración de función y fun ( una función anónima.
+    - assignment: (call '.')? IDENTIFIER '=' se reconoce recorriendo los tokens de la llamada sin construir
+      contextos (ver getAssignmentTarget).
+    En las ambigüedades de la gramática se elige, como ANTLR, la primera alternativa: una función anónima es
+    siempre un primary y una instrucción input; se reconoce como exprStmt.
+
+    No hay recuperación de errores: el primer error sintáctico se reporta a los error listeners y program()
+    devuelve un programa vacío, de forma que el análisis semántico no reporta errores adicionales.
+
+    @param tokens: Lista de tokens terminada con EOF (ver CompiscriptScanner.getTokens).
+    """
+    super().__init__()
+    self.tokens = tokens
+    self.types = [token.type for token in tokens]
+    self.position = 0
+
+  def la(self, offset=1):
+    index = min(self.position + offset - 1, len(self.types) - 1)
+    return self.types[index]
+
+  def enter(self, contextClass, parent):
+    ctx = contextClass(self, parent)
+    ctx.start = self.tokens[self.position]
+    if parent != None:
+      parent.addChild(ctx)
+    return ctx
+
+  def exit(self, ctx):
+    ctx.stop = self.tokens[self.position - 1] if self.position > 0 else None
+    return ctx
+
+  def match(self, ctx, tokenType):
+    if self.types[self.position] != tokenType:
+      self.raiseError(f"mismatched input {self.getTokenDisplay()} expecting {self.getTokenName(tokenType)}")
+    ctx.addTokenNode(self.tokens[self.position])
+    if tokenType != Token.EOF: # Como en ANTLR, EOF no se consume
+      self.position += 1
+
+  def getTokenDisplay(self):
+    text = self.tokens[self.position].text
+    return "'" + text.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r") + "'"
+
+  def getTokenName(self, tokenType):
+    if tokenType == Token.EOF:
+      return "<EOF>"
+    if tokenType < len(self.literalNames):
+      return self.literalNames[tokenType]
+    return self.symbolicNames[tokenType]
+
+  def raiseError(self, message):
+    token = self.tokens[self.position]
+    self.getErrorListenerDispatch().syntaxError(self, token, token.line, token.column, message, None)
+    raise RecognitionError(message)
+
+  def program(self):
+    """
+    Regla inicial de la gramática. Devuelve el ProgramContext del código completo.
+    """
+    try:
+      ctx = self.enter(P.ProgramContext, None)
+      while self.la() in declarationFirst:
+        self.declaration(ctx)
+      self.match(ctx, Token.EOF)
+      return self.exit(ctx)
+
+    except RecognitionError:
+      self.position = len(self.tokens) - 1
+      ctx = self.enter(P.ProgramContext, None)
+      self.match(ctx, Token.EOF)
+      return self.exit(ctx)
+
+  def declaration(self, parent):
+    ctx = self.enter(P.DeclarationContext, parent)
+    tokenType = self.la()
+
+    if tokenType == P.T__0: # class
+      self.classDecl(ctx)
+    elif tokenType == P.T__4 and self.la(2) == P.IDENTIFIER: # fun IDENTIFIER
+      self.funDecl(ctx)
+    elif tokenType == P.T__5: # var
+      self.varDecl(ctx)
+    else:
+      self.statement(ctx)
+
+    return self.exit(ctx)
+
+  def classDecl(self, parent):
+    ctx = self.enter(P.ClassDeclContext, parent)
+    self.match(ctx, P.T__0)
+    self.match(ctx, P.IDENTIFIER)
+    if self.la() == P.T__1: # extends
+      self.match(ctx, P.T__1)
+      self.match(ctx, P.IDENTIFIER)
+    self.match(ctx, P.T__2)
+    while self.la() == P.IDENTIFIER:
+      self.function(ctx)
+    self.match(ctx, P.T__3)
+    return self.exit(ctx)
+
+  def funDecl(self, parent):
+    ctx = self.enter(P.FunDeclContext, parent)
+    self.match(ctx, P.T__4)
+    self.function(ctx)
+    return self.exit(ctx)
+
+  def varDecl(self, parent):
+    ctx = self.enter(P.VarDeclContext, parent)
+    self.match(ctx, P.T__5)
+    self.match(ctx, P.IDENTIFIER)
+    if self.la() == P.T__6: # =
+      self.match(ctx, P.T__6)
+      self.expression(ctx)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def statement(self, parent):
+    ctx = self.enter(P.StatementContext, parent)
+    tokenType = self.la()
+
+    if tokenType in statementStart:
+      getattr(self, statementStart[tokenType])(ctx)
+    elif tokenType in expressionFirst:
+      self.exprStmt(ctx)
+    else:
+      self.raiseError(f"no viable alternative at input {self.getTokenDisplay()}")
+
+    return self.exit(ctx)
+
+  def breakStmt(self, parent):
+    ctx = self.enter(P.BreakStmtContext, parent)
+    self.match(ctx, P.T__8)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def continueStmt(self, parent):
+    ctx = self.enter(P.ContinueStmtContext, parent)
+    self.match(ctx, P.T__9)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def exprStmt(self, parent):
+    ctx = self.enter(P.ExprStmtContext, parent)
+    self.expression(ctx)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def forStmt(self, parent):
+    ctx = self.enter(P.ForStmtContext, parent)
+    self.match(ctx, P.T__10)
+    self.match(ctx, P.T__11)
+
+    tokenType = self.la()
+    if tokenType == P.T__5: # var
+      self.varDecl(ctx)
+    elif tokenType == P.T__7: # ;
+      self.match(ctx, P.T__7)
+    else:
+      self.exprStmt(ctx)
+
+    if self.la() in expressionFirst:
+      self.expression(ctx)
+    self.match(ctx, P.T__7)
+    if self.la() in expressionFirst:
+      self.expression(ctx)
+    self.match(ctx, P.T__12)
+    self.statement(ctx)
+    return self.exit(ctx)
+
+  def ifStmt(self, parent):
+    ctx = self.enter(P.IfStmtContext, parent)
+    self.match(ctx, P.T__13)
+    self.match(ctx, P.T__11)
+    self.expression(ctx)
+    self.match(ctx, P.T__12)
+    self.statement(ctx)
+    if self.la() == P.T__14: # else (se asocia al if más cercano)
+      self.match(ctx, P.T__14)
+      self.statement(ctx)
+    return self.exit(ctx)
+
+  def printStmt(self, parent):
+    ctx = self.enter(P.PrintStmtContext, parent)
+    self.match(ctx, P.T__15)
+    self.expression(ctx)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def returnStmt(self, parent):
+    ctx = self.enter(P.ReturnStmtContext, parent)
+    self.match(ctx, P.T__16)
+    if self.la() in expressionFirst:
+      self.expression(ctx)
+    self.match(ctx, P.T__7)
+    return self.exit(ctx)
+
+  def whileStmt(self, parent):
+    ctx = self.enter(P.WhileStmtContext, parent)
+    self.match(ctx, P.T__17)
+    self.match(ctx, P.T__11)
+    self.expression(ctx)
+    self.match(ctx, P.T__12)
+    self.statement(ctx)
+    return self.exit(ctx)
+
+  def block(self, parent):
+    ctx = self.enter(P.BlockContext, parent)
+    self.match(ctx, P.T__2)
+    while self.la() in declarationFirst:
+      self.declaration(ctx)
+    self.match(ctx, P.T__3)
+    return self.exit(ctx)
+
+  def funAnon(self, parent):
+    ctx = self.enter(P.FunAnonContext, parent)
+    self.match(ctx, P.T__4)
+    self.match(ctx, P.T__11)
+    if self.la() == P.IDENTIFIER:
+      self.parameters(ctx)
+    self.match(ctx, P.T__12)
+    self.block(ctx)
+    return self.exit(ctx)
+
+  def input(self, parent):
+    ctx = self.enter(P.InputContext, parent)
+    tokenType = self.la()
+
+    if tokenType == P.T__18:
+      inputCtx = self.enter(P.InputFloatContext, ctx)
+    elif tokenType == P.T__19:
+      inputCtx = self.enter(P.InputIntContext, ctx)
+    else:
+      inputCtx = self.enter(P.InputStringContext, ctx)
+
+    self.match(inputCtx, tokenType)
+    self.match(inputCtx, P.STRING)
+    if tokenType == P.T__20: # inputString STRING , NUMBER
+      self.match(inputCtx, P.T__21)
+      self.match(inputCtx, P.NUMBER)
+
+    self.exit(inputCtx)
+    return self.exit(ctx)
+
+  def expression(self, parent):
+    ctx = self.enter(P.ExpressionContext, parent)
+    self.assignment(ctx)
+    return self.exit(ctx)
+
+  def getAssignmentTarget(self):
+    """
+    Indica si en la posición actual inicia una asignación (call '.')? IDENTIFIER '='.
+    Recorre los tokens de un primary y sus sufijos sin construir contextos.
+    @return Posición del '.' que separa la llamada del atributo asignado, la posición actual si se asigna
+      a un identificador, o None si no es una asignación.
+    """
+    if self.la() == P.IDENTIFIER and self.la(2) == P.T__6:
+      return self.position
+
+    types = self.types
+    position = self.skipPrimary(self.position)
+    lastDot = None
+    while position != None and position < len(types):
+      tokenType = types[position]
+      if tokenType == P.T__22 and types[position + 1] == P.IDENTIFIER: # . IDENTIFIER
+        lastDot = position
+        position += 2
+      elif tokenType in (P.T__11, P.T__36): # ( [
+        position = self.skipBrackets(position)
+      else:
+        break
+
+    if position != None and position < len(types) and lastDot == position - 2 and types[position] == P.T__6:
+      return lastDot
+    return None
+
+  def skipBrackets(self, position):
+    """
+    Devuelve la posición después del paréntesis, corchete o llave que cierra el de position, o None.
+    """
+    depth = 0
+    for index in range(position, len(self.types)):
+      tokenType = self.types[index]
+      if tokenType in (P.T__11, P.T__36, P.T__2):
+        depth += 1
+      elif tokenType in (P.T__12, P.T__37, P.T__3):
+        depth -= 1
+        if depth == 0:
+          return index + 1
+    return None
+
+  def skipPrimary(self, position):
+    types = self.types
+    tokenType = types[position]
+
+    if tokenType in (P.IDENTIFIER, P.NUMBER, P.STRING, P.T__40, P.T__41, P.T__42, P.T__43):
+      return position + 1
+    if tokenType == P.T__44: # super . IDENTIFIER
+      return position + 3
+    if tokenType in (P.T__11, P.T__36): # ( [
+      return self.skipBrackets(position)
+    if tokenType == P.T__38 and types[position + 1] == P.IDENTIFIER: # new IDENTIFIER (
+      return self.skipBrackets(position + 2)
+    if tokenType == P.T__4: # fun ( ) { }
+      position = self.skipBrackets(position + 1)
+      return self.skipBrackets(position) if position != None else None
+    return None
+
+  def assignment(self, parent):
+    ctx = self.enter(P.AssignmentContext, parent)
+    tokenType = self.la()
+
+    if tokenType in inputRules:
+      self.input(ctx)
+      return self.exit(ctx)
+
+    target = self.getAssignmentTarget() if tokenType in expressionFirst else None
+    if target == None:
+      self.logic_or(ctx)
+      return self.exit(ctx)
+
+    if target > self.position:
+      self.call(ctx, target)
+      self.match(ctx, P.T__22)
+    self.match(ctx, P.IDENTIFIER)
+    self.match(ctx, P.T__6)
+    self.assignment(ctx)
+    return self.exit(ctx)
+
+  def binaryOperation(self, parent, contextClass, operators, operand):
+    ctx = self.enter(contextClass, parent)
+    operand(ctx)
+    while self.la() in operators:
+      self.match(ctx, self.la())
+      operand(ctx)
+    return self.exit(ctx)
+
+  def logic_or(self, parent):
+    return self.binaryOperation(parent, P.Logic_orContext, binaryOperators["logic_or"], self.logic_and)
+
+  def logic_and(self, parent):
+    return self.binaryOperation(parent, P.Logic_andContext, binaryOperators["logic_and"], self.equality)
+
+  def equality(self, parent):
+    return self.binaryOperation(parent, P.EqualityContext, binaryOperators["equality"], self.comparison)
+
+  def comparison(self, parent):
+    return self.binaryOperation(parent, P.ComparisonContext, binaryOperators["comparison"], self.term)
+
+  def term(self, parent):
+    return self.binaryOperation(parent, P.TermContext, binaryOperators["term"], self.factor)
+
+  def factor(self, parent):
+    return self.binaryOperation(parent, P.FactorContext, binaryOperators["factor"], self.unary)
+
+  def array(self, parent):
+    ctx = self.enter(P.ArrayContext, parent)
+    self.match(ctx, P.T__36)
+    if self.la() in expressionFirst:
+      self.expression(ctx)
+      while self.la() == P.T__21: # ,
+        self.match(ctx, P.T__21)
+        self.expression(ctx)
+    self.match(ctx, P.T__37)
+    return self.exit(ctx)
+
+  def instantiation(self, parent):
+    ctx = self.enter(P.InstantiationContext, parent)
+    self.match(ctx, P.T__38)
+    self.match(ctx, P.IDENTIFIER)
+    self.match(ctx, P.T__11)
+    if self.la() in expressionFirst:
+      self.arguments(ctx)
+    self.match(ctx, P.T__12)
+    return self.exit(ctx)
+
+  def unary(self, parent):
+    ctx = self.enter(P.UnaryContext, parent)
+    tokenType = self.la()
+    if tokenType in (P.T__39, P.T__31): # ! -
+      self.match(ctx, tokenType)
+      self.unary(ctx)
+    else:
+      self.call(ctx)
+    return self.exit(ctx)
+
+  def call(self, parent, stop=None):
+    """
+    @param stop: Posición en la que terminan los sufijos de la llamada (el '.' de una asignación a un atributo).
+    """
+    ctx = self.enter(P.CallContext, parent)
+    self.primary(ctx)
+
+    while self.position != stop:
+      tokenType = self.la()
+      if tokenType == P.T__11: # ( arguments? )
+        self.match(ctx, P.T__11)
+        if self.la() in expressionFirst:
+          self.arguments(ctx)
+        self.match(ctx, P.T__12)
+      elif tokenType == P.T__22: # . IDENTIFIER
+        self.match(ctx, P.T__22)
+        self.match(ctx, P.IDENTIFIER)
+      elif tokenType == P.T__36: # [ expression ]
+        self.match(ctx, P.T__36)
+        self.expression(ctx)
+        self.match(ctx, P.T__37)
+      else:
+        break
+
+    return self.exit(ctx)
+
+  def primary(self, parent):
+    ctx = self.enter(P.PrimaryContext, parent)
+    tokenType = self.la()
+
+    if tokenType in (P.T__40, P.T__41, P.T__42, P.T__43, P.NUMBER, P.STRING, P.IDENTIFIER):
+      self.match(ctx, tokenType)
+    elif tokenType == P.T__11: # ( expression )
+      self.match(ctx, P.T__11)
+      self.expression(ctx)
+      self.match(ctx, P.T__12)
+    elif tokenType == P.T__44: # super . IDENTIFIER
+      self.match(ctx, P.T__44)
+      self.match(ctx, P.T__22)
+      self.match(ctx, P.IDENTIFIER)
+    elif tokenType == P.T__36:
+      self.array(ctx)
+    elif tokenType == P.T__38:
+      self.instantiation(ctx)
+    elif tokenType == P.T__4:
+      self.funAnon(ctx)
+    else:
+      self.raiseError(f"no viable alternative at input {self.getTokenDisplay()}")
+
+    return self.exit(ctx)
+
+  def function(self, parent):
+    ctx = self.enter(P.FunctionContext, parent)
+    self.match(ctx, P.IDENTIFIER)
+    self.match(ctx, P.T__11)
+    if self.la() == P.IDENTIFIER:
+      self.parameters(ctx)
+    self.match(ctx, P.T__12)
+    self.block(ctx)
+    return self.exit(ctx)
+
+  def parameters(self, parent):
+    ctx = self.enter(P.ParametersContext, parent)
+    self.match(ctx, P.IDENTIFIER)
+    while self.la() == P.T__21: # ,
+      self.match(ctx, P.T__21)
+      self.match(ctx, P.IDENTIFIER)
+    return self.exit(ctx)
+
+  def arguments(self, parent):
+    ctx = self.enter(P.ArgumentsContext, parent)
+    self.expression(ctx)
+    while self.la() == P.T__21: # ,
+      self.match(ctx, P.T__21)
+      self.expression(ctx)
+    return self.exit(ctx)
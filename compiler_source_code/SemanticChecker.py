@@ -10,13 +10,13 @@ from ParamsTree import ParamsTree
 from IntermediateCodeGenerator import IntermediateCodeGenerator
 class SemanticChecker(CompiscriptListener):
     
-    def __init__(self, preventCodeGeneration=False) -> None:
+    def __init__(self, preventCodeGeneration=False, options=None, symbolGenerator=None) -> None:
       super().__init__()
 
-      self.symbolTable = SymbolTable()
+      self.symbolTable = SymbolTable(symbolGenerator)
       self.errors = []
       self.params = ParamsTree()
-      self.intermediateCodeGenerator = IntermediateCodeGenerator(self.symbolTable, self.errors, stopGeneration=preventCodeGeneration)
+      self.intermediateCodeGenerator = IntermediateCodeGenerator(self.symbolTable, self.errors, stopGeneration=preventCodeGeneration, options=options)
 
     def addSemanticError(self, error):
       self.errors.append(error)
@@ -485,7 +485,7 @@ class SemanticChecker(CompiscriptListener):
       _, nodeParams = self.params.initNodeParams()
 
       # Crear y agregar una función anonima
-      functionDef = self.symbolTable.currentScope.addAnonymousFunction()
+      functionDef = self.symbolTable.currentScope.addAnonymousFunction(self.symbolTable.symbolGenerator.newFunctionId())
 
       # Indicar que el siguiente bloque es una función en parametros
       nodeParams.add("blockType", ScopeType.FUNCTION) 
@@ -914,9 +914,12 @@ class SemanticChecker(CompiscriptListener):
             # Determinar que tipo es el compatible (o si son ambos)
             if childType.strictEqualsType((NumberType, NilType)):
               # Si algún número es float, remover el tipo int
-              if childType.equalsType(FloatType):
+              if childType.strictEqualsType(FloatType):
                 childTypes.discard(IntType)
                 childTypes.add(FloatType)
+              elif childType.equalsType(FloatType):
+                # Unión de int y float: el resultado puede ser cualquiera de los dos
+                childTypes.add(NumberType)
               else:
                 childTypes.add(IntType)
                 
@@ -951,6 +954,8 @@ class SemanticChecker(CompiscriptListener):
           ctx.type = UnionType(NumberType(), StringType())
         elif FloatType in childTypes:
           ctx.type = FloatType()
+        elif NumberType in childTypes:
+          ctx.type = UnionType(FloatType(), IntType())
         else:
           ctx.type = IntType()
 
@@ -1445,7 +1450,7 @@ class SemanticChecker(CompiscriptListener):
       if functionName == None:
         functionName = CompilerError("No se ha definido el nombre de la función")
         
-      functionObj = FunctionType(functionName)
+      functionObj = FunctionType(functionName, self.symbolTable.symbolGenerator.newFunctionId())
 
 
       # Si el scope actual es una clase
@@ -1469,7 +1474,7 @@ class SemanticChecker(CompiscriptListener):
           
           if classDef.constructor == None:
             # Agregar constructor a la clase
-            constructorFunctionDef = classDef.addConstructor()
+            constructorFunctionDef = classDef.addConstructor(self.symbolTable.symbolGenerator.newFunctionId())
             nodeParams.add("reference", constructorFunctionDef) # Guardar referencia al constructor (para hijos)
           
             self.symbolTable.currentScope.addFunction(constructorFunctionDef)
@@ -0,0 +1,37 @@
+class SymbolGenerator:
+
+  def __init__(self) -> None:
+    """
+    Genera los nombres únicos de una compilación: labels del código intermedio y del assembly, ids de funciones
+    y ids de scopes. Cada nombre se forma con un contador por sitio (el prefijo del nombre), por lo que la misma
+    entrada produce siempre el mismo código y dos nombres de la misma compilación nunca coinciden.
+
+    Se crea uno por compilación y se comparte entre la tabla de símbolos, el generador de código intermedio,
+    los passes de optimización y el generador de assembly.
+    """
+    self.counters = {} # sitio -> siguiente número
+
+  def nextNumber(self, site):
+    """
+    Devuelve el siguiente número del contador de site (0, 1, 2, ...).
+    """
+    number = self.counters.get(site, 0)
+    self.counters[site] = number + 1
+    return number
+
+  def newLabel(self, prefix):
+    """
+    Crea un label con el formato prefix_n. Como n solo contiene dígitos, labels con prefijos distintos
+    no pueden coincidir.
+    """
+    return f"{prefix}_{self.nextNumber(prefix)}"
+
+  def newFunctionId(self):
+    """
+    Crea el id de una función (fn). El nombre único de la función es nombre_fn (ver FunctionType.getUniqueName),
+    que no coincide con los labels de newLabel porque su sufijo no es solo numérico.
+    """
+    return f"f{self.nextNumber('function')}"
+
+  def newScopeId(self):
+    return f"s{self.nextNumber('scope')}"
@@ -2,7 +2,7 @@ from enum import Enum
 from copy import deepcopy
 from primitiveTypes import AnyType
 from compoundTypes import FunctionType, ClassType, ObjectType, FunctionOverload
-from utils.getUniqueId import getUniqueId
+from SymbolGenerator import SymbolGenerator
 
 class ScopeType(Enum):
   """
@@ -31,11 +31,11 @@ class SharedOffset:
     
 class Scope:
   
-  def __init__(self, parent, level, type = None):
+  def __init__(self, parent, level, type, id):
     self.parent = parent
     self.level = level
     self.type = type
-    self.id = getUniqueId()
+    self.id = id
     
     # Nivel de anidamiento de funciones (0 = global)
     self.functionLevel = 0 if parent == None else parent.functionLevel 
@@ -79,12 +79,13 @@ class Scope:
 
     return functionObj
   
-  def addAnonymousFunction(self):
+  def addAnonymousFunction(self, functionId):
     """
     Crea una definición de función anónima y la agrega a la lista de funciones del scope
+    @param functionId: str. Id único de la función (ver SymbolGenerator.newFunctionId)
     @return FunctionType. Retorna el objeto de la función creada
     """
-    functionObj = FunctionType(f"anonymous")
+    functionObj = FunctionType(f"anonymous", functionId)
     self.elements[functionObj.name] = functionObj
     return functionObj
   
@@ -396,13 +397,16 @@ class Scope:
 
 class SymbolTable:
 
-  def __init__(self):
+  def __init__(self, symbolGenerator=None):
     
-    self.globalScope = Scope(None, 0, ScopeType.GLOBAL)
+    # Nombres únicos de la compilación (ids de scopes y funciones, labels)
+    self.symbolGenerator = symbolGenerator if symbolGenerator != None else SymbolGenerator()
+
+    self.globalScope = Scope(None, 0, ScopeType.GLOBAL, self.symbolGenerator.newScopeId())
     self.currentScope = self.globalScope
 
   def createScope(self, type):
-    return Scope(self.currentScope, self.currentScope.level + 1, type)
+    return Scope(self.currentScope, self.currentScope.level + 1, type, self.symbolGenerator.newScopeId())
   
   def createScopeAndSwitch(self, type):
     newScope = self.createScope(type)
@@ -1,42 +1,188 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
 from antlr4 import *
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from antlr.CompiscriptLexer import CompiscriptLexer
 from antlr.CompiscriptParser import CompiscriptParser
+from CompiscriptScanner import CompiscriptScanner
+from RecursiveDescentParser import RecursiveDescentParser
+from ParserStateCache import ParserStateCache
+from CompilationCache import CompilationCache
+from CompilationStats import CompilationStats, countParseTreeNodes
+from MipsSimulator import MipsSimulator
 from SemanticChecker import SemanticChecker
 from ErrorListener import LexerErrorListener, ParserErrorListener
 from AssemblyGenerator import AssemblyGenerator
+from CompilerOptions import CompilerOptions
+from SymbolGenerator import SymbolGenerator
+from optimizations.PassManager import PassManager
 
-def executeCompilation(filePath):
+def parseProgram(parser, stream, parserErrorListener, parseTimings=None):
+  """
+  Realiza el análisis sintáctico con el parser de ANTLR en dos etapas. Primero se intenta con la predicción SLL,
+  que no considera el contexto completo de las reglas y es mucho más rápida, deteniéndose en el primer error
+  (BailErrorStrategy). Solo si falla, se vuelve a analizar desde el inicio con la predicción LL completa y la
+  estrategia de errores por defecto, que reporta los errores a parserErrorListener y se recupera de ellos.
+  Los tokens ya leídos se reutilizan, por lo que los errores léxicos no se reportan dos veces.
+  @param parser: CompiscriptParser - Parser sin error listeners.
+  @param stream: CommonTokenStream - Tokens del parser.
+  @param parseTimings: list - Si se indica, se agrega el tiempo de cada intento (modo, segundos, exitoso).
+  @return tree: ProgramContext - Árbol sintáctico del programa.
+  """
+  parser._interp.predictionMode = PredictionMode.SLL
+  parser._errHandler = BailErrorStrategy()
+
+  start = time.perf_counter()
+  try:
+    tree = parser.program()
+    if parseTimings != None:
+      parseTimings.append(("SLL", time.perf_counter() - start, True))
+    return tree
+
+  except ParseCancellationException:
+    if parseTimings != None:
+      parseTimings.append(("SLL", time.perf_counter() - start, False))
+
+  stream.seek(0)
+  parser.reset()
+  parser.addErrorListener(parserErrorListener)
+  parser._interp.predictionMode = PredictionMode.LL
+  parser._errHandler = DefaultErrorStrategy()
+
+  start = time.perf_counter()
+  tree = parser.program()
+  if parseTimings != None:
+    parseTimings.append(("LL", time.perf_counter() - start, len(parserErrorListener.errors) == 0))
+  return tree
+
+def executeCompilation(filePath, options=None, passTimings=None, parseTimings=None, source=None, stats=None, passReports=None):
+  """
+  Compila un código fuente (ver compileSource). Si options.compileCachePath está definido, primero se busca
+  el resultado en la caché de compilaciones y, si no se encuentra, se guarda después de compilar.
+  En ese caso no se agregan tiempos a passTimings, parseTimings, passReports ni stats cuando el resultado proviene de la caché
+  (stats.cacheHit es True).
+  @return has_errors, errors, assembly_code: bool, list, str - Indica si hubo errores,
+  lista de errores y código ensamblador (str list).
+  """
+  if options == None:
+    options = CompilerOptions()
+
+  if options.compileCachePath == None:
+    return compileSource(filePath, options, passTimings, parseTimings, source, stats, passReports)
+
+  try:
+    if source == None:
+      with open(filePath, "rb") as file:
+        source = file.read().decode("utf-8")
+  except Exception as e:
+    return True, [str(e)], None
+
+  compilationCache = CompilationCache(options.compileCachePath, options.compileCacheSize)
+  key = compilationCache.getKey(source, options)
+  result = compilationCache.load(key)
+  if result != None:
+    if stats != None:
+      stats.cacheHit = True
+    return result
+
+  result = compileSource(filePath, options, passTimings, parseTimings, source, stats, passReports)
+  compilationCache.store(key, *result)
+  return result
+
+def compileSource(filePath, options=None, passTimings=None, parseTimings=None, source=None, stats=None, passReports=None):
   """
   Ejecuta el análisis léxico, sintáctico y semántico de un código fuente, posteriormente genera
   el código intermedio y lo traduce a código ensamblador.
   @param filePath: str - Ruta del archivo a analizar.
+  @param options: CompilerOptions - Opciones de generación de código. Si es None, se usan las opciones por defecto.
+  @param passTimings: list - Si se indica, se agrega el tiempo de cada pass de optimización ejecutado
+  (nombre, segundos, instrucciones antes, instrucciones después).
+  @param parseTimings: list - Si se indica, se agrega el tiempo de cada intento del análisis sintáctico
+  (modo, segundos, exitoso). Ver parseProgram.
+  @param source: str - Código fuente. Si se indica, se compila en lugar del contenido del archivo filePath.
+  @param stats: CompilationStats - Si se indica, se agrega la medición de cada fase ejecutada.
+  @param passReports: dict - Si se indica, se agrega el informe de los passes que lo generan
+  ({nombre del pass: {regla: cantidad}}, ver PassManager.getReports).
   @return has_errors, errors, assembly_code: bool, list, str - Indica si hubo errores,
   lista de errores y código ensamblador (str list).
   """
-  try:
-    input_stream = FileStream(filePath, encoding='utf-8')
-    lexer = CompiscriptLexer(input_stream)
+  if options == None:
+    options = CompilerOptions()
+
+  def measure(phaseName):
+    return stats.measure(phaseName) if stats != None else contextlib.nullcontext()
     
-    # Capturar errores léxicos
+  try:
+    input_stream = InputStream(source) if source != None else FileStream(filePath, encoding='utf-8')
+
+    # Capturar errores léxicos y sintácticos
     lexerErrorListener = LexerErrorListener()
-    lexer.removeErrorListeners()
-    lexer.addErrorListener(lexerErrorListener)
-    
+    parserErrorListener = ParserErrorListener()
 
-    stream = CommonTokenStream(lexer)
-    parser = CompiscriptParser(stream)
+    if options.recursiveDescentParser:
+      scanner = CompiscriptScanner(input_stream)
+      scanner.removeErrorListeners()
+      scanner.addErrorListener(lexerErrorListener)
 
-    # Capturar errores sintácticos
-    parserErrorListener = ParserErrorListener()
-    parser.removeErrorListeners()
-    parser.addErrorListener(parserErrorListener)
+      with measure("lexing"):
+        tokens = scanner.getTokens()
+
+      parser = RecursiveDescentParser(tokens)
+      parser.removeErrorListeners()
+      parser.addErrorListener(parserErrorListener)
+
+      with measure("parsing"):
+        start = time.perf_counter()
+        tree = parser.program() # program es la regla inicial de gramática
+        if parseTimings != None:
+          parseTimings.append(("recursiveDescent", time.perf_counter() - start, len(parserErrorListener.errors) == 0))
+    else:
+      # Estado del parser de ANTLR (ATN y DFA) guardado por las compilaciones anteriores
+      parserStateCache = None
+      if options.parserStatePath != None:
+        parserStateCache = ParserStateCache(options.parserStatePath)
+        parserStateCache.load()
+
+      lexer = CompiscriptScanner(input_stream) if options.regexLexer else CompiscriptLexer(input_stream)
+      lexer.removeErrorListeners()
+      lexer.addErrorListener(lexerErrorListener)
+
+      stream = CommonTokenStream(lexer)
+      with measure("lexing"):
+        stream.fill() # Leer todos los tokens antes del análisis sintáctico
+      tokens = stream.tokens
+
+      parser = CompiscriptParser(stream)
+      parser.removeErrorListeners()
+
+      with measure("parsing"):
+        tree = parseProgram(parser, stream, parserErrorListener, parseTimings)
 
-    tree = parser.program() # program es la regla inicial de gramática
+      if parserStateCache != None:
+        parserStateCache.save()
+
+    if stats != None:
+      stats.getPhase("lexing").counts["tokens"] = len(tokens) - 1 # Sin contar EOF
+      stats.getPhase("parsing").counts["parseTreeNodes"] = countParseTreeNodes(tree)
+
+    # Nombres únicos (labels, funciones y scopes) de la compilación, generados con contadores
+    symbolGenerator = SymbolGenerator()
 
     # Realizar análisis semantico
-    semantic_checker = SemanticChecker()
+    semantic_checker = SemanticChecker(options=options, symbolGenerator=symbolGenerator)
     walker = ParseTreeWalker()
-    walker.walk(semantic_checker, tree)
+    try:
+      with measure("semantic"):
+        walker.walk(semantic_checker, tree)
+    except Exception:
+      # El árbol de un programa con errores sintácticos puede estar incompleto: se reportan los errores sintácticos
+      if len(lexerErrorListener.errors) + len(parserErrorListener.errors) == 0:
+        raise
 
     # retornar errores
     errors = lexerErrorListener.errors + parserErrorListener.errors + semantic_checker.errors
@@ -45,9 +191,92 @@ def executeCompilation(filePath):
       return True, errors, None
     else:
       # Realizar traducción a código ensamblador
-      intermediateCode = semantic_checker.getProgramCode()
-      assemblyGenerator = AssemblyGenerator(intermediateCode)
-      return False, [], assemblyGenerator.getCode()
+      with measure("intermediateCode") as phase:
+        intermediateCode = semantic_checker.getProgramCode()
+      if stats != None:
+        phase.counts["irInstructions"] = len(intermediateCode)
+      
+      passManager = PassManager(options, symbolGenerator)
+      with measure("optimization") as phase:
+        intermediateCode = passManager.runIntermediateCodePasses(intermediateCode)
+      if stats != None:
+        phase.counts["irInstructions"] = len(intermediateCode)
+      
+      with measure("assembly") as phase:
+        assemblyGenerator = AssemblyGenerator(intermediateCode, options, symbolGenerator)
+        assemblyCode = assemblyGenerator.getCode()
+      if stats != None:
+        phase.counts["assemblyLines"] = len(assemblyCode)
+
+      with measure("assemblyOptimization") as phase:
+        assemblyCode = passManager.runAssemblyPasses(assemblyCode)
+      if stats != None:
+        phase.counts["assemblyLines"] = len(assemblyCode)
+        phase.passReports = passManager.getReports()
+      
+      if passTimings != None:
+        passTimings += passManager.getTimings()
+      if passReports != None:
+        passReports.update(passManager.getReports())
+      
+      return False, [], assemblyCode
 
   except Exception as e:
-    return True, [str(e)], None
\ No newline at end of file
+    return True, [str(e)], None
+
+if __name__ == "__main__":
+  argumentParser = argparse.ArgumentParser(description="Compila un programa Compiscript a assembly MIPS.")
+  argumentParser.add_argument("file", help="Archivo con el código fuente.")
+  argumentParser.add_argument("-O", dest="optimizationLevel", type=int, choices=(0, 1, 2), default=0, help="Nivel de optimización.")
+  argumentParser.add_argument("-o", dest="output", help="Archivo de salida. Por defecto el assembly se muestra en la salida estándar.")
+  argumentParser.add_argument("--parser", choices=("antlr", "rd"), default="antlr", help="Analizador sintáctico: el generado por ANTLR o el descendente recursivo.")
+  argumentParser.add_argument("--regex-lexer", action="store_true", help="Utilizar el lexer de una sola expresión regular con el parser de ANTLR.")
+  argumentParser.add_argument("--parser-state", dest="parserStatePath", help="Archivo en el que se guarda y del que se carga el estado del parser de ANTLR (ATN y DFA).")
+  argumentParser.add_argument("--cache", dest="compileCachePath", help="Directorio de la caché de compilaciones.")
+  argumentParser.add_argument("--verify-passes", action="store_true", help="Verificar el código intermedio después de cada pass.")
+  argumentParser.add_argument("--time-passes", action="store_true", help="Mostrar el tiempo de cada pass de optimización.")
+  argumentParser.add_argument("--stats", dest="statsPath", help="Archivo JSON en el que se guardan el tiempo, la memoria y las cantidades de cada fase.")
+  argumentParser.add_argument("--run", action="store_true", help="Ejecutar el programa en el simulador de MIPS (la entrada se lee de la entrada estándar) y mostrar las instrucciones ejecutadas.")
+  arguments = argumentParser.parse_args()
+
+  options = CompilerOptions.fromOptimizationLevel(arguments.optimizationLevel, verifyPasses=arguments.verify_passes,
+                                                recursiveDescentParser=arguments.parser == "rd", regexLexer=arguments.regex_lexer,
+                                                parserStatePath=arguments.parserStatePath, compileCachePath=arguments.compileCachePath)
+  passTimings = []
+  parseTimings = []
+  passReports = {}
+  stats = CompilationStats() if arguments.statsPath != None else None
+
+  # El análisis semántico muestra la tabla de símbolos en la salida estándar
+  with contextlib.redirect_stdout(io.StringIO()):
+    hasErrors, errors, assemblyCode = executeCompilation(arguments.file, options, passTimings, parseTimings, stats=stats, passReports=passReports)
+
+  if stats != None:
+    with open(arguments.statsPath, "w", encoding="utf-8") as file:
+      file.write(stats.toJson())
+
+  if hasErrors:
+    for error in errors:
+      print(error, file=sys.stderr)
+    sys.exit(1)
+
+  if arguments.time_passes:
+    for mode, seconds, succeeded in parseTimings:
+      print(f"{'parse (' + mode + ')':25} {seconds * 1000:10.2f} ms {'ok' if succeeded else 'error':>8}", file=sys.stderr)
+    for name, seconds, instructionsBefore, instructionsAfter in passTimings:
+      print(f"{name:25} {seconds * 1000:10.2f} ms {instructionsBefore:8} -> {instructionsAfter}", file=sys.stderr)
+      for rule, count in passReports.get(name, {}).items():
+        print(f"  {rule:23} {count:10}", file=sys.stderr)
+
+  if arguments.output != None:
+    with open(arguments.output, "w", encoding="utf-8") as file:
+      file.write("\n".join(assemblyCode))
+  elif not arguments.run:
+    print("\n".join(assemblyCode))
+
+  if arguments.run:
+    simulator = MipsSimulator(assemblyCode, sys.stdin.read().splitlines() if not sys.stdin.isatty() else [])
+    print(simulator.run(), end="")
+    runStats = simulator.getStats()
+    for name in ("instructions", "loads", "stores", "syscalls", "heapBytes"):
+      print(f"{name:25} {runStats[name]:10}", file=sys.stderr)
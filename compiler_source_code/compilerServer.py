@@ -0,0 +1,249 @@
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from compiler import executeCompilation
+from CompilerOptions import CompilerOptions, optimizationLevels
+from CompilationStats import CompilationStats
+from Errors import CompilerError
+from ParserStateCache import ParserStateCache
+
+# Tiempo máximo de una compilación en el servidor, en segundos
+compilationTimeout = 300
+
+# Opciones de CompilerOptions que una solicitud puede modificar, con su tipo. Solo afectan el código generado;
+# las rutas de archivos (estado del parser y caché de compilaciones) solo se indican al iniciar el servidor
+requestOptionTypes = {
+  "taggedValues": bool, "inlineFastPaths": bool, "typeInference": bool, "specializeFunctions": bool,
+  "specializationBudget": int, "inlineFunctions": bool, "inlineThreshold": int, "tailCalls": bool,
+  "fuseComparisonBranches": bool, "jumpCodeConditions": bool, "eliminateDeadCode": bool,
+  "eliminateCommonSubexpressions": bool, "propagateCopies": bool, "hoistLoopInvariants": bool,
+  "reduceStrength": bool, "peepholeOptimization": bool, "peepholeWindow": int, "verifyPasses": bool,
+  "recursiveDescentParser": bool, "regexLexer": bool,
+}
+
+def serializeError(error):
+  """
+  Convierte un error de compilación (CompilerError o el mensaje de una excepción) a un dict serializable a JSON.
+  """
+  if isinstance(error, CompilerError):
+    return {
+      "type": type(error).__name__, "message": error.message,
+      "line": getattr(error, "line", None), "column": getattr(error, "column", None),
+    }
+  return {"type": "Exception", "message": str(error), "line": None, "column": None}
+
+def getRequestOptions(request):
+  """
+  Valida el nivel de optimización y las opciones de una solicitud (ver requestOptionTypes).
+  Lanza ValueError si el nivel no existe, si una opción no se puede modificar o si su valor no es del tipo esperado.
+  @return (nivel de optimización, dict de opciones)
+  """
+  optimizationLevel = request.get("optimizationLevel", 0)
+  if type(optimizationLevel) != int or optimizationLevel not in optimizationLevels:
+    raise ValueError(f"Nivel de optimización inválido: {optimizationLevel!r}.")
+
+  options = request.get("options", {})
+  if not isinstance(options, dict):
+    raise ValueError("options debe ser un objeto JSON.")
+
+  for name, value in options.items():
+    if name not in requestOptionTypes:
+      raise ValueError(f"La opción '{name}' no se puede modificar en una solicitud.")
+    if type(value) != requestOptionTypes[name]:
+      raise ValueError(f"La opción '{name}' debe ser de tipo {requestOptionTypes[name].__name__}.")
+
+  return optimizationLevel, options
+
+def initializeWorker(parserStatePath):
+  """
+  Inicializa un proceso del pool: carga el estado guardado del parser de ANTLR, si se indicó.
+  Los módulos del compilador ya están importados en el proceso del servidor.
+  """
+  if parserStatePath != None:
+    ParserStateCache(parserStatePath).load()
+
+def compileRequest(request, parserStatePath=None, compileCachePath=None):
+  """
+  Compila una solicitud en un proceso del pool. Todo el estado de la compilación (tabla de símbolos, errores,
+  generadores de código) se crea dentro de executeCompilation, por lo que las solicitudes no comparten estado.
+  Solo se conservan entre solicitudes los módulos importados y el DFA del parser de ANTLR.
+
+  @param request: dict - {"source": código} o {"path": ruta del archivo}, y opcionalmente
+    "optimizationLevel" (0, 1 o 2), "options" (opciones de requestOptionTypes, reemplazan las del nivel) y
+    "stats" (true para incluir las estadísticas por fase, ver CompilationStats).
+  @param parserStatePath, compileCachePath: Rutas indicadas al iniciar el servidor (ver CompilerOptions).
+  @return dict - {"hasErrors", "errors", "assembly", "seconds"} y "stats" si se solicitaron.
+  """
+  start = time.perf_counter()
+  optimizationLevel, requestOptions = getRequestOptions(request)
+  options = CompilerOptions.fromOptimizationLevel(optimizationLevel, parserStatePath=parserStatePath,
+                                                  compileCachePath=compileCachePath, **requestOptions)
+
+  stats = CompilationStats() if request.get("stats") else None
+
+  # El análisis semántico muestra la tabla de símbolos en la salida estándar
+  with contextlib.redirect_stdout(io.StringIO()):
+    hasErrors, errors, assemblyCode = executeCompilation(request.get("path", "<source>"), options, source=request.get("source"), stats=stats)
+
+  response = {
+    "hasErrors": hasErrors,
+    "errors": [serializeError(error) for error in errors],
+    "assembly": "\n".join(assemblyCode) if assemblyCode != None else None,
+    "seconds": time.perf_counter() - start,
+  }
+  if stats != None:
+    response["stats"] = stats.toDict()
+  return response
+
+class CompilerRequestHandler(socketserver.StreamRequestHandler):
+
+  def handle(self):
+    """
+    Atiende una conexión: cada línea es una solicitud en JSON y se responde con una línea en JSON.
+    Una solicitud {"command": "ping"} responde {"ok": true}. Las demás se compilan en el pool de procesos
+    (ver compileRequest). Si la solicitud incluye "id", se repite en la respuesta.
+    """
+    for line in self.rfile:
+      if line.strip() == b"":
+        continue
+
+      response = self.server.processRequest(line)
+      self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+      self.wfile.flush()
+
+class CompilerServerMixin:
+
+  daemon_threads = True
+
+  def initializeCompiler(self, workers, parserStatePath, compileCachePath):
+    self.parserStatePath = parserStatePath
+    self.compileCachePath = compileCachePath
+    self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=initializeWorker, initargs=(parserStatePath,))
+
+    # Los procesos se crean antes de atender conexiones, mientras el servidor tiene un solo hilo
+    self.pool.submit(time.sleep, 0).result()
+
+  def processRequest(self, line):
+    try:
+      request = json.loads(line)
+      if not isinstance(request, dict):
+        raise ValueError("La solicitud debe ser un objeto JSON.")
+    except ValueError as e:
+      return {"error": f"Solicitud inválida: {e}"}
+
+    if request.get("command") == "ping":
+      response = {"ok": True}
+    elif "source" not in request and "path" not in request:
+      response = {"error": "La solicitud debe incluir source o path."}
+    else:
+      try:
+        getRequestOptions(request)
+      except ValueError as e:
+        return self.addRequestId(request, {"error": f"Solicitud inválida: {e}"})
+
+      try:
+        future = self.pool.submit(compileRequest, request, self.parserStatePath, self.compileCachePath)
+        response = future.result(timeout=compilationTimeout)
+      except Exception as e:
+        response = {"error": str(e)}
+
+    return self.addRequestId(request, response)
+
+  def addRequestId(self, request, response):
+    if "id" in request:
+      response["id"] = request["id"]
+    return response
+
+  def server_close(self):
+    super().server_close()
+    self.pool.shutdown(cancel_futures=True)
+
+class UnixCompilerServer(CompilerServerMixin, socketserver.ThreadingUnixStreamServer):
+
+  def server_close(self):
+    super().server_close()
+    if os.path.exists(self.server_address):
+      os.remove(self.server_address)
+
+class TcpCompilerServer(CompilerServerMixin, socketserver.ThreadingTCPServer):
+  allow_reuse_address = True
+
+def createServer(socketPath=None, port=None, workers=None, parserStatePath=None, compileCachePath=None):
+  """
+  Crea el servidor de compilación, escuchando en un socket Unix (socketPath) o en localhost:port.
+  Cada conexión se atiende en un hilo y las compilaciones se ejecutan en un pool de workers procesos,
+  que conservan los módulos importados y el DFA del parser entre solicitudes.
+  El estado del parser y la caché de compilaciones de todas las solicitudes son los indicados aquí.
+  """
+  if socketPath != None:
+    if os.path.exists(socketPath):
+      os.remove(socketPath)
+    server = UnixCompilerServer(socketPath, CompilerRequestHandler)
+  else:
+    server = TcpCompilerServer(("127.0.0.1", port), CompilerRequestHandler)
+
+  server.initializeCompiler(workers, parserStatePath, compileCachePath)
+  return server
+
+def sendRequest(request, socketPath=None, port=None):
+  """
+  Envía una solicitud al servidor y devuelve la respuesta (dict).
+  """
+  if socketPath != None:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(socketPath)
+  else:
+    connection = socket.create_connection(("127.0.0.1", port))
+
+  with connection, connection.makefile("rwb") as stream:
+    stream.write(json.dumps(request).encode("utf-8") + b"\n")
+    stream.flush()
+    return json.loads(stream.readline())
+
+if __name__ == "__main__":
+  argumentParser = argparse.ArgumentParser(description="Servidor de compilación de Compiscript.")
+  argumentParser.add_argument("mode", choices=("serve", "compile"), help="Iniciar el servidor o enviarle un archivo para compilar.")
+  argumentParser.add_argument("file", nargs="?", help="Archivo a compilar (modo compile).")
+  address = argumentParser.add_mutually_exclusive_group(required=True)
+  address.add_argument("--socket", dest="socketPath", help="Ruta del socket Unix.")
+  address.add_argument("--port", type=int, help="Puerto en localhost.")
+  argumentParser.add_argument("--workers", type=int, default=None, help="Cantidad de procesos de compilación (modo serve).")
+  argumentParser.add_argument("--parser-state", dest="parserStatePath", help="Archivo del estado del parser de ANTLR (ver ParserStateCache).")
+  argumentParser.add_argument("--cache", dest="compileCachePath", help="Directorio de la caché de compilaciones (modo serve).")
+  argumentParser.add_argument("-O", dest="optimizationLevel", type=int, choices=(0, 1, 2), default=0, help="Nivel de optimización (modo compile).")
+  arguments = argumentParser.parse_intermixed_args()
+
+  if arguments.mode == "serve":
+    server = createServer(arguments.socketPath, arguments.port, arguments.workers, arguments.parserStatePath,
+                          arguments.compileCachePath)
+
+    # SIGTERM detiene el servidor igual que Ctrl+C, cerrando el socket y el pool
+    signal.signal(signal.SIGTERM, lambda signalNumber, frame: sys.exit(0))
+    with server:
+      try:
+        server.serve_forever()
+      except KeyboardInterrupt:
+        pass
+    sys.exit(0)
+
+  if arguments.file == None:
+    argumentParser.error("compile requiere un archivo.")
+
+  response = sendRequest({"path": os.path.abspath(arguments.file), "optimizationLevel": arguments.optimizationLevel},
+                         arguments.socketPath, arguments.port)
+  if "error" in response:
+    print(response["error"], file=sys.stderr)
+    sys.exit(1)
+  if response["hasErrors"]:
+    for error in response["errors"]:
+      print(f"{error['type']}: {error['message']} (línea {error['line']}, columna {error['column']})", file=sys.stderr)
+    sys.exit(1)
+  print(response["assembly"])
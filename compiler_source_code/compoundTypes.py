@@ -1,7 +1,6 @@
 from DataType import DataType, TypesNames
 from primitiveTypes import AnyType, NilType
 import copy
-import uuid
 
 class UnionType(DataType):
   def __init__(self, *types):
@@ -67,7 +66,11 @@ class ArrayType(DataType):
 
 class FunctionType:
   
-    def __init__(self, name):
+    def __init__(self, name, id):
+      """
+      name: nombre de la función
+      id: id único de la función en la compilación (ver SymbolGenerator.newFunctionId)
+      """
       self.name = name
       self.params = []
       self.bodyScope = None
@@ -75,7 +78,7 @@ class FunctionType:
       self.returnTypeHasChanged = False
       self.blockReturnTypeChange = False
       self.isMethod = False
-      self.id = uuid.uuid4().hex[:6]
+      self.id = id
       
     def getFunctionLevel(self):
       """
@@ -244,8 +247,8 @@ class ClassType(DataType):
       return None
     return self.parent.bodyScope
   
-  def addConstructor(self):
-    funcDef = FunctionType("init")
+  def addConstructor(self, functionId):
+    funcDef = FunctionType("init", functionId)
     funcDef.setIsMethod(True) # Marcar que es un método
     self.constructor = funcDef
     return funcDef
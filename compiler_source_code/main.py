@@ -59,7 +59,7 @@ def main():
         print("\n\nCódigo intermedio:\n", "\n".join([str(line) for line in code]), sep="")
         
         print("\n\nIniciando traducción...")
-        assemblyGenerator = AssemblyGenerator(code)
+        assemblyGenerator = AssemblyGenerator(code, symbolGenerator=semantic_checker.symbolTable.symbolGenerator)
         stringCode = "\n".join(assemblyGenerator.getCode())
         
         copyToClipboard(stringCode)
@@ -0,0 +1,79 @@
+from compoundTypes import ObjectType
+from primitiveTypes import IntType, FloatType
+from IntermediateCodeInstruction import ConditionalInstruction
+from IntermediateCodeTokens import REGISTER_FREE, GHOST_REGISTER_FREE
+from Offset import Offset
+from optimizations.TypeInference import getStaticType
+from optimizations.IntermediateCodeUtils import comparisonOperators
+
+class ComparisonBranchFusion:
+
+  def __init__(self, code) -> None:
+    """
+    Fusión de comparaciones con saltos condicionales.
+
+    Las condiciones de if, while y for generan t = a < b seguido de IF t == 0 GOTO L, por lo que el
+    generador de assembly guarda el bool en memoria y luego vuelve a compararlo con cero.
+    Si el temporal solo se utiliza en el salto, ambas instrucciones se reemplazan por un salto que
+    realiza la comparación directamente (IF NOT a < b GOTO L).
+
+    Solo se fusionan comparaciones entre valores numéricos de tipo conocido (int, bool, nil o float), incluyendo
+    propiedades (Offset), que se traducen a una instrucción de salto (blt, bge, c.lt.s + bc1f, ...). Entre la
+    comparación y el salto solo puede haber liberaciones de registros (REGISTER_FREE, GHOST_REGISTER_FREE), que
+    no modifican los operandos; el salto fusionado los carga sin actualizar los descriptores.
+
+    @param code: Lista de instrucciones de código intermedio. Cada salto fusionado reemplaza al salto original
+      y la comparación se elimina de la misma lista.
+    """
+    self.code = code
+    self.fuseComparisons()
+
+  def getCode(self):
+    return self.code
+
+  def countUses(self):
+    """
+    Devuelve {objeto: cantidad de apariciones en el código}.
+    """
+    uses = {}
+    for instruction in self.code:
+      for attribute in ("arg1", "arg2", "result"):
+        value = getattr(instruction, attribute, None)
+        if isinstance(value, ObjectType):
+          uses[value] = uses.get(value, 0) + 1
+    return uses
+
+  def isNumericOperand(self, value):
+    return isinstance(value, (ObjectType, Offset)) and getStaticType(value.type) in (IntType, FloatType)
+
+  def fuseComparisons(self):
+    uses = self.countUses()
+    fusedIndexes = set()
+
+    for index, instruction in enumerate(self.code):
+      if getattr(instruction, "operator", None) not in comparisonOperators or isinstance(instruction, ConditionalInstruction):
+        continue
+
+      temp = instruction.result
+      if uses.get(temp, 0) != 2:
+        continue
+      if not self.isNumericOperand(instruction.arg1) or not self.isNumericOperand(instruction.arg2):
+        continue
+
+      # El salto debe seguir a la comparación, después de las liberaciones de registros
+      jumpIndex = index + 1
+      while jumpIndex < len(self.code) and getattr(self.code[jumpIndex], "operator", None) in (REGISTER_FREE, GHOST_REGISTER_FREE):
+        jumpIndex += 1
+      if jumpIndex >= len(self.code):
+        continue
+
+      jump = self.code[jumpIndex]
+      if not isinstance(jump, ConditionalInstruction) or jump.operator != None or jump.arg1 != temp:
+        continue
+
+      # Reemplazar salto por la comparación con salto
+      self.code[jumpIndex] = ConditionalInstruction(arg1=instruction.arg1, arg2=instruction.arg2, operator=instruction.operator,
+                                                    branchIfFalse=jump.branchIfFalse, goToLabel=jump.goToLabel)
+      fusedIndexes.add(index)
+
+    self.code[:] = [instruction for index, instruction in enumerate(self.code) if index not in fusedIndexes]
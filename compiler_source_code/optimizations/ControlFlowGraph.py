@@ -0,0 +1,203 @@
+from IntermediateCodeInstruction import ConditionalInstruction
+from IntermediateCodeTokens import FUNCTION, END_FUNCTION, RETURN, LABEL, GOTO
+
+# Bloque virtual que precede al inicio del código global y de cada función
+ENTRY = -1
+
+class ControlFlowGraph:
+
+  def __init__(self, code) -> None:
+    """
+    Grafo de flujo de bloques básicos del código intermedio, con sus dominadores.
+
+    Un bloque inicia en una etiqueta, al inicio del cuerpo de una función o después de un salto, RETURN,
+    FUNCTION o END_FUNCTION. La declaración de una función (FUNCTION) salta al final de su cuerpo,
+    y el cuerpo se alcanza desde el bloque virtual ENTRY, al igual que el inicio del código global.
+
+    @param code: Lista de instrucciones de código intermedio. No se modifica.
+    """
+    self.code = code
+
+    self.blocks = [] # [(índice de la primera instrucción, índice después de la última)]
+    self.blockOf = {} # índice de instrucción inicial -> número de bloque
+    self.successors = {ENTRY: []}
+    self.predecessors = {ENTRY: []}
+
+    self.dominators = {} # bloque -> dominador inmediato
+    self.dominatorTree = {} # bloque -> bloques que domina inmediatamente
+    self.dominanceFrontiers = {}
+
+    self.buildBlocks()
+    self.computeDominators()
+    self.computeDominanceFrontiers()
+
+  def getFunctionEnds(self):
+    ends = {}
+    activeFunctions = []
+    for index, instruction in enumerate(self.code):
+      operator = getattr(instruction, "operator", None)
+      if operator == FUNCTION:
+        activeFunctions.append(index)
+      elif operator == END_FUNCTION:
+        ends[activeFunctions.pop()] = index
+    return ends
+
+  def isBlockEnd(self, instruction):
+    return isinstance(instruction, ConditionalInstruction) or getattr(instruction, "operator", None) in (GOTO, RETURN, FUNCTION, END_FUNCTION)
+
+  def buildBlocks(self):
+    ends = self.getFunctionEnds()
+    labels = {}
+    leaders = set([0]) if len(self.code) > 0 else set()
+
+    for index, instruction in enumerate(self.code):
+      if isinstance(instruction, ConditionalInstruction):
+        leaders.add(index + 1)
+      elif getattr(instruction, "operator", None) == LABEL:
+        labels[instruction.arg1] = index
+        leaders.add(index)
+      elif self.isBlockEnd(instruction):
+        leaders.add(index + 1)
+
+    leaders = sorted(leader for leader in leaders if leader < len(self.code))
+    for number, start in enumerate(leaders):
+      end = leaders[number + 1] if number + 1 < len(leaders) else len(self.code)
+      self.blocks.append((start, end))
+      self.blockOf[start] = number
+      self.successors[number] = []
+      self.predecessors[number] = []
+
+    def addEdge(source, targetIndex):
+      if targetIndex >= len(self.code):
+        return
+      target = self.blockOf[targetIndex]
+      if target in self.successors[source]:
+        return
+      self.successors[source].append(target)
+      self.predecessors[target].append(source)
+
+    if len(self.blocks) > 0:
+      addEdge(ENTRY, 0)
+    for start in ends:
+      addEdge(ENTRY, start + 1)
+
+    for number, (start, end) in enumerate(self.blocks):
+      last = self.code[end - 1]
+      operator = getattr(last, "operator", None)
+
+      if isinstance(last, ConditionalInstruction):
+        addEdge(number, end)
+        addEdge(number, labels[last.goToLabel])
+      elif operator == FUNCTION:
+        # La declaración salta sobre el cuerpo de la función
+        addEdge(number, ends[end - 1] + 1)
+      elif operator == GOTO:
+        addEdge(number, labels[last.arg1])
+      elif operator not in (RETURN, END_FUNCTION):
+        addEdge(number, end)
+
+  def getReversePostorder(self):
+    """
+    Devuelve los bloques alcanzables desde ENTRY en orden postorden inverso.
+    """
+    order = []
+    visited = set([ENTRY])
+    stack = [(ENTRY, iter(self.successors[ENTRY]))]
+
+    while len(stack) > 0:
+      block, successors = stack[-1]
+      nextBlock = next(successors, None)
+
+      if nextBlock == None:
+        stack.pop()
+        order.append(block)
+      elif nextBlock not in visited:
+        visited.add(nextBlock)
+        stack.append((nextBlock, iter(self.successors[nextBlock])))
+
+    order.reverse()
+    return order
+
+  def computeDominators(self):
+    """
+    Calcula los dominadores inmediatos con el algoritmo iterativo de Cooper, Harvey y Kennedy.
+    """
+    order = self.getReversePostorder()
+    position = {block: number for number, block in enumerate(order)}
+    self.reversePostorder = order[1:] # Sin ENTRY
+
+    dominators = {ENTRY: ENTRY}
+
+    def intersect(block1, block2):
+      while block1 != block2:
+        while position[block1] > position[block2]:
+          block1 = dominators[block1]
+        while position[block2] > position[block1]:
+          block2 = dominators[block2]
+      return block1
+
+    changed = True
+    while changed:
+      changed = False
+      for block in self.reversePostorder:
+        processedPredecessors = [predecessor for predecessor in self.predecessors[block] if predecessor in dominators]
+        newDominator = processedPredecessors[0]
+        for predecessor in processedPredecessors[1:]:
+          newDominator = intersect(predecessor, newDominator)
+
+        if dominators.get(block) != newDominator:
+          dominators[block] = newDominator
+          changed = True
+
+    self.dominators = dominators
+    self.dominatorTree = {block: [] for block in order}
+    for block in self.reversePostorder:
+      self.dominatorTree[dominators[block]].append(block)
+
+  def computeDominanceFrontiers(self):
+    self.dominanceFrontiers = {block: set() for block in self.dominators}
+
+    for block in self.reversePostorder:
+      predecessors = [predecessor for predecessor in self.predecessors[block] if predecessor in self.dominators]
+      if len(predecessors) < 2:
+        continue
+
+      for predecessor in predecessors:
+        runner = predecessor
+        while runner != self.dominators[block]:
+          self.dominanceFrontiers[runner].add(block)
+          runner = self.dominators[runner]
+
+  def isReachable(self, block):
+    return block in self.dominators
+
+  def dominates(self, block1, block2):
+    """
+    Indica si block1 domina a block2: todo camino desde ENTRY hacia block2 pasa por block1.
+    """
+    while block2 != block1 and block2 != ENTRY:
+      block2 = self.dominators[block2]
+    return block2 == block1
+
+  def getNaturalLoops(self):
+    """
+    Devuelve {bloque de encabezado: bloques del ciclo natural}.
+    Una arista block -> header es de retorno si header domina a block. El ciclo natural son los bloques desde
+    los que se llega a block sin pasar por header. Los ciclos con el mismo encabezado se unen.
+    """
+    loops = {}
+    for block in self.reversePostorder:
+      for header in self.successors[block]:
+        if not self.dominates(header, block):
+          continue
+
+        loop = loops.setdefault(header, set([header]))
+        pending = [block]
+        while len(pending) > 0:
+          current = pending.pop()
+          if current in loop or not self.isReachable(current):
+            continue
+          loop.add(current)
+          pending += self.predecessors[current]
+
+    return loops
@@ -0,0 +1,171 @@
+import copy
+from compoundTypes import ObjectType
+from IntermediateCodeTokens import ASSIGN, STRICT_ASSIGN, CALL
+from Offset import Offset
+from optimizations.ControlFlowGraph import ControlFlowGraph, ENTRY
+from optimizations.IntermediateCodeUtils import isTemporary, getReads, getSharedObjects, sharingUseOperators
+
+class CopyPropagation:
+
+  def __init__(self, code) -> None:
+    """
+    Propagación de copias y unión de variables con temporales.
+
+    Casi todas las asignaciones del código fuente generan un temporal con el valor y luego x = ASSIGN t
+    o x = STRICT_ASSIGN t.
+    - Si x se define una sola vez (x = ASSIGN t) y t solo se utiliza en esa asignación, x se reemplaza
+      por t en todo el programa y se elimina la asignación (x y t ocupan la misma posición).
+    - Después de x = ASSIGN t o x = STRICT_ASSIGN t, las lecturas de x en el mismo bloque básico extendido
+      del grafo de flujo leen t, mientras x no se modifique ni cambie la memoria (llamadas o asignaciones a
+      variables y propiedades).
+    - Se eliminan las asignaciones ASSIGN a variables que ya no se leen.
+
+    Solo se propagan temporales con una única definición, que no se pasan como argumento ni se retornan.
+
+    @param code: Lista de instrucciones de código intermedio. Las lecturas reemplazadas y las asignaciones
+      eliminadas se aplican sobre la misma lista.
+    """
+    self.code = code
+
+    self.coalesceCopies()
+    self.propagateCopies()
+    self.removeDeadCopies()
+
+  def getCode(self):
+    return self.code
+
+  def collectProgramInfo(self):
+    """
+    Devuelve ({objeto: [instrucciones que lo definen]}, {objeto: cantidad de lecturas}, objetos compartidos).
+    """
+    definitions = {}
+    reads = {}
+
+    for instruction in self.code:
+      result = getattr(instruction, "result", None)
+      if isinstance(result, ObjectType):
+        definitions.setdefault(result, []).append(instruction)
+
+      for value in getReads(instruction):
+        reads[value] = reads.get(value, 0) + 1
+
+    return definitions, reads, getSharedObjects(self.code)
+
+  def isPropagableTemporary(self, value, definitions, sharedObjects):
+    return isTemporary(value) and len(definitions.get(value, [])) == 1 and value not in sharedObjects
+
+  def replaceValue(self, value, replacements):
+    """
+    Reemplaza los objetos de un valor según replacements, conservando el tipo de la aparición.
+    """
+    if isinstance(value, ObjectType) and value in replacements:
+      replacement = replacements[value].copy()
+      replacement.type = value.type
+      return replacement
+
+    if isinstance(value, Offset):
+      base, offset = self.replaceValue(value.base, replacements), self.replaceValue(value.offset, replacements)
+      if base is not value.base or offset is not value.offset:
+        return Offset(base, offset, value.type)
+
+    return value
+
+  def replaceReads(self, instruction, replacements, replaceShared=True):
+    """
+    Devuelve la instrucción con las lecturas reemplazadas (una copia si se modifica).
+    """
+    if not replaceShared and getattr(instruction, "operator", None) in sharingUseOperators:
+      return instruction
+
+    replacedInstruction = instruction
+    for attribute in ("arg1", "arg2", "result"):
+      value = getattr(instruction, attribute, None)
+      if attribute == "result" and isinstance(value, ObjectType):
+        continue
+
+      replacement = self.replaceValue(value, replacements)
+      if replacement is not value:
+        if replacedInstruction is instruction:
+          replacedInstruction = copy.copy(instruction)
+        setattr(replacedInstruction, attribute, replacement)
+
+    return replacedInstruction
+
+  def coalesceCopies(self):
+    """
+    Une las variables con una sola definición x = ASSIGN t con el temporal t.
+    """
+    definitions, reads, sharedObjects = self.collectProgramInfo()
+    replacements = {}
+    removedInstructions = set()
+
+    for object, objectDefinitions in definitions.items():
+      if isTemporary(object) or len(objectDefinitions) != 1:
+        continue
+
+      instruction = objectDefinitions[0]
+      value = instruction.arg1
+      if instruction.operator != ASSIGN or not self.isPropagableTemporary(value, definitions, sharedObjects) or reads.get(value) != 1:
+        continue
+
+      replacements[object] = value
+      removedInstructions.add(id(instruction))
+
+    if len(replacements) == 0:
+      return
+
+    self.code[:] = [self.replaceReads(instruction, replacements) for instruction in self.code if id(instruction) not in removedInstructions]
+
+  def propagateCopies(self):
+    """
+    Reemplaza las lecturas de variables por el temporal asignado, dentro de cada bloque básico extendido:
+    las copias del final de un bloque continúan en los sucesores que solo tienen a ese bloque como predecesor.
+    """
+    definitions, _, sharedObjects = self.collectProgramInfo()
+    cfg = ControlFlowGraph(self.code)
+    blockCopies = {} # bloque -> {variable: temporal con su valor} al final del bloque
+
+    for block in cfg.reversePostorder:
+      predecessors = cfg.predecessors[block]
+      copies = {}
+      if len(predecessors) == 1 and predecessors[0] != ENTRY:
+        copies = dict(blockCopies.get(predecessors[0], {}))
+
+      start, end = cfg.blocks[block]
+      for index in range(start, end):
+        instruction = self.code[index]
+        operator = getattr(instruction, "operator", None)
+
+        if len(copies) > 0:
+          instruction = self.replaceReads(instruction, copies, replaceShared=False)
+          self.code[index] = instruction
+
+        result = getattr(instruction, "result", None)
+
+        if isinstance(result, ObjectType):
+          copies.pop(result, None)
+
+          # Las asignaciones a variables pueden modificar el valor de otra variable que comparte el heap
+          if not isTemporary(result) and operator != ASSIGN:
+            copies.clear()
+
+          if operator in (ASSIGN, STRICT_ASSIGN) and not isTemporary(result) and self.isPropagableTemporary(instruction.arg1, definitions, sharedObjects):
+            copies[result] = instruction.arg1
+
+        elif isinstance(result, Offset) or operator == CALL:
+          copies.clear()
+
+      blockCopies[block] = copies
+
+  def removeDeadCopies(self):
+    """
+    Elimina las asignaciones ASSIGN a objetos que no se leen y que solo se definen con ASSIGN.
+    """
+    definitions, reads, _ = self.collectProgramInfo()
+    removedInstructions = set()
+
+    for object, objectDefinitions in definitions.items():
+      if reads.get(object, 0) == 0 and all(instruction.operator == ASSIGN for instruction in objectDefinitions):
+        removedInstructions.update(id(instruction) for instruction in objectDefinitions)
+
+    self.code[:] = [instruction for instruction in self.code if id(instruction) not in removedInstructions]
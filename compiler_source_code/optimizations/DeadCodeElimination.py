@@ -0,0 +1,165 @@
+from compoundTypes import ObjectType, FunctionType
+from primitiveTypes import IntType, FloatType
+from IntermediateCodeInstruction import SingleInstruction
+from IntermediateCodeTokens import STORE, ASSIGN, STRICT_ASSIGN, GET_ARG, WORD_COPY, CLEAR, FUNCTION, END_FUNCTION, REGISTER_RESET
+from Value import Value
+from optimizations.TypeInference import getStaticType
+from optimizations.ControlFlowGraph import ControlFlowGraph
+from optimizations.IntermediateCodeUtils import getReadValues, numericOperators, sharingDefinitionOperators
+
+copyOperators = (STORE, ASSIGN, STRICT_ASSIGN, WORD_COPY, CLEAR, GET_ARG)
+
+class DeadCodeElimination:
+
+  def __init__(self, code) -> None:
+    """
+    Eliminación de código muerto sobre el grafo de flujo del código intermedio.
+
+    - Funciones que no se llaman ni se utilizan como valor en ninguna parte del programa.
+    - Bloques del grafo de flujo no alcanzables: código después de RETURN o GOTO (por ejemplo el STORE nil; RETURN
+      que se agrega al final de cada función) hasta una etiqueta a la que se salte.
+    - Definiciones sin efectos secundarios de objetos que nunca se leen (temporales sin uso).
+
+    Cada bloque no alcanzable se reemplaza por REGISTER_RESET, para que el generador de assembly
+    continúe con los descriptores vacíos (como al traducir el REGISTER_FREE del bloque), sin
+    generar el código para guardar los registros.
+
+    @param code: Lista de instrucciones de código intermedio. Las funciones, bloques y definiciones eliminados
+      se quitan de la misma lista.
+    """
+    self.code = code
+
+    changed = True
+    while changed:
+      changed = self.removeUnusedFunctions()
+      changed = self.removeUnreachableCode() or changed
+      changed = self.removeDeadDefinitions() or changed
+
+  def getCode(self):
+    return self.code
+
+  def removeUnusedFunctions(self):
+    """
+    Elimina las funciones a las que no se hace referencia fuera de su propio cuerpo.
+    Retorna True si se eliminó alguna función.
+    """
+    ends = ControlFlowGraph(self.code).getFunctionEnds()
+
+    # Nombre de función -> cantidad de referencias, sin contar las que están en su propio cuerpo
+    references = {}
+    activeFunctions = []
+    for instruction in self.code:
+      operator = getattr(instruction, "operator", None)
+
+      if operator == FUNCTION:
+        activeFunctions.append(instruction.arg1.getUniqueName())
+        continue
+      if operator == END_FUNCTION:
+        activeFunctions.pop()
+        continue
+
+      for attribute in ("arg1", "arg2", "result"):
+        for value in getReadValues(getattr(instruction, attribute, None), (ObjectType, FunctionType)):
+          if isinstance(value, FunctionType) and value.getUniqueName() not in activeFunctions:
+            references[value.getUniqueName()] = references.get(value.getUniqueName(), 0) + 1
+
+    removedIndexes = set()
+    for start, end in ends.items():
+      if self.code[start].arg1.getUniqueName() not in references:
+        removedIndexes.update(range(start, end + 1))
+
+    if len(removedIndexes) == 0:
+      return False
+
+    self.code[:] = [instruction for index, instruction in enumerate(self.code) if index not in removedIndexes]
+    return True
+
+  def removeUnreachableCode(self):
+    """
+    Elimina los bloques que no son alcanzables desde el inicio del programa o de una función.
+    Las declaraciones de funciones (FUNCTION y END_FUNCTION) se conservan.
+    Retorna True si se eliminó alguna instrucción.
+    """
+    cfg = ControlFlowGraph(self.code)
+
+    code = []
+    removed = False
+    for number, (start, end) in enumerate(cfg.blocks):
+      if cfg.isReachable(number):
+        code += self.code[start:end]
+        continue
+
+      for instruction in self.code[start:end]:
+        operator = getattr(instruction, "operator", None)
+        if operator in (FUNCTION, END_FUNCTION):
+          code.append(instruction)
+          continue
+
+        # Reemplazar el bloque no alcanzable por un único REGISTER_RESET
+        if len(code) == 0 or getattr(code[-1], "operator", None) != REGISTER_RESET:
+          code.append(SingleInstruction(operator=REGISTER_RESET))
+        removed = removed or operator != REGISTER_RESET
+
+    self.code[:] = code
+    return removed
+
+  def isRemovableDefinition(self, instruction):
+    """
+    Indica si una instrucción solo define su resultado, sin efectos secundarios.
+    """
+    if not isinstance(instruction, SingleInstruction) or not isinstance(instruction.result, ObjectType):
+      return False
+
+    operator = instruction.operator
+    if operator in copyOperators:
+      return True
+
+    if operator in numericOperators:
+      # Las operaciones con operandos any pueden llamar a funciones del compilador (ej. concatenación o errores)
+      # Los operandos Value son inmediatos de desplazamientos y máscaras
+      operands = [operand for operand in (instruction.arg1, instruction.arg2) if operand != None and not isinstance(operand, Value)]
+      return all(isinstance(operand, ObjectType) and getStaticType(operand.type) in (IntType, FloatType) for operand in operands)
+
+    return False
+
+  def removeDeadDefinitions(self):
+    """
+    Elimina las definiciones de objetos que no se leen en ninguna parte del programa.
+    Solo se eliminan si todas las definiciones del objeto se pueden eliminar. Si el objeto comparte la memoria
+    de otro valor (GET_ARG, WORD_COPY), una asignación modificaría el otro valor, por lo que no se elimina.
+    Retorna True si se eliminó alguna instrucción.
+    """
+    removedAny = False
+
+    while True:
+      reads = set()
+      definitions = {} # objeto -> [índices de instrucciones que lo definen]
+
+      for index, instruction in enumerate(self.code):
+        for attribute in ("arg1", "arg2"):
+          reads.update(getReadValues(getattr(instruction, attribute, None), (ObjectType, FunctionType)))
+
+        result = getattr(instruction, "result", None)
+        if isinstance(result, ObjectType):
+          definitions.setdefault(result, []).append(index)
+        else:
+          reads.update(getReadValues(result, (ObjectType, FunctionType)))
+
+      removedIndexes = set()
+      for object, indexes in definitions.items():
+        if object in reads:
+          continue
+        if not all(self.isRemovableDefinition(self.code[index]) for index in indexes):
+          continue
+
+        sharingDefinitions = sum(1 for index in indexes if self.code[index].operator in sharingDefinitionOperators)
+        if sharingDefinitions not in (0, len(indexes)):
+          continue
+
+        removedIndexes.update(indexes)
+
+      if len(removedIndexes) == 0:
+        return removedAny
+
+      self.code[:] = [instruction for index, instruction in enumerate(self.code) if index not in removedIndexes]
+      removedAny = True
@@ -0,0 +1,217 @@
+import copy
+from compoundTypes import ObjectType
+from IntermediateCodeInstruction import SingleInstruction, ConditionalInstruction
+from IntermediateCodeTokens import FUNCTION, END_FUNCTION, CALL, PARAM, RETURN_VAL, RETURN, GET_ARG, LABEL, GOTO, REGISTER_FREE, WORD_COPY, CLEAR, STACK_POINTER, STATIC_POINTER
+from consts import MEM_ADDR_SIZE
+from Offset import Offset
+from optimizations.IntermediateCodeUtils import getCallArguments
+
+class FunctionInlining:
+
+  def __init__(self, code, symbolGenerator, threshold=20) -> None:
+    """
+    Sustitución (inlining) de funciones pequeñas en los puntos de llamada.
+
+    Una llamada PARAM...; CALL f; t = R se reemplaza por el cuerpo de f:
+    - Cada GET_ARG se reemplaza por la copia de la palabra del argumento (igual que PARAM + GET_ARG).
+    - Cada RETURN x se reemplaza por la copia de la palabra de x en t y un salto al final del cuerpo.
+    - Los objetos locales de f (de su frame) se reemplazan por objetos nuevos en el frame (o memoria
+      estática) de la función que realiza la llamada, y las etiquetas se renombran.
+
+    Los objetos de funciones externas (closures) no se modifican: el base pointer de un frame se busca
+    por nivel de función en la cadena dinámica, que desde el frame del llamador es la misma que desde
+    el frame de f (sin contar el de f).
+
+    Solo se sustituyen funciones que no son recursivas, que no contienen funciones anidadas y cuyo
+    cuerpo no supera el umbral de instrucciones. Las llamadas dentro de los cuerpos sustituidos se conservan.
+
+    @param code: Lista de instrucciones de código intermedio.
+    @param symbolGenerator: SymbolGenerator de la compilación, para los labels y scopes de cada sustitución.
+    @param threshold: Cantidad máxima de instrucciones del cuerpo de una función para sustituirla.
+    """
+    self.code = code
+    self.symbolGenerator = symbolGenerator
+    self.threshold = threshold
+
+    self.functions = self.getInlinableFunctions()
+    self.inlineCalls()
+
+  def getCode(self):
+    return self.code
+
+  def getInlinableFunctions(self):
+    """
+    Devuelve {nombre de función: (FunctionType, instrucciones del cuerpo)} de las funciones que se pueden sustituir.
+    """
+    functions = {}
+    activeFunctions = [] # [(FunctionType, índice de inicio)]
+
+    for index, instruction in enumerate(self.code):
+      operator = getattr(instruction, "operator", None)
+
+      if operator == FUNCTION:
+        activeFunctions.append((instruction.arg1, index))
+
+      elif operator == END_FUNCTION:
+        functionDef, start = activeFunctions.pop()
+        functionName = functionDef.getUniqueName()
+        body = self.code[start + 1:index]
+
+        if functionName in functions:
+          continue
+
+        hasNestedFunctions = any(getattr(i, "operator", None) == FUNCTION for i in body)
+        isRecursive = any(getattr(i, "operator", None) == CALL and i.arg1.getUniqueName() == functionName for i in body)
+        size = sum(1 for i in body if getattr(i, "operator", None) != GET_ARG)
+
+        if not hasNestedFunctions and not isRecursive and size <= self.threshold:
+          functions[functionName] = (functionDef, body)
+
+    return functions
+
+  def inlineCalls(self):
+    """
+    Reemplaza las llamadas a funciones que se pueden sustituir por el cuerpo de la función.
+    """
+    code = []
+    activeFunctions = [] # FunctionType de las funciones que contienen la instrucción actual
+    index = 0
+
+    while index < len(self.code):
+      instruction = self.code[index]
+      operator = getattr(instruction, "operator", None)
+
+      if operator == FUNCTION:
+        activeFunctions.append(instruction.arg1)
+      elif operator == END_FUNCTION:
+        activeFunctions.pop()
+
+      if operator != CALL or instruction.arg1.getUniqueName() not in self.functions:
+        code.append(instruction)
+        index += 1
+        continue
+
+      functionDef, body = self.functions[instruction.arg1.getUniqueName()]
+      arguments, firstParamIndex = getCallArguments(self.code, index)
+
+      if arguments == None or functionDef.getRealParamsNumber() != len(arguments) or \
+          any(not isinstance(argument, (ObjectType, Offset)) for argument in arguments):
+        code.append(instruction)
+        index += 1
+        continue
+
+      # Valor de retorno (si se utiliza)
+      nextInstruction = self.code[index + 1] if index + 1 < len(self.code) else None
+      returnDestination = nextInstruction.result if getattr(nextInstruction, "operator", None) == RETURN_VAL else None
+
+      callerDef = activeFunctions[-1] if len(activeFunctions) > 0 else None
+
+      # Quitar PARAM de la llamada y agregar cuerpo sustituido
+      del code[len(code) - (index - firstParamIndex):]
+      code += self.getInlinedBody(functionDef, body, arguments, returnDestination, callerDef)
+
+      index += 2 if returnDestination != None else 1
+
+    self.code[:] = code
+
+  def getInlinedBody(self, functionDef, body, arguments, returnDestination, callerDef):
+    """
+    Genera las instrucciones del cuerpo de functionDef para un punto de llamada.
+    @param callerDef: FunctionType de la función que realiza la llamada. None si es el código global.
+    """
+    inlineId = self.symbolGenerator.nextNumber("inline")
+    endLabel = f"inline_end_{functionDef.getUniqueName()}_{inlineId}"
+    functionLevel = functionDef.getFunctionLevel()
+
+    # Scope en el que se asignan los nuevos objetos locales: el cuerpo del llamador o el scope global
+    if callerDef != None:
+      callerScope = callerDef.bodyScope
+      basePointer = STACK_POINTER
+    else:
+      callerScope = functionDef.bodyScope
+      while callerScope.parent != None:
+        callerScope = callerScope.parent
+      basePointer = STATIC_POINTER
+
+    inlinedScopes = {} # id de scope original -> scope del llamador para sus objetos
+    inlinedObjects = {} # objeto original -> objeto en el llamador
+
+    def inlineValue(value):
+      if isinstance(value, ObjectType) and value.baseType == STACK_POINTER and value.getFunctionLevel() == functionLevel:
+        if value not in inlinedObjects:
+          if value.scope.id not in inlinedScopes:
+            inlinedScope = copy.copy(callerScope)
+            inlinedScope.id = self.symbolGenerator.newScopeId()
+            inlinedScopes[value.scope.id] = inlinedScope
+
+          inlinedObject = value.copy()
+          inlinedObject.scope = inlinedScopes[value.scope.id]
+          inlinedObject.assignOffset(callerScope.getOffset(), MEM_ADDR_SIZE, basePointer)
+          callerScope.setOffset(callerScope.getOffset() + MEM_ADDR_SIZE)
+          inlinedObjects[value] = inlinedObject
+
+        inlinedValue = value.copy()
+        inlinedObject = inlinedObjects[value]
+        inlinedValue.scope = inlinedObject.scope
+        inlinedValue.assignOffset(inlinedObject.offset, inlinedObject.size, inlinedObject.baseType)
+        return inlinedValue
+
+      if isinstance(value, Offset):
+        return Offset(inlineValue(value.base), inlineValue(value.offset), value.type)
+
+      return value
+
+    def inlineLabel(label):
+      return f"{label}_{inlineId}"
+
+    argumentsCode = []
+    clearCode = []
+    bodyCode = []
+
+    for instruction in body:
+      operator = getattr(instruction, "operator", None)
+
+      if operator == GET_ARG:
+        # Copiar la palabra del argumento en el parámetro
+        argumentsCode.append(SingleInstruction(operator=WORD_COPY, arg1=arguments[int(instruction.arg1)], result=inlineValue(instruction.result), operatorFirst=True))
+        continue
+
+      if operator == RETURN:
+        if returnDestination != None:
+          bodyCode.append(SingleInstruction(operator=WORD_COPY, arg1=inlineValue(instruction.arg1), result=returnDestination, operatorFirst=True))
+        bodyCode.append(SingleInstruction(operator=REGISTER_FREE))
+        bodyCode.append(SingleInstruction(operator=GOTO, arg1=endLabel))
+        continue
+
+      inlinedInstruction = copy.copy(instruction)
+
+      if operator in (LABEL, GOTO):
+        inlinedInstruction.arg1 = inlineLabel(instruction.arg1)
+      else:
+        for attribute in ("arg1", "arg2", "result"):
+          if hasattr(instruction, attribute):
+            setattr(inlinedInstruction, attribute, inlineValue(getattr(instruction, attribute)))
+
+      if isinstance(instruction, ConditionalInstruction):
+        inlinedInstruction.goToLabel = inlineLabel(instruction.goToLabel)
+
+      bodyCode.append(inlinedInstruction)
+
+    # El frame de una función inicia en cero: limpiar los objetos locales que no son parámetros,
+    # para que no reutilicen la memoria del heap de una ejecución anterior
+    parameters = set(instruction.result for instruction in argumentsCode)
+    for inlinedObject in inlinedObjects.values():
+      if inlinedObject not in parameters:
+        clearCode.append(SingleInstruction(operator=CLEAR, result=inlinedObject, operatorFirst=True))
+
+    # Quitar el último salto al final (el cuerpo siempre termina con un return)
+    if len(bodyCode) > 0 and getattr(bodyCode[-1], "operator", None) == GOTO and bodyCode[-1].arg1 == endLabel:
+      bodyCode.pop()
+
+    code = argumentsCode
+    code.append(SingleInstruction(operator=REGISTER_FREE)) # Como en una llamada, el cuerpo inicia sin registros
+    code += clearCode
+    code += bodyCode
+    code.append(SingleInstruction(operator=LABEL, arg1=endLabel))
+
+    return code
@@ -0,0 +1,192 @@
+import copy
+from compoundTypes import ObjectType
+from primitiveTypes import IntType, FloatType
+from IntermediateCodeInstruction import ConditionalInstruction
+from IntermediateCodeTokens import FUNCTION, END_FUNCTION, CALL, LABEL, GOTO, STACK_POINTER
+from Offset import Offset
+from optimizations.TypeInference import TypeInference, getStaticType
+from optimizations.IntermediateCodeUtils import getCallArguments
+
+maxClonesPerFunction = 4 # Máximo de versiones especializadas por función
+maxSpecializationRounds = 4 # Rondas de especialización (las llamadas dentro de clones pueden generar nuevas)
+
+signatureNames = {IntType: "int", FloatType: "float", None: "any"}
+
+class FunctionSpecialization:
+
+  def __init__(self, code, symbolGenerator, budget=1000) -> None:
+    """
+    Especialización (clonación) de funciones según los tipos de sus argumentos.
+
+    Por cada combinación de tipos numéricos de argumentos (firma) encontrada en las llamadas a una función,
+    se crea una copia del cuerpo de la función y las llamadas con esa firma se redirigen a la copia.
+    Luego se ejecuta la inferencia de tipos, por lo que cada copia queda con sus parámetros y operaciones
+    con tipo concreto. La función original se conserva para las llamadas con argumentos any.
+    Los parámetros con tipo de una copia se reciben en un bloque propio, por lo que la copia no modifica
+    los argumentos del llamador.
+
+    Solo se especializan funciones que no son métodos y que no contienen funciones anidadas.
+
+    @param code: Lista de instrucciones de código intermedio.
+    @param symbolGenerator: SymbolGenerator de la compilación, para los scopes de las copias.
+    @param budget: Cantidad máxima de instrucciones que se pueden agregar al programa con las copias.
+    """
+    self.code = code
+    self.symbolGenerator = symbolGenerator
+    self.budget = budget
+    self.clones = {} # nombre de función original -> {firma: FunctionType de la copia}
+    self.cloneNames = set() # Nombres de funciones que son copias
+
+    for _ in range(maxSpecializationRounds):
+      if not self.specializeCalls():
+        break
+      TypeInference(self.code)
+
+  def getCode(self):
+    return self.code
+
+  def getFunctionBodies(self):
+    """
+    Devuelve {nombre de función: (índice FUNCTION, índice END_FUNCTION, FunctionType, tiene funciones anidadas)}.
+    """
+    bodies = {}
+    activeFunctions = [] # [(nombre, índice de inicio)]
+
+    for index, instruction in enumerate(self.code):
+      operator = getattr(instruction, "operator", None)
+
+      if operator == FUNCTION:
+        activeFunctions.append((instruction.arg1.getUniqueName(), index))
+
+      elif operator == END_FUNCTION:
+        name, start = activeFunctions.pop()
+        hasNestedFunctions = any(getattr(self.code[i], "operator", None) == FUNCTION for i in range(start + 1, index))
+        bodies[name] = (start, index, instruction.arg1, hasNestedFunctions)
+
+    return bodies
+
+  def getCallSignature(self, callIndex):
+    """
+    Devuelve la tupla de tipos numéricos (IntType, FloatType o None si es any) de los argumentos de una llamada.
+    Retorna None si algún argumento no se encuentra justo antes del CALL.
+    """
+    arguments, _ = getCallArguments(self.code, callIndex)
+    if arguments == None:
+      return None
+
+    signature = []
+    for argument in arguments:
+      type = getStaticType(argument.type) if isinstance(argument, ObjectType) else None
+      signature.append(type if type in (IntType, FloatType) else None)
+
+    return tuple(signature)
+
+  def specializeCalls(self):
+    """
+    Redirige las llamadas con argumentos numéricos a la copia correspondiente a su firma, creando
+    las copias que hagan falta dentro del presupuesto. Retorna True si se modificó alguna llamada.
+    """
+    bodies = self.getFunctionBodies()
+    newClones = {} # nombre de función original -> [instrucciones de copias nuevas]
+    changed = False
+
+    for index, instruction in enumerate(self.code):
+      if getattr(instruction, "operator", None) != CALL:
+        continue
+
+      functionName = instruction.arg1.getUniqueName()
+      if functionName in self.cloneNames or functionName not in bodies:
+        continue
+
+      start, end, functionDef, hasNestedFunctions = bodies[functionName]
+      if functionDef.isMethod or hasNestedFunctions:
+        continue
+
+      signature = self.getCallSignature(index)
+      if signature == None or all(type == None for type in signature):
+        continue
+
+      clones = self.clones.setdefault(functionName, {})
+
+      if signature not in clones:
+        bodySize = end - start + 1
+        if len(clones) >= maxClonesPerFunction or bodySize > self.budget:
+          continue
+
+        self.budget -= bodySize
+        cloneDef, cloneCode = self.cloneFunction(start, end, functionDef, signature)
+        clones[signature] = cloneDef
+        self.cloneNames.add(cloneDef.getUniqueName())
+        newClones.setdefault(functionName, []).extend(cloneCode)
+
+      # Redirigir llamada a la copia
+      callInstruction = copy.copy(instruction)
+      callInstruction.arg1 = clones[signature]
+      self.code[index] = callInstruction
+      changed = True
+
+    # Agregar copias después del final de la función original
+    if len(newClones) > 0:
+      code = []
+      for instruction in self.code:
+        code.append(instruction)
+        if getattr(instruction, "operator", None) == END_FUNCTION:
+          code += newClones.get(instruction.arg1.getUniqueName(), [])
+      self.code[:] = code
+
+    return changed
+
+  def cloneFunction(self, start, end, functionDef, signature):
+    """
+    Crea una copia del cuerpo de una función. Los objetos locales (del frame de la función) se
+    copian con un nuevo scope para que sean distintos de los de la función original, y las etiquetas
+    se renombran. El frame de la copia es igual al de la original.
+    @return: (FunctionType de la copia, lista de instrucciones)
+    """
+    cloneDef = copy.copy(functionDef)
+    cloneDef.id = f"{functionDef.id}_{'_'.join(signatureNames[type] for type in signature)}"
+
+    functionLevel = functionDef.getFunctionLevel()
+    clonedScopes = {} # id de scope original -> scope de la copia
+
+    def cloneValue(value):
+      if isinstance(value, ObjectType) and value.baseType == STACK_POINTER and value.getFunctionLevel() == functionLevel:
+        if value.scope.id not in clonedScopes:
+          clonedScope = copy.copy(value.scope)
+          clonedScope.id = self.symbolGenerator.newScopeId()
+          clonedScopes[value.scope.id] = clonedScope
+
+        clonedValue = value.copy()
+        clonedValue.scope = clonedScopes[value.scope.id]
+        return clonedValue
+
+      if isinstance(value, Offset):
+        return Offset(cloneValue(value.base), cloneValue(value.offset), value.type)
+
+      return value
+
+    def cloneLabel(label):
+      return f"{label}_{cloneDef.id}"
+
+    cloneCode = []
+    for instruction in self.code[start:end + 1]:
+      clonedInstruction = copy.copy(instruction)
+      operator = getattr(instruction, "operator", None)
+
+      if operator in (FUNCTION, END_FUNCTION):
+        clonedInstruction.arg1 = cloneDef
+
+      elif operator in (LABEL, GOTO):
+        clonedInstruction.arg1 = cloneLabel(instruction.arg1)
+
+      else:
+        for attribute in ("arg1", "arg2", "result"):
+          if hasattr(instruction, attribute):
+            setattr(clonedInstruction, attribute, cloneValue(getattr(instruction, attribute)))
+
+      if isinstance(instruction, ConditionalInstruction):
+        clonedInstruction.goToLabel = cloneLabel(instruction.goToLabel)
+
+      cloneCode.append(clonedInstruction)
+
+    return cloneDef, cloneCode
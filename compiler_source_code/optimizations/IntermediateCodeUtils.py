@@ -0,0 +1,75 @@
+from compoundTypes import ObjectType
+from IntermediateCodeTokens import PLUS, MINUS, MULTIPLY, DIVIDE, MOD, SHIFT_LEFT, BIT_AND, NEG, NOT, EQUAL, NOT_EQUAL, LESS, LESS_EQUAL, GREATER, GREATER_EQUAL, PARAM, RETURN, GET_ARG, WORD_COPY
+from Offset import Offset
+
+# Funciones y constantes sobre instrucciones de código intermedio compartidas por los passes de optimización
+
+comparisonOperators = (EQUAL, NOT_EQUAL, LESS, LESS_EQUAL, GREATER, GREATER_EQUAL)
+
+# Operaciones aritméticas y comparaciones: sin efectos secundarios si sus operandos son números de tipo conocido
+numericOperators = (PLUS, MINUS, MULTIPLY, DIVIDE, MOD, SHIFT_LEFT, BIT_AND, NEG, NOT) + comparisonOperators
+
+# Operaciones numéricas que pueden terminar el programa con un error (división o módulo entre cero)
+divisionOperators = (DIVIDE, MOD)
+
+# Instrucciones con las que el valor de un objeto (dirección del heap) se comparte con otra función u otro objeto
+sharingUseOperators = (PARAM, RETURN, WORD_COPY)
+
+# Definiciones con las que un objeto comparte el valor del heap de otro objeto
+sharingDefinitionOperators = (GET_ARG, WORD_COPY)
+
+def isTemporary(value):
+  return isinstance(value, ObjectType) and value.name in value.scope.temporaries
+
+def getReadValues(value, valueTypes=ObjectType):
+  """
+  Devuelve los valores de tipo valueTypes que aparecen en un operando, incluyendo la base y el índice de un Offset.
+  """
+  if isinstance(value, Offset):
+    return getReadValues(value.base, valueTypes) + getReadValues(value.offset, valueTypes)
+  if isinstance(value, valueTypes):
+    return [value]
+  return []
+
+def getReads(instruction):
+  """
+  Devuelve los objetos que lee una instrucción: sus operandos y la base e índice de un Offset como destino.
+  """
+  reads = getReadValues(getattr(instruction, "arg1", None)) + getReadValues(getattr(instruction, "arg2", None))
+  result = getattr(instruction, "result", None)
+  if not isinstance(result, ObjectType):
+    reads += getReadValues(result)
+  return reads
+
+def getDefinition(instruction):
+  """
+  Devuelve el objeto que define una instrucción, o None.
+  """
+  result = getattr(instruction, "result", None)
+  return result if isinstance(result, ObjectType) else None
+
+def getCallArguments(code, callIndex):
+  """
+  Devuelve los argumentos de la llamada code[callIndex], en orden, y el índice del primer PARAM.
+  Los PARAM de una llamada se encuentran justo antes del CALL.
+  Retorna (None, None) si los PARAM no incluyen todos los argumentos de la llamada.
+  """
+  numParams = int(code[callIndex].arg2)
+  arguments = {}
+
+  paramIndex = callIndex - 1
+  while paramIndex >= 0 and getattr(code[paramIndex], "operator", None) == PARAM:
+    arguments[int(code[paramIndex].arg2)] = code[paramIndex].arg1
+    paramIndex -= 1
+
+  if len(arguments) != numParams or any(i not in arguments for i in range(numParams)):
+    return None, None
+
+  return [arguments[i] for i in range(numParams)], paramIndex + 1
+
+def getSharedObjects(code):
+  """
+  Devuelve los objetos cuyo valor se comparte con otra función u otro objeto (ver sharingUseOperators).
+  """
+  return set(instruction.arg1 for instruction in code
+             if getattr(instruction, "operator", None) in sharingUseOperators and isinstance(instruction.arg1, ObjectType))
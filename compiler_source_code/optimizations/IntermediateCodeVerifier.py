@@ -0,0 +1,108 @@
+from IntermediateCodeInstruction import ConditionalInstruction
+from IntermediateCodeTokens import FUNCTION, END_FUNCTION, LABEL, GOTO, PHI
+from optimizations.StaticSingleAssignment import StaticSingleAssignment
+from optimizations.IntermediateCodeUtils import isTemporary, getReads
+
+class IntermediateCodeVerifier:
+
+  def __init__(self, code) -> None:
+    """
+    Verifica las invariantes del código intermedio que los passes de optimización deben conservar:
+    - Cada FUNCTION tiene su END_FUNCTION.
+    - Cada etiqueta se define una sola vez y todos los saltos van a una etiqueta definida.
+    - Todo temporal que se define dentro de una función (o en el código global) se lee después de alguna
+      definición que domina la lectura (o de una PHI). Se verifica sobre la forma SSA: una lectura de la versión 0
+      significa que ninguna definición alcanza la lectura.
+    - La conversión a SSA y de regreso produce el mismo código.
+
+    @param code: Lista de instrucciones de código intermedio. No se modifica.
+    """
+    self.code = code
+    self.errors = []
+
+    self.verifyStructure()
+    if len(self.errors) == 0:
+      self.verifyTemporaries()
+
+  def getErrors(self):
+    return self.errors
+
+  def isValid(self):
+    return len(self.errors) == 0
+
+  def verifyStructure(self):
+    labels = set()
+    jumps = []
+    activeFunctions = []
+
+    for index, instruction in enumerate(self.code):
+      operator = getattr(instruction, "operator", None)
+
+      if isinstance(instruction, ConditionalInstruction):
+        jumps.append((index, instruction.goToLabel))
+      elif operator == LABEL:
+        if instruction.arg1 in labels:
+          self.errors.append(f"{index}: la etiqueta {instruction.arg1} se define más de una vez.")
+        labels.add(instruction.arg1)
+      elif operator == GOTO:
+        jumps.append((index, instruction.arg1))
+      elif operator == FUNCTION:
+        activeFunctions.append(index)
+      elif operator == END_FUNCTION:
+        if len(activeFunctions) == 0:
+          self.errors.append(f"{index}: END_FUNCTION sin FUNCTION.")
+        else:
+          activeFunctions.pop()
+      elif operator == PHI:
+        self.errors.append(f"{index}: PHI fuera de la forma SSA.")
+
+    for index in activeFunctions:
+      self.errors.append(f"{index}: FUNCTION sin END_FUNCTION.")
+
+    for index, label in jumps:
+      if label not in labels:
+        self.errors.append(f"{index}: salto a la etiqueta no definida {label}.")
+
+  def verifyTemporaries(self):
+    ssa = StaticSingleAssignment(self.code)
+    ssaCode = ssa.getCode()
+
+    # Temporales definidos en cada función (None para el código global)
+    definitions = {}
+    activeFunctions = [None]
+    for instruction in self.code:
+      operator = getattr(instruction, "operator", None)
+      if operator == FUNCTION:
+        activeFunctions.append(instruction.arg1.getUniqueName())
+        continue
+      if operator == END_FUNCTION:
+        activeFunctions.pop()
+        continue
+
+      result = getattr(instruction, "result", None)
+      if isTemporary(result):
+        definitions.setdefault(activeFunctions[-1], set()).add(result)
+
+    activeFunctions = [None]
+    for instruction in ssaCode:
+      operator = getattr(instruction, "operator", None)
+      if operator == FUNCTION:
+        activeFunctions.append(instruction.arg1.getUniqueName())
+        continue
+      if operator == END_FUNCTION:
+        activeFunctions.pop()
+        continue
+      if operator == PHI:
+        continue
+
+      for value in getReads(instruction):
+        if not ssa.isVersion(value) or not value.name.endswith(".0"):
+          continue
+
+        original = ssa.getOriginal(value)
+        if isTemporary(original) and original in definitions.get(activeFunctions[-1], set()):
+          self.errors.append(f"el temporal {original.name} se lee sin una definición que lo alcance: {instruction}")
+
+    normalCode = ssa.toNormalForm()
+    if [str(instruction) for instruction in normalCode] != [str(instruction) for instruction in self.code]:
+      self.errors.append("la conversión a SSA y de regreso no conserva el código.")
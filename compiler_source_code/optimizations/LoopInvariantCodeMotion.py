@@ -0,0 +1,227 @@
+from compoundTypes import ObjectType
+from primitiveTypes import IntType, FloatType
+from IntermediateCodeInstruction import SingleInstruction, ConditionalInstruction
+from IntermediateCodeTokens import STORE, ASSIGN, CALL, LABEL, GOTO, REGISTER_FREE, REGISTER_RESET
+from Offset import Offset
+from optimizations.TypeInference import getStaticType
+from optimizations.ControlFlowGraph import ControlFlowGraph, ENTRY
+from optimizations.IntermediateCodeUtils import isTemporary, getSharedObjects, numericOperators, divisionOperators, sharingDefinitionOperators
+
+# Operaciones que se pueden extraer: no pueden fallar con operandos numéricos (la división y el módulo se excluyen)
+hoistableOperators = tuple(operator for operator in numericOperators if operator not in divisionOperators)
+
+class LoopInvariantCodeMotion:
+
+  def __init__(self, code, hoistIntConstants=True) -> None:
+    """
+    Extracción de código invariante de ciclos.
+
+    Los ciclos son los ciclos naturales del grafo de flujo (ver ControlFlowGraph.getNaturalLoops); while y for
+    generan LABEL inicio; condición; IF NOT ... GOTO fin; cuerpo; GOTO inicio. Las instrucciones sin efectos
+    secundarios cuyos operandos no se modifican dentro del ciclo se mueven antes de la etiqueta de inicio
+    (preheader), seguidas de REGISTER_FREE para que el ciclo inicie con los valores en memoria:
+    - Constantes (STORE), incluyendo strings, que reservan memoria del heap en cada iteración.
+    - Operaciones aritméticas y comparaciones con operandos numéricos de tipo conocido.
+    - Lecturas de propiedades (Offset) en bloques que dominan todas las salidas del ciclo y los saltos de
+      regreso al inicio (como la condición), que siempre se ejecutan al menos una vez al entrar al ciclo,
+      si el ciclo no contiene llamadas ni asignaciones a propiedades. Las lecturas del cuerpo de un while o
+      for no se extraen: si la condición es falsa desde el inicio, la lectura no se realiza (el objeto puede
+      ser nil).
+
+    Solo se mueven instrucciones cuyo resultado es un temporal con una única definición, que no se pasa
+    como argumento ni se retorna. Los ciclos internos se procesan primero, y el código extraído de un ciclo
+    interno se puede extraer nuevamente del ciclo externo.
+
+    Los temporales extraídos se leen en todas las iteraciones, por lo que después del GOTO final de cada ciclo
+    se agrega REGISTER_RESET: a la etiqueta de salida se llega desde la condición del ciclo, con otros valores
+    en los registros, y al liberarlos no se deben guardar los valores del final del cuerpo.
+
+    @param code: Lista de instrucciones de código intermedio. Las instrucciones extraídas se mueven dentro
+      de la misma lista.
+    @param hoistIntConstants: Si se extraen las constantes int, bool y nil. Con valores etiquetados estas
+      constantes no reservan memoria y cargarlas de memoria es más costoso que volver a crearlas.
+    """
+    self.code = code
+    self.hoistIntConstants = hoistIntConstants
+
+    hoisted = False
+    while self.hoistLoopInvariants():
+      hoisted = True
+
+    if hoisted:
+      self.resetRegistersAfterLoops()
+
+  def getCode(self):
+    return self.code
+
+  def getLoops(self):
+    """
+    Devuelve la lista de ciclos naturales, de menor a mayor tamaño, como (índice de LABEL inicio,
+    índice del último GOTO hacia el inicio o None, índices de las instrucciones del ciclo,
+    índices de las instrucciones que se ejecutan al menos una vez en cada entrada al ciclo).
+    Solo se consideran ciclos cuyo encabezado inicia con una etiqueta a la que únicamente se salta desde
+    el ciclo, de forma que la instrucción anterior a la etiqueta es el único punto de entrada.
+    """
+    cfg = ControlFlowGraph(self.code)
+    loops = []
+
+    for header, blocks in cfg.getNaturalLoops().items():
+      start = cfg.blocks[header][0]
+      if getattr(self.code[start], "operator", None) != LABEL:
+        continue
+
+      label = self.code[start].arg1
+      isValid = True
+      for predecessor in cfg.predecessors[header]:
+        if predecessor in blocks or not cfg.isReachable(predecessor):
+          continue
+        last = self.code[start - 1] if start > 0 else None
+        jumpsToHeader = (isinstance(last, ConditionalInstruction) and last.goToLabel == label) or \
+          (getattr(last, "operator", None) == GOTO and last.arg1 == label)
+        if predecessor == ENTRY or cfg.blocks[predecessor][1] != start or jumpsToHeader:
+          isValid = False
+      if not isValid:
+        continue
+
+      latches = [block for block in blocks if header in cfg.successors[block]]
+      exits = [block for block in blocks if any(successor not in blocks for successor in cfg.successors[block])]
+      alwaysExecuted = [block for block in blocks if all(cfg.dominates(block, other) for other in latches + exits)]
+
+      backEdgeJumps = [cfg.blocks[block][1] - 1 for block in latches if getattr(self.code[cfg.blocks[block][1] - 1], "operator", None) == GOTO]
+      end = max(backEdgeJumps) if len(backEdgeJumps) > 0 else None
+
+      indexes = sorted(index for block in blocks for index in range(*cfg.blocks[block]))
+      alwaysExecutedIndexes = set(index for block in alwaysExecuted for index in range(*cfg.blocks[block]))
+      loops.append((start, end, indexes, alwaysExecutedIndexes))
+
+    loops.sort(key=lambda loop: len(loop[2]))
+    return loops
+
+  def collectProgramInfo(self):
+    """
+    Devuelve ({objeto: cantidad de definiciones}, objetos compartidos con otra función, objetos que comparten el heap).
+    """
+    definitions = {}
+    sharingObjects = set()
+
+    for instruction in self.code:
+      result = getattr(instruction, "result", None)
+      if isinstance(result, ObjectType):
+        definitions[result] = definitions.get(result, 0) + 1
+        if getattr(instruction, "operator", None) in sharingDefinitionOperators:
+          sharingObjects.add(result)
+
+    return definitions, getSharedObjects(self.code), sharingObjects
+
+  def hoistLoopInvariants(self):
+    """
+    Mueve las instrucciones invariantes del primer ciclo (el más interno) que tenga alguna.
+    Retorna True si se modificó el código.
+    """
+    definitions, sharedObjects, sharingObjects = self.collectProgramInfo()
+
+    for start, _, indexes, alwaysExecutedIndexes in self.getLoops():
+      hoistedIndexes = self.getInvariantInstructions(indexes, alwaysExecutedIndexes, definitions, sharedObjects, sharingObjects)
+      if len(hoistedIndexes) == 0:
+        continue
+
+      hoistedCode = [self.code[index] for index in hoistedIndexes]
+
+      # Insertar antes de la liberación de registros que precede al ciclo, o agregar una
+      insertIndex = start
+      if start > 0 and getattr(self.code[start - 1], "operator", None) == REGISTER_FREE:
+        insertIndex = start - 1
+      else:
+        hoistedCode.append(SingleInstruction(operator=REGISTER_FREE))
+
+      hoistedSet = set(hoistedIndexes)
+      code = [instruction for index, instruction in enumerate(self.code[:insertIndex]) if index not in hoistedSet]
+      code += hoistedCode
+      code += [instruction for index, instruction in enumerate(self.code[insertIndex:], insertIndex) if index not in hoistedSet]
+      self.code[:] = code
+      return True
+
+    return False
+
+  def resetRegistersAfterLoops(self):
+    """
+    Agrega REGISTER_RESET después del GOTO final de cada ciclo.
+    """
+    loopEnds = set(end for _, end, _, _ in self.getLoops() if end != None)
+    code = []
+
+    for index, instruction in enumerate(self.code):
+      code.append(instruction)
+
+      nextInstruction = self.code[index + 1] if index + 1 < len(self.code) else None
+      if index in loopEnds and getattr(nextInstruction, "operator", None) != REGISTER_RESET:
+        code.append(SingleInstruction(operator=REGISTER_RESET))
+
+    self.code[:] = code
+
+  def getInvariantInstructions(self, indexes, alwaysExecutedIndexes, definitions, sharedObjects, sharingObjects):
+    """
+    Devuelve los índices de las instrucciones invariantes del ciclo con las instrucciones indexes, en orden.
+    Las funciones declaradas dentro del ciclo no forman parte de sus bloques.
+    """
+    loopDefinitions = set() # Objetos definidos dentro del ciclo
+    writesMemory = False # El ciclo contiene llamadas o asignaciones a propiedades
+    writesVariables = False # El ciclo asigna variables (no temporales) en memoria
+    writesSharingObjects = False # El ciclo asigna objetos que comparten el heap con otro objeto
+
+    for index in indexes:
+      instruction = self.code[index]
+      operator = getattr(instruction, "operator", None)
+      result = getattr(instruction, "result", None)
+
+      if isinstance(result, ObjectType):
+        loopDefinitions.add(result)
+        if not isTemporary(result) and operator != ASSIGN:
+          writesVariables = True
+          writesSharingObjects = writesSharingObjects or result in sharingObjects
+      elif isinstance(result, Offset) or operator == CALL:
+        writesMemory = True
+
+    invariantObjects = set()
+
+    def isInvariant(value, allowOffset):
+      if isinstance(value, Offset):
+        return allowOffset and not writesMemory and isInvariant(value.base, False) and isInvariant(value.offset, False)
+
+      if isinstance(value, ObjectType):
+        if value in invariantObjects:
+          return True
+        if value in loopDefinitions:
+          return False
+        if isTemporary(value):
+          return True
+        # Una variable se puede modificar desde una llamada o mediante otra variable que comparte su valor
+        if writesMemory or writesSharingObjects:
+          return False
+        return not (value in sharingObjects and writesVariables)
+
+      return True
+
+    hoistedIndexes = []
+    for index in indexes:
+      instruction = self.code[index]
+      if not isinstance(instruction, SingleInstruction):
+        continue
+
+      result = instruction.result
+      if not isTemporary(result) or definitions.get(result) != 1 or result in sharedObjects:
+        continue
+
+      if instruction.operator == STORE:
+        isCandidate = self.hoistIntConstants or getStaticType(instruction.arg1.type) != IntType
+      elif instruction.operator in hoistableOperators:
+        operands = [operand for operand in (instruction.arg1, instruction.arg2) if operand != None]
+        isCandidate = all(isInvariant(operand, index in alwaysExecutedIndexes) and getStaticType(operand.type) in (IntType, FloatType) for operand in operands)
+      else:
+        isCandidate = False
+
+      if isCandidate:
+        invariantObjects.add(result)
+        hoistedIndexes.append(index)
+
+    return hoistedIndexes
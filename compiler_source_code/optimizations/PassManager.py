@@ -0,0 +1,97 @@
+import time
+from optimizations.TypeInference import TypeInference
+from optimizations.FunctionSpecialization import FunctionSpecialization
+from optimizations.FunctionInlining import FunctionInlining
+from optimizations.ComparisonBranchFusion import ComparisonBranchFusion
+from optimizations.ValueNumbering import ValueNumbering
+from optimizations.CopyPropagation import CopyPropagation
+from optimizations.LoopInvariantCodeMotion import LoopInvariantCodeMotion
+from optimizations.DeadCodeElimination import DeadCodeElimination
+from optimizations.StrengthReduction import StrengthReduction
+from optimizations.PeepholeOptimization import PeepholeOptimization
+from optimizations.IntermediateCodeVerifier import IntermediateCodeVerifier
+
+class PassManager:
+
+  def __init__(self, options, symbolGenerator) -> None:
+    """
+    Ejecuta los passes de optimización habilitados en las opciones, en orden, y registra el tiempo de cada uno
+    y el informe de los passes que lo generan (ver getReports).
+
+    Los passes de código intermedio se ejecutan antes de generar el assembly y los passes de assembly después.
+    Si options.verifyPasses es True (modo de depuración), después de cada pass de código intermedio se verifican
+    las invariantes del código (ver IntermediateCodeVerifier) y se lanza una excepción con el nombre del pass
+    que las rompió.
+
+    @param options: CompilerOptions con los passes habilitados.
+    @param symbolGenerator: SymbolGenerator de la compilación, para los nombres que crean los passes.
+    """
+    self.options = options
+    self.timings = [] # [(nombre del pass, segundos, instrucciones antes, instrucciones después)]
+    self.reports = {} # nombre del pass -> {regla: cantidad}
+
+    self.intermediateCodePasses = [
+      ("FunctionInlining", options.inlineFunctions, lambda code: FunctionInlining(code, symbolGenerator, options.inlineThreshold).getCode()),
+      ("FunctionSpecialization", options.specializeFunctions, lambda code: FunctionSpecialization(code, symbolGenerator, options.specializationBudget).getCode()),
+      ("TypeInference", options.typeInference, lambda code: TypeInference(code).getCode()),
+      ("CopyPropagation", options.propagateCopies, lambda code: CopyPropagation(code).getCode()),
+      ("ValueNumbering", options.eliminateCommonSubexpressions, lambda code: ValueNumbering(code).getCode()),
+      ("StrengthReduction", options.reduceStrength, lambda code: StrengthReduction(code).getCode()),
+      ("LoopInvariantCodeMotion", options.hoistLoopInvariants, lambda code: LoopInvariantCodeMotion(code, not options.taggedValues).getCode()),
+      ("ComparisonBranchFusion", options.fuseComparisonBranches, lambda code: ComparisonBranchFusion(code).getCode()),
+      ("DeadCodeElimination", options.eliminateDeadCode, lambda code: DeadCodeElimination(code).getCode()),
+    ]
+
+    self.assemblyPasses = [
+      ("PeepholeOptimization", options.peepholeOptimization, self.runPeepholeOptimization),
+    ]
+
+  def getTimings(self):
+    return self.timings
+
+  def getReports(self):
+    """
+    Devuelve {nombre del pass: {regla: cantidad de instrucciones eliminadas o reemplazadas}} de los passes
+    ejecutados que generan un informe.
+    """
+    return self.reports
+
+  def runPeepholeOptimization(self, code):
+    peephole = PeepholeOptimization(code, self.options.peepholeWindow)
+    self.reports["PeepholeOptimization"] = peephole.getReport()
+    return peephole.getCode()
+
+  def runPasses(self, passes, code, verify):
+    if verify:
+      self.verify("la generación de código intermedio", code)
+
+    for name, enabled, runPass in passes:
+      if not enabled:
+        continue
+
+      instructionCount = len(code)
+      start = time.perf_counter()
+      code = runPass(code)
+      self.timings.append((name, time.perf_counter() - start, instructionCount, len(code)))
+
+      if verify:
+        self.verify(name, code)
+
+    return code
+
+  def verify(self, passName, code):
+    verifier = IntermediateCodeVerifier(code)
+    if not verifier.isValid():
+      raise Exception(f"Código intermedio inválido después de {passName}.", verifier.getErrors())
+
+  def runIntermediateCodePasses(self, code):
+    """
+    Ejecuta los passes de código intermedio y devuelve el código resultante.
+    """
+    return self.runPasses(self.intermediateCodePasses, code, self.options.verifyPasses)
+
+  def runAssemblyPasses(self, code):
+    """
+    Ejecuta los passes sobre el código assembly (lista de líneas) y devuelve el código resultante.
+    """
+    return self.runPasses(self.assemblyPasses, code, False)
@@ -0,0 +1,238 @@
+import re
+
+# Instrucciones cuyo primer operando es el registro destino
+firstOperandWriteOpcodes = (
+  "li", "la", "lui", "lw", "lb", "lbu", "lh", "lhu", "move", "add", "addi", "addu", "addiu", "sub", "subu", "subi",
+  "mul", "div", "rem", "remu", "and", "andi", "or", "ori", "xor", "xori", "nor", "sll", "sllv", "sra", "srav", "srl", "srlv",
+  "seq", "sne", "slt", "slti", "sltu", "sltiu", "sle", "sgt", "sge", "neg", "not", "mfhi", "mflo", "mfc1",
+  "l.s", "mov.s", "neg.s", "abs.s", "cvt.s.w", "cvt.w.s", "trunc.w.s", "floor.w.s", "add.s", "sub.s", "mul.s", "div.s"
+)
+
+# Instrucciones que solo escriben en memoria
+storeOpcodes = ("sw", "sb", "sh", "s.s")
+
+# Instrucciones que no escriben registros de propósito general ni de punto flotante
+noWriteOpcodes = storeOpcodes + ("c.eq.s", "c.lt.s", "c.le.s", "mult", "multu", "divu")
+
+jumpOpcodes = ("j", "b")
+branchOpcodes = ("beq", "bne", "blt", "ble", "bgt", "bge", "bltu", "bgeu", "beqz", "bnez", "bltz", "bgez", "bgtz", "blez", "bc1t", "bc1f")
+
+labelPattern = re.compile(r"^([A-Za-z_][\w.]*):$")
+addressPattern = re.compile(r"^-?\w*\((\$\w+)\)$")
+
+class AssemblyInstruction:
+
+  def __init__(self, line) -> None:
+    """
+    Línea de código assembly separada en etiqueta, código de operación, operandos y comentario.
+
+    kind: "label", "instruction", "directive" o "comment" (líneas vacías o solo con comentario).
+    """
+    self.line = line
+
+    code, separator, comment = line.partition("#")
+    code = code.strip()
+    self.comment = comment.strip() if separator != "" else None
+
+    self.label = None
+    self.opcode = None
+    self.operands = []
+
+    labelMatch = labelPattern.match(code)
+    if code == "":
+      self.kind = "comment"
+    elif labelMatch:
+      self.kind = "label"
+      self.label = labelMatch.group(1)
+    elif code.startswith(".") or ":" in code:
+      # Directivas y datos con etiqueta (ej. str: .asciiz "...") se conservan sin modificar
+      self.kind = "directive"
+    else:
+      self.kind = "instruction"
+      parts = code.split(None, 1)
+      self.opcode = parts[0]
+      if len(parts) > 1:
+        self.operands = [operand for operand in re.split(r"[,\s]+", parts[1].strip()) if operand != ""]
+
+  def __str__(self) -> str:
+    return self.line
+
+  def isInstruction(self, *opcodes):
+    return self.kind == "instruction" and (len(opcodes) == 0 or self.opcode in opcodes)
+
+  def getWrittenRegisters(self):
+    """
+    Devuelve los registros que modifica la instrucción, o None si no se conocen (llamadas, saltos,
+    syscall o instrucciones no reconocidas).
+    """
+    if self.opcode in firstOperandWriteOpcodes and len(self.operands) > 0:
+      if self.opcode == "div" and len(self.operands) == 2:
+        return [] # Resultado en hi y lo
+      return [self.operands[0]]
+    if self.opcode == "mtc1" and len(self.operands) == 2:
+      return [self.operands[1]]
+    if self.opcode in noWriteOpcodes:
+      return []
+    return None
+
+  def getAddressBase(self):
+    """
+    Devuelve el registro base del operando de memoria de un load o store (ej. $sp en 4($sp)), o None.
+    """
+    if len(self.operands) != 2:
+      return None
+    match = addressPattern.match(self.operands[1])
+    return match.group(1) if match else None
+
+
+class PeepholeOptimization:
+
+  def __init__(self, code, window=4) -> None:
+    """
+    Optimización de mirilla (peephole) sobre el código assembly generado.
+
+    Cada línea se separa en una AssemblyInstruction y las reglas examinan cada instrucción junto con
+    las siguientes window instrucciones (sin contar comentarios). Una etiqueta, salto, llamada o syscall
+    termina la ventana, ya que el estado de los registros puede ser distinto.
+    - instructionMarkers: nop # INSTRUCTION ... se reemplaza por una línea de comentario.
+    - selfMoves: move r, r y mov.s f, f.
+    - jumpsToNextLabel: saltos (j, b o condicionales) a una etiqueta que está inmediatamente después.
+    - redundantLoads: lw r, X (o l.s) después de sw r, X (o s.s) sin modificaciones de r, de la base de X
+      ni de la memoria entre ellos. Si el load es a otro registro, se reemplaza por move (o mov.s).
+    - duplicateConstants: li r, k cuando r ya contiene k.
+
+    Las reglas se aplican hasta que ninguna modifica el código.
+
+    @param code: Lista de líneas de código assembly.
+    @param window: Cantidad de instrucciones siguientes que examinan las reglas.
+    """
+    self.window = window
+    self.instructions = [AssemblyInstruction(line) for line in code]
+
+    self.rules = (
+      ("instructionMarkers", self.removeInstructionMarkers),
+      ("selfMoves", self.removeSelfMoves),
+      ("jumpsToNextLabel", self.removeJumpsToNextLabel),
+      ("redundantLoads", self.removeRedundantLoads),
+      ("duplicateConstants", self.removeDuplicateConstants),
+    )
+    self.report = {name: 0 for name, _ in self.rules} # regla -> instrucciones eliminadas o reemplazadas
+
+    changed = True
+    while changed:
+      changed = False
+      for name, rule in self.rules:
+        removed = rule()
+        self.report[name] += removed
+        changed = changed or removed > 0
+
+  def getCode(self):
+    return [str(instruction) for instruction in self.instructions]
+
+  def getReport(self):
+    """
+    Devuelve {nombre de regla: cantidad de instrucciones eliminadas o reemplazadas}.
+    """
+    return self.report
+
+  def removeIndexes(self, removedIndexes):
+    self.instructions = [instruction for index, instruction in enumerate(self.instructions) if index not in removedIndexes]
+    return len(removedIndexes)
+
+  def getWindow(self, index):
+    """
+    Devuelve los índices de las instrucciones siguientes a index dentro de la ventana, sin incluir comentarios.
+    La ventana termina antes de una etiqueta o directiva.
+    """
+    indexes = []
+    for nextIndex in range(index + 1, len(self.instructions)):
+      instruction = self.instructions[nextIndex]
+      if instruction.kind == "comment":
+        continue
+      if instruction.kind != "instruction" or len(indexes) == self.window:
+        break
+      indexes.append(nextIndex)
+    return indexes
+
+  def removeInstructionMarkers(self):
+    removed = 0
+    for index, instruction in enumerate(self.instructions):
+      if instruction.isInstruction("nop") and instruction.comment != None:
+        self.instructions[index] = AssemblyInstruction(f"# {instruction.comment}")
+        removed += 1
+    return removed
+
+  def removeSelfMoves(self):
+    removedIndexes = set()
+    for index, instruction in enumerate(self.instructions):
+      if instruction.isInstruction("move", "mov.s") and len(instruction.operands) == 2 and instruction.operands[0] == instruction.operands[1]:
+        removedIndexes.add(index)
+    return self.removeIndexes(removedIndexes)
+
+  def removeJumpsToNextLabel(self):
+    removedIndexes = set()
+    for index, instruction in enumerate(self.instructions):
+      if not instruction.isInstruction(*jumpOpcodes, *branchOpcodes) or len(instruction.operands) == 0:
+        continue
+
+      target = instruction.operands[-1]
+      for nextInstruction in self.instructions[index + 1:]:
+        if nextInstruction.kind == "label" and nextInstruction.label == target:
+          removedIndexes.add(index)
+          break
+        if nextInstruction.kind not in ("label", "comment"):
+          break
+
+    return self.removeIndexes(removedIndexes)
+
+  def isSafeBetween(self, instruction, register, base=None, allowStores=True):
+    """
+    Indica si una instrucción entre dos instrucciones de una regla conserva el valor de register
+    (y de base, si se indica) y, si allowStores es False, la memoria.
+    """
+    writtenRegisters = instruction.getWrittenRegisters()
+    if writtenRegisters == None or register in writtenRegisters or base in writtenRegisters:
+      return False
+    return allowStores or instruction.opcode not in storeOpcodes
+
+  def removeRedundantLoads(self):
+    removedIndexes = set()
+    replaced = 0
+    for index, instruction in enumerate(self.instructions):
+      if not instruction.isInstruction("sw", "s.s") or instruction.getAddressBase() == None:
+        continue
+
+      register, address = instruction.operands
+      loadOpcode, moveOpcode = ("lw", "move") if instruction.opcode == "sw" else ("l.s", "mov.s")
+
+      for nextIndex in self.getWindow(index):
+        nextInstruction = self.instructions[nextIndex]
+        if nextInstruction.opcode == loadOpcode and nextInstruction.operands[1:] == [address]:
+          if nextInstruction.operands[0] == register:
+            removedIndexes.add(nextIndex)
+          else:
+            # El valor ya está en register, se copia sin leer la memoria
+            self.instructions[nextIndex] = AssemblyInstruction(f"{moveOpcode} {nextInstruction.operands[0]}, {register}")
+            replaced += 1
+          break
+        if not self.isSafeBetween(nextInstruction, register, instruction.getAddressBase(), allowStores=False):
+          break
+
+    return self.removeIndexes(removedIndexes) + replaced
+
+  def removeDuplicateConstants(self):
+    removedIndexes = set()
+    for index, instruction in enumerate(self.instructions):
+      if index in removedIndexes or not instruction.isInstruction("li") or len(instruction.operands) != 2:
+        continue
+
+      register = instruction.operands[0]
+      for nextIndex in self.getWindow(index):
+        nextInstruction = self.instructions[nextIndex]
+        if nextInstruction.opcode == "li" and nextInstruction.operands == instruction.operands:
+          removedIndexes.add(nextIndex)
+          continue
+        if not self.isSafeBetween(nextInstruction, register):
+          break
+
+    return self.removeIndexes(removedIndexes)
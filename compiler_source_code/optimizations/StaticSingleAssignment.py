@@ -0,0 +1,210 @@
+import copy
+from compoundTypes import ObjectType
+from IntermediateCodeInstruction import SingleInstruction
+from IntermediateCodeTokens import PHI, LABEL
+from Offset import Offset
+from optimizations.ControlFlowGraph import ControlFlowGraph, ENTRY
+from optimizations.IntermediateCodeUtils import getReads, getDefinition
+
+class StaticSingleAssignment:
+
+  def __init__(self, code) -> None:
+    """
+    Construcción de la forma SSA (asignación estática única) del código intermedio.
+
+    Las funciones PHI se colocan en la frontera de dominancia iterada de los bloques que definen cada objeto
+    (SSA semi podada: solo para objetos que se leen en un bloque distinto al que los define). Después, cada
+    definición recibe una nueva versión del objeto (nombre.versión) y cada lectura la versión que la alcanza,
+    recorriendo el árbol de dominadores. La versión 0 es el valor del objeto al inicio del programa o de la función.
+
+    Una PHI se representa como result = PHI [valor por cada predecesor], en el orden de cfg.predecessors.
+
+    toNormalForm() realiza la conversión inversa: elimina las PHI y restaura los objetos originales. Como las
+    versiones de un objeto comparten su posición de memoria, la conversión es directa mientras no se muevan
+    instrucciones entre las definiciones de un mismo objeto.
+
+    @param code: Lista de instrucciones de código intermedio. No se modifica.
+    """
+    self.code = code
+    self.cfg = ControlFlowGraph(code)
+
+    self.originalNames = {} # (nombre de versión, id de scope) -> nombre original
+    self.versions = {} # objeto -> última versión creada
+    self.phis = {} # bloque -> [instrucciones PHI]
+
+    self.placePhis()
+    self.ssaCode = self.renameValues()
+
+  def getCode(self):
+    return self.ssaCode
+
+  def placePhis(self):
+    definitionBlocks = {} # objeto -> bloques que lo definen
+    globalObjects = set() # objetos leídos en un bloque antes de definirse en él
+
+    for block in self.cfg.reversePostorder:
+      start, end = self.cfg.blocks[block]
+      definedInBlock = set()
+
+      for instruction in self.code[start:end]:
+        for value in getReads(instruction):
+          if value not in definedInBlock:
+            globalObjects.add(value)
+
+        definition = getDefinition(instruction)
+        if definition != None:
+          definedInBlock.add(definition)
+          definitionBlocks.setdefault(definition, set()).add(block)
+
+    for object, blocks in definitionBlocks.items():
+      if object not in globalObjects:
+        continue
+
+      pending = list(blocks)
+      phiBlocks = set()
+      while len(pending) > 0:
+        block = pending.pop()
+        for frontierBlock in self.cfg.dominanceFrontiers[block]:
+          if frontierBlock in phiBlocks:
+            continue
+
+          phiBlocks.add(frontierBlock)
+          operands = [object] * len(self.cfg.predecessors[frontierBlock])
+          self.phis.setdefault(frontierBlock, []).append(SingleInstruction(operator=PHI, arg1=operands, result=object, operatorFirst=True))
+
+          if frontierBlock not in blocks:
+            pending.append(frontierBlock)
+
+  def newVersion(self, object, version):
+    versionObject = object.copy()
+    versionObject.type = object.type
+    versionObject.name = f"{object.name}.{version}"
+    self.originalNames[(versionObject.name, object.scope.id)] = object.name
+    return versionObject
+
+  def renameValues(self):
+    blockCode = {} # bloque -> instrucciones renombradas
+    stacks = {} # objeto -> pila de versiones
+
+    def getCurrentVersion(value):
+      if isinstance(value, Offset):
+        base, offset = getCurrentVersion(value.base), getCurrentVersion(value.offset)
+        return Offset(base, offset, value.type)
+
+      if isinstance(value, ObjectType):
+        stack = stacks.get(value)
+        version = stack[-1] if stack else self.newVersion(value, 0)
+        version = version.copy()
+        version.type = value.type # Conservar el tipo de la aparición
+        return version
+
+      return value
+
+    def defineVersion(object, pushed):
+      self.versions[object] = self.versions.get(object, 0) + 1
+      version = self.newVersion(object, self.versions[object])
+      stacks.setdefault(object, []).append(version)
+      pushed.append(object)
+      return version
+
+    # Recorrido del árbol de dominadores: (bloque, True) al entrar y (objetos definidos, False) al salir
+    pending = [(block, True) for block in reversed(self.cfg.dominatorTree[ENTRY])]
+    while len(pending) > 0:
+      item, entering = pending.pop()
+
+      if not entering:
+        for object in item:
+          stacks[object].pop()
+        continue
+
+      block = item
+      pushed = []
+      start, end = self.cfg.blocks[block]
+      code = []
+
+      for phi in self.phis.get(block, []):
+        phi.result = defineVersion(phi.result, pushed)
+
+      for instruction in self.code[start:end]:
+        renamedInstruction = copy.copy(instruction)
+        for attribute in ("arg1", "arg2", "result"):
+          value = getattr(instruction, attribute, None)
+          if attribute == "result" and isinstance(value, ObjectType):
+            continue
+          if isinstance(value, (ObjectType, Offset)):
+            setattr(renamedInstruction, attribute, getCurrentVersion(value))
+
+        definition = getDefinition(instruction)
+        if definition != None:
+          renamedInstruction.result = defineVersion(definition, pushed)
+          renamedInstruction.result.type = definition.type
+
+        code.append(renamedInstruction)
+
+      # Operandos de las PHI de los sucesores
+      for successor in self.cfg.successors[block]:
+        predecessorIndex = self.cfg.predecessors[successor].index(block)
+        for phi in self.phis.get(successor, []):
+          phi.arg1[predecessorIndex] = getCurrentVersion(phi.arg1[predecessorIndex])
+
+      blockCode[block] = code
+      pending.append((pushed, False))
+      pending += [(child, True) for child in reversed(self.cfg.dominatorTree[block])]
+
+    # Operandos desde ENTRY (valor inicial) y desde bloques no alcanzables
+    for block, phis in self.phis.items():
+      for phi in phis:
+        phi.arg1 = [operand if self.isVersion(operand) else self.newVersion(operand, 0) for operand in phi.arg1]
+
+    ssaCode = []
+    for block, (start, end) in enumerate(self.cfg.blocks):
+      code = blockCode.get(block, self.code[start:end])
+      phis = self.phis.get(block, [])
+
+      # Las PHI se colocan después de la etiqueta del bloque
+      if len(code) > 0 and getattr(code[0], "operator", None) == LABEL:
+        ssaCode += code[:1] + phis + code[1:]
+      else:
+        ssaCode += phis + code
+
+    return ssaCode
+
+  def isVersion(self, value):
+    return isinstance(value, ObjectType) and (value.name, value.scope.id) in self.originalNames
+
+  def getOriginal(self, value):
+    """
+    Devuelve el objeto original de una versión (o el mismo valor si no es una versión).
+    """
+    if isinstance(value, Offset):
+      return Offset(self.getOriginal(value.base), self.getOriginal(value.offset), value.type)
+
+    if self.isVersion(value):
+      original = value.copy()
+      original.type = value.type
+      original.name = self.originalNames[(value.name, value.scope.id)]
+      return original
+
+    return value
+
+  def toNormalForm(self, code=None):
+    """
+    Conversión fuera de SSA: elimina las PHI y reemplaza cada versión por su objeto original.
+    @param code: Código en forma SSA. Por defecto, el código construido.
+    """
+    code = code if code != None else self.ssaCode
+    normalCode = []
+
+    for instruction in code:
+      if getattr(instruction, "operator", None) == PHI:
+        continue
+
+      normalInstruction = copy.copy(instruction)
+      for attribute in ("arg1", "arg2", "result"):
+        value = getattr(instruction, attribute, None)
+        if isinstance(value, (ObjectType, Offset)):
+          setattr(normalInstruction, attribute, self.getOriginal(value))
+
+      normalCode.append(normalInstruction)
+
+    return normalCode
@@ -0,0 +1,182 @@
+import copy
+from compoundTypes import ObjectType
+from primitiveTypes import IntType
+from IntermediateCodeInstruction import SingleInstruction
+from IntermediateCodeTokens import PLUS, MINUS, MULTIPLY, MOD, STORE, SHIFT_LEFT, BIT_AND
+from Offset import Offset
+from Value import Value
+from optimizations.TypeInference import getStaticType
+from optimizations.IntermediateCodeUtils import isTemporary, getSharedObjects
+
+# Máximo valor de la máscara de andi (inmediato de 16 bits sin signo)
+maxMaskValue = 0xFFFF
+
+class StrengthReduction:
+
+  def __init__(self, code) -> None:
+    """
+    Simplificación algebraica y reducción de fuerza de operaciones enteras con una constante.
+
+    Con operandos de tipo int, donde una constante es un temporal definido una sola vez con STORE:
+    - x + 0, 0 + x, x - 0 y x * 1 se eliminan y su temporal se reemplaza por x (si x es un temporal con
+      una única definición, de lo contrario se conserva la operación).
+    - x * 0 y x % 1 se reemplazan por STORE 0.
+    - x * 2^k se reemplaza por x << k (sll).
+    - x % 2^k se reemplaza por x & (2^k - 1) (andi). El módulo entero utiliza remu, por lo que el
+      resultado es el mismo también para valores negativos.
+
+    La división entre enteros siempre produce un float, por lo que no se reduce.
+
+    @param code: Lista de instrucciones de código intermedio. Las operaciones simplificadas se reemplazan
+      en la misma lista.
+    """
+    self.code = code
+
+    self.definitions = {} # objeto -> [instrucciones que lo definen]
+    self.sharedObjects = set() # objetos cuyo valor se comparte con otra función
+    self.replacements = {} # temporal eliminado -> objeto que lo reemplaza
+
+    self.collectProgramInfo()
+    self.simplifyOperations()
+    self.replaceTemporaries()
+
+  def getCode(self):
+    return self.code
+
+  def collectProgramInfo(self):
+    for instruction in self.code:
+      result = getattr(instruction, "result", None)
+      if isinstance(result, ObjectType):
+        self.definitions.setdefault(result, []).append(instruction)
+
+    self.sharedObjects = getSharedObjects(self.code)
+
+  def isStableTemporary(self, value):
+    """
+    Indica si un objeto es un temporal con una única definición que no se comparte con otra función.
+    """
+    return isTemporary(value) and len(self.definitions.get(value, [])) == 1 and value not in self.sharedObjects
+
+  def getIntConstant(self, value):
+    """
+    Devuelve el valor entero de un temporal definido una sola vez como constante int, o None.
+    """
+    if not isTemporary(value) or len(self.definitions.get(value, [])) != 1:
+      return None
+
+    definition = self.definitions[value][0]
+    if definition.operator != STORE or not isinstance(definition.arg1, Value) or not definition.arg1.type.strictEqualsType(IntType):
+      return None
+
+    try:
+      return int(definition.arg1.value)
+    except (TypeError, ValueError):
+      return None
+
+  def getPowerOfTwo(self, value):
+    """
+    Devuelve k si value = 2^k (k > 0), o None.
+    """
+    if value != None and value > 1 and value & (value - 1) == 0:
+      return value.bit_length() - 1
+    return None
+
+  def simplifyInstruction(self, instruction):
+    """
+    Devuelve la instrucción que reemplaza a la operación, None si se debe eliminar (su temporal se
+    reemplaza por otro objeto) o la misma instrucción si no se puede simplificar.
+    """
+    operator = instruction.operator
+    result = instruction.result
+    operands = (instruction.arg1, instruction.arg2)
+
+    if operator not in (PLUS, MINUS, MULTIPLY, MOD) or not self.isStableTemporary(result):
+      return instruction
+    if not all(isinstance(operand, ObjectType) and getStaticType(operand.type) == IntType for operand in operands):
+      return instruction
+
+    constants = [self.getIntConstant(operand) for operand in operands]
+
+    # Identidades: el resultado es el otro operando
+    identityOperand = None
+    if operator in (PLUS, MINUS) and constants[1] == 0:
+      identityOperand = operands[0]
+    elif operator == PLUS and constants[0] == 0:
+      identityOperand = operands[1]
+    elif operator == MULTIPLY and constants[1] == 1:
+      identityOperand = operands[0]
+    elif operator == MULTIPLY and constants[0] == 1:
+      identityOperand = operands[1]
+
+    if identityOperand != None:
+      if not self.isStableTemporary(identityOperand):
+        return instruction
+      self.replacements[result] = self.replacements.get(identityOperand, identityOperand)
+      return None
+
+    # Resultado constante cero
+    if (operator == MULTIPLY and 0 in constants) or (operator == MOD and constants[1] == 1):
+      return SingleInstruction(result=result, arg1=Value("0", IntType()), operator=STORE, operatorFirst=True)
+
+    # Potencias de dos
+    if operator == MULTIPLY:
+      for constantIndex in (1, 0):
+        shift = self.getPowerOfTwo(constants[constantIndex])
+        if shift != None and shift < 32:
+          return SingleInstruction(result=result, arg1=operands[1 - constantIndex], arg2=Value(shift, IntType()), operator=SHIFT_LEFT)
+
+    if operator == MOD:
+      shift = self.getPowerOfTwo(constants[1])
+      if shift != None and constants[1] - 1 <= maxMaskValue:
+        return SingleInstruction(result=result, arg1=operands[0], arg2=Value(constants[1] - 1, IntType()), operator=BIT_AND)
+
+    return instruction
+
+  def simplifyOperations(self):
+    code = []
+    for instruction in self.code:
+      if isinstance(instruction, SingleInstruction) and len(self.replacements) > 0:
+        instruction = self.replaceReads(instruction)
+
+      if isinstance(instruction, SingleInstruction):
+        instruction = self.simplifyInstruction(instruction)
+
+      if instruction != None:
+        code.append(instruction)
+
+    self.code[:] = code
+
+  def getReplacement(self, value):
+    if isinstance(value, ObjectType) and value in self.replacements:
+      replacement = self.replacements[value].copy()
+      replacement.type = value.type # Conservar el tipo de la aparición
+      return replacement
+
+    if isinstance(value, Offset):
+      base, offset = self.getReplacement(value.base), self.getReplacement(value.offset)
+      if base is not value.base or offset is not value.offset:
+        return Offset(base, offset, value.type)
+
+    return value
+
+  def replaceReads(self, instruction):
+    """
+    Devuelve la instrucción con los temporales eliminados reemplazados (una copia si se modifica).
+    """
+    replacedInstruction = instruction
+    for attribute in ("arg1", "arg2", "result"):
+      value = getattr(instruction, attribute, None)
+      replacement = self.getReplacement(value)
+
+      if replacement is not value:
+        if replacedInstruction is instruction:
+          replacedInstruction = copy.copy(instruction)
+        setattr(replacedInstruction, attribute, replacement)
+
+    return replacedInstruction
+
+  def replaceTemporaries(self):
+    if len(self.replacements) == 0:
+      return
+
+    self.code[:] = [self.replaceReads(instruction) for instruction in self.code]
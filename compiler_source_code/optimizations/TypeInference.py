@@ -0,0 +1,255 @@
+from compoundTypes import ObjectType, UnionType
+from primitiveTypes import AnyType, NumberType, IntType, FloatType, StringType, BoolType, NilType
+from IntermediateCodeTokens import PLUS, MINUS, MULTIPLY, DIVIDE, MOD, NEG, STORE, ASSIGN, STRICT_ASSIGN, FUNCTION, END_FUNCTION, GET_ARG, RETURN, CALL, RETURN_VAL, PRINT_ANY, PRINT_INT, PRINT_FLOAT, WORD_COPY, CLEAR
+from Value import Value
+from optimizations.IntermediateCodeUtils import getCallArguments
+
+# Valores posibles de un objeto durante el análisis (además de IntType, FloatType y StringType)
+UNDEFINED = "undefined" # Aún no se tiene información (ninguna definición analizada)
+DYNAMIC = "dynamic" # El tipo solo se conoce en tiempo de ejecución
+
+arithmeticOperators = (PLUS, MINUS, MULTIPLY, DIVIDE, MOD)
+
+def getStaticType(type):
+  """
+  Devuelve el tipo concreto (IntType, FloatType o StringType) de un tipo del análisis semántico.
+  Int, bool y nil se representan igual en memoria, por lo que se agrupan como IntType.
+  Retorna None si el tipo es dinámico (any, union o number) y DYNAMIC si es otro tipo (objetos, funciones).
+  """
+  if type == None:
+    return DYNAMIC
+
+  type = type.getType()
+
+  if type.strictEqualsType((IntType, BoolType, NilType)):
+    return IntType
+  if type.strictEqualsType(FloatType):
+    return FloatType
+  if type.strictEqualsType(StringType):
+    return StringType
+  if isinstance(type, (AnyType, UnionType, NumberType)):
+    return None
+  return DYNAMIC
+
+class TypeInference:
+
+  def __init__(self, code) -> None:
+    """
+    Inferencia de tipos de todo el programa sobre el código intermedio.
+
+    Los parámetros de funciones se declaran como any, por lo que casi todas las operaciones dentro
+    de una función utilizan las rutas any del generador de assembly. Este análisis propaga los tipos
+    de los argumentos desde todas las llamadas a cada función, los tipos de retorno y los resultados de
+    operaciones aritméticas, hasta llegar a un punto fijo.
+
+    El análisis no depende del orden de ejecución: un objeto (variable, parámetro o temporal) obtiene
+    un tipo concreto solo si todas sus definiciones en el programa producen el mismo tipo numérico.
+    En ese caso, sus apariciones de tipo any se reemplazan por copias con el tipo concreto.
+    Los parámetros y valores de retorno con tipo no comparten el bloque del heap del argumento: el generador
+    de assembly copia el número a un bloque propio (ver AssemblyGenerator.isOwnNumberCopyRequired).
+
+    @param code: Lista de instrucciones de código intermedio. Las apariciones any con tipo inferido se reemplazan
+      por copias con el tipo concreto en la misma lista.
+    """
+    self.code = code
+
+    self.definitions = {} # objeto -> [(instrucción, función o llamada asociada)]
+    self.occurrences = {} # objeto -> [(instrucción, atributo)]
+    self.calls = {} # nombre de función -> [argumentos de cada llamada, None si están incompletos]
+    self.returns = {} # nombre de función -> [valores retornados]
+    self.types = {} # objeto -> tipo inferido
+    self.methods = set() # nombres de métodos (sus parámetros y valores de retorno son any)
+
+    self.collectProgramInfo()
+    self.inferTypes()
+    self.replaceTypes()
+    self.specializeInstructions()
+
+  def getCode(self):
+    return self.code
+
+  def getValueType(self, value):
+    """
+    Devuelve el tipo actual (según el análisis) de un operando.
+    Si el análisis semántico ya conoce el tipo del operando en esa instrucción, se utiliza ese tipo,
+    pues es el que utiliza el generador de assembly.
+    """
+    if not isinstance(value, (ObjectType, Value)):
+      return DYNAMIC
+
+    staticType = getStaticType(value.type)
+    if staticType in (IntType, FloatType, StringType):
+      return staticType
+
+    if isinstance(value, ObjectType) and value in self.types:
+      return self.types[value]
+
+    return staticType if staticType != None else DYNAMIC
+
+  def joinTypes(self, type1, type2):
+    if type1 == UNDEFINED:
+      return type2
+    if type2 == UNDEFINED or type1 == type2:
+      return type1
+    return DYNAMIC
+
+  def collectProgramInfo(self):
+    """
+    Recorre el código y guarda las definiciones y apariciones de cada objeto, los argumentos
+    de cada llamada y los valores retornados por cada función.
+    """
+
+    activeFunctions = []
+
+    for index, instruction in enumerate(self.code):
+
+      for attribute in ("arg1", "arg2", "result"):
+        value = getattr(instruction, attribute, None)
+        if isinstance(value, ObjectType):
+          self.occurrences.setdefault(value, []).append((instruction, attribute))
+
+      operator = getattr(instruction, "operator", None)
+
+      if operator == FUNCTION:
+        activeFunctions.append(instruction.arg1.getUniqueName())
+        self.returns.setdefault(activeFunctions[-1], [])
+        if instruction.arg1.isMethod:
+          self.methods.add(activeFunctions[-1])
+
+      elif operator == END_FUNCTION:
+        activeFunctions.pop()
+
+      elif operator == RETURN and len(activeFunctions) > 0:
+        self.returns[activeFunctions[-1]].append(instruction.arg1)
+
+      elif operator == CALL:
+        arguments, _ = getCallArguments(self.code, index)
+        self.calls.setdefault(instruction.arg1.getUniqueName(), []).append(arguments)
+
+      # CLEAR no asigna un valor, solo limpia la memoria del objeto
+      if isinstance(getattr(instruction, "result", None), ObjectType) and operator != CLEAR:
+
+        # Función a la que pertenece el argumento o función llamada para el valor de retorno
+        context = None
+        if operator == GET_ARG:
+          context = activeFunctions[-1]
+        elif operator == RETURN_VAL:
+          previousInstruction = self.code[index - 1] if index > 0 else None
+          context = previousInstruction.arg1.getUniqueName() if getattr(previousInstruction, "operator", None) == CALL else None
+
+        self.definitions.setdefault(instruction.result, []).append((instruction, context))
+
+  def getDefinitionType(self, instruction, context):
+    """
+    Devuelve el tipo producido por una instrucción que define un objeto.
+    """
+    operator = instruction.operator
+
+    if operator in arithmeticOperators:
+      types = (self.getValueType(instruction.arg1), self.getValueType(instruction.arg2))
+
+      if DYNAMIC in types:
+        return DYNAMIC
+      if UNDEFINED in types:
+        return UNDEFINED
+      if any(type not in (IntType, FloatType) for type in types):
+        return DYNAMIC
+      if operator == DIVIDE or FloatType in types:
+        return FloatType
+      return IntType
+
+    if operator == NEG:
+      type = self.getValueType(instruction.arg1)
+      return type if type in (IntType, FloatType, UNDEFINED) else DYNAMIC
+
+    if operator in (STORE, ASSIGN, STRICT_ASSIGN, WORD_COPY):
+      return self.getValueType(instruction.arg1)
+
+    # Los métodos se pueden llamar sobre instancias de subclases y sus argumentos incluyen la instancia,
+    # por lo que sus parámetros y resultados no se infieren
+    if operator in (GET_ARG, RETURN_VAL) and context in self.methods:
+      return DYNAMIC
+
+    if operator == GET_ARG:
+      calls = self.calls.get(context, [])
+      argumentIndex = int(instruction.arg1)
+      totalArguments = int(instruction.arg2)
+
+      type = UNDEFINED
+      for arguments in calls:
+        if arguments == None or len(arguments) != totalArguments or argumentIndex >= len(arguments):
+          return DYNAMIC
+        type = self.joinTypes(type, self.getValueType(arguments[argumentIndex]))
+      return type
+
+    if operator == RETURN_VAL:
+      if context not in self.returns:
+        return DYNAMIC
+
+      type = UNDEFINED
+      for value in self.returns[context]:
+        type = self.joinTypes(type, self.getValueType(value))
+      return type
+
+    # Demás operaciones: el tipo del resultado es el del análisis semántico
+    staticType = getStaticType(instruction.result.type)
+    return staticType if staticType != None else DYNAMIC
+
+  def inferTypes(self):
+    """
+    Calcula el tipo de cada objeto hasta llegar a un punto fijo.
+    Se inicia suponiendo que ningún objeto tiene información (UNDEFINED), los tipos solo pueden
+    pasar de UNDEFINED a un tipo concreto y de este a DYNAMIC.
+    """
+
+    for value in self.definitions:
+      self.types[value] = UNDEFINED
+
+    changed = True
+    while changed:
+      changed = False
+
+      for value, definitions in self.definitions.items():
+        type = UNDEFINED
+        for instruction, context in definitions:
+          type = self.joinTypes(type, self.getDefinitionType(instruction, context))
+
+        if type != self.types[value]:
+          self.types[value] = type
+          changed = True
+
+  def replaceTypes(self):
+    """
+    Reemplaza las apariciones any de los objetos con tipo numérico inferido por copias con el tipo concreto.
+    No se modifican los objetos originales, pues pueden ser referenciados por tipos de otros objetos.
+    """
+
+    for value, type in self.types.items():
+      if type not in (IntType, FloatType):
+        continue
+
+      occurrences = self.occurrences.get(value, [])
+
+      # Si alguna aparición tiene otro tipo conocido, no se modifica el objeto
+      if any(getStaticType(getattr(instruction, attribute).type) not in (None, type) for instruction, attribute in occurrences):
+        continue
+
+      for instruction, attribute in occurrences:
+        occurrence = getattr(instruction, attribute)
+        if getStaticType(occurrence.type) == None:
+          typedOccurrence = occurrence.copy()
+          typedOccurrence.setType(type())
+          setattr(instruction, attribute, typedOccurrence)
+
+  def specializeInstructions(self):
+    """
+    Reemplaza las instrucciones que se eligieron por tener operandos any y cuyo operando ahora tiene tipo concreto.
+    """
+
+    printOperators = {IntType: PRINT_INT, FloatType: PRINT_FLOAT}
+
+    for instruction in self.code:
+      if getattr(instruction, "operator", None) == PRINT_ANY:
+        type = getStaticType(instruction.arg1.type)
+        if type in printOperators:
+          instruction.operator = printOperators[type]
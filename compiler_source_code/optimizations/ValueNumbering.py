@@ -0,0 +1,153 @@
+import copy
+from compoundTypes import ObjectType
+from primitiveTypes import IntType, FloatType
+from IntermediateCodeInstruction import SingleInstruction
+from IntermediateCodeTokens import PLUS, MULTIPLY, EQUAL, NOT_EQUAL, ASSIGN, CALL, LABEL, FUNCTION, END_FUNCTION
+from Offset import Offset
+from optimizations.TypeInference import getStaticType
+from optimizations.IntermediateCodeUtils import isTemporary, getSharedObjects, numericOperators
+
+commutativeOperators = (PLUS, MULTIPLY, EQUAL, NOT_EQUAL)
+
+class ValueNumbering:
+
+  def __init__(self, code) -> None:
+    """
+    Numeración de valores (eliminación de subexpresiones comunes) en bloques básicos extendidos.
+
+    Cada operando recibe un número de valor según la versión del objeto (cambia en cada definición) y,
+    para variables y propiedades (Offset), la versión de la memoria, que cambia en cada llamada y en cada
+    asignación a una variable o propiedad (en memoria, una variable puede compartir el valor con otra).
+    Si una operación aritmética o comparación tiene el mismo operador y números de valor que una anterior,
+    se elimina y su temporal se reemplaza por el temporal de la primera.
+
+    Un bloque extendido continúa después de un salto condicional y termina en una etiqueta, por lo que
+    la primera operación siempre domina a la repetida.
+
+    Solo se reutilizan temporales con una única definición, que no se pasan como argumento ni se retornan
+    (la función llamada podría modificar el valor del heap).
+
+    @param code: Lista de instrucciones de código intermedio. Las operaciones repetidas se eliminan de la
+      misma lista.
+    """
+    self.code = code
+
+    self.definitions = {} # objeto -> cantidad de definiciones
+    self.sharedObjects = set() # objetos cuyo valor se comparte con otra función
+    self.replacements = {} # temporal eliminado -> temporal que lo reemplaza
+
+    self.collectProgramInfo()
+    self.numberValues()
+    self.replaceTemporaries()
+
+  def getCode(self):
+    return self.code
+
+  def collectProgramInfo(self):
+    for instruction in self.code:
+      result = getattr(instruction, "result", None)
+      if isinstance(result, ObjectType):
+        self.definitions[result] = self.definitions.get(result, 0) + 1
+
+    self.sharedObjects = getSharedObjects(self.code)
+
+  def isCandidate(self, instruction):
+    """
+    Indica si el resultado de una instrucción se puede reutilizar en lugar de volver a calcularlo.
+    """
+    if not isinstance(instruction, SingleInstruction) or instruction.operator not in numericOperators:
+      return False
+
+    result = instruction.result
+    if not isTemporary(result) or self.definitions.get(result) != 1 or result in self.sharedObjects:
+      return False
+
+    operands = [operand for operand in (instruction.arg1, instruction.arg2) if operand != None]
+    return all(isinstance(operand, (ObjectType, Offset)) for operand in operands)
+
+  def getReplacement(self, value):
+    if isinstance(value, ObjectType) and value in self.replacements:
+      replacement = self.replacements[value].copy()
+      replacement.type = value.type # Conservar el tipo de la aparición
+      return replacement
+
+    if isinstance(value, Offset):
+      base, offset = self.getReplacement(value.base), self.getReplacement(value.offset)
+      if base is not value.base or offset is not value.offset:
+        return Offset(base, offset, value.type)
+
+    return value
+
+  def numberValues(self):
+    expressions = {} # (operador, números de valor) -> temporal con el resultado
+    versions = {} # objeto -> versión
+    memoryVersion = 0
+    removedIndexes = set()
+
+    def getValueNumber(value):
+      value = self.getReplacement(value)
+
+      if isinstance(value, Offset):
+        return ("offset", getValueNumber(value.base), getValueNumber(value.offset), memoryVersion)
+
+      if isinstance(value, ObjectType):
+        number = ("object", value, versions.get(value, 0), getStaticType(value.type))
+        return number if isTemporary(value) else number + (memoryVersion,)
+
+      return ("value", repr(value))
+
+    for index, instruction in enumerate(self.code):
+      operator = getattr(instruction, "operator", None)
+
+      if operator in (LABEL, FUNCTION, END_FUNCTION):
+        # Inicio de un nuevo bloque extendido
+        expressions.clear()
+        continue
+
+      if self.isCandidate(instruction):
+        numbers = [getValueNumber(operand) for operand in (instruction.arg1, instruction.arg2)]
+
+        isNumeric = all(number[0] == "object" and number[3] in (IntType, FloatType) for number in numbers)
+        if operator in commutativeOperators and isNumeric:
+          numbers.sort(key=repr)
+
+        key = (operator, *numbers)
+        if key in expressions:
+          self.replacements[instruction.result] = expressions[key]
+          removedIndexes.add(index)
+          continue
+
+        expressions[key] = instruction.result
+
+      result = getattr(instruction, "result", None)
+
+      if isinstance(result, ObjectType):
+        versions[result] = versions.get(result, 0) + 1
+
+        # Las asignaciones a variables pueden modificar el valor de otra variable que comparte el heap
+        if not isTemporary(result) and operator != ASSIGN:
+          memoryVersion += 1
+
+      elif isinstance(result, Offset) or operator == CALL:
+        memoryVersion += 1
+
+    self.code[:] = [instruction for index, instruction in enumerate(self.code) if index not in removedIndexes]
+
+  def replaceTemporaries(self):
+    if len(self.replacements) == 0:
+      return
+
+    for index, instruction in enumerate(self.code):
+      replacedInstruction = None
+
+      for attribute in ("arg1", "arg2", "result"):
+        value = getattr(instruction, attribute, None)
+        replacement = self.getReplacement(value)
+
+        if replacement is not value:
+          if replacedInstruction == None:
+            replacedInstruction = copy.copy(instruction)
+          setattr(replacedInstruction, attribute, replacement)
+
+      if replacedInstruction != None:
+        self.code[index] = replacedInstruction
@@ -1,4 +0,0 @@
-from uuid import uuid4
-
-def getUniqueId():
-  return uuid4().hex[:6]
\ No newline at end of file